@@ -2,36 +2,94 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import List, Optional
 import statistics
 import json
 from core.database import DatabaseManager
+from core.collection_runs import parse_ts
+from core.report_cache import ReportCache, cached_section
+from core.report_runner import ReportRunner
+from core.results import dump_json
+
+# --- RÉSULTATS ---
+
+@dataclass(slots=True)
+class FollowerGain:
+    article_id: int
+    title: str
+    published_at: str
+    gain: int
+    start: int
+    end: int
+    views: int
+
+@dataclass(slots=True)
+class InteractionStats:
+    article_id: int
+    title: str
+    reader_comments: int
+    author_replies: int
+    reply_rate: float
+    engage_rate: float
+
+@dataclass(slots=True)
+class AuthorInteraction:
+    detected_author: str
+    articles: List[InteractionStats]
+
+@dataclass(slots=True)
+class MilestoneVelocity:
+    event_type: str
+    article_id: int
+    occurred_at: str
+    velocity_before: float
+    velocity_after: float
+    impact_pct: float
+
+@dataclass(slots=True)
+class AttributedArticle:
+    title: str
+    views_gain: int
+    share: float
+    followers: float
+
+@dataclass(slots=True)
+class FollowerAttribution:
+    hours: int
+    # ok | insufficient_data | no_gain | no_traffic
+    status: str
+    start_delta_minutes: Optional[float] = None
+    end_delta_minutes: Optional[float] = None
+    interval_seconds: Optional[float] = None
+    total_gain: int = 0
+    total_traffic: int = 0
+    articles: List[AttributedArticle] = field(default_factory=list)
 
 class AdvancedAnalytics:
-    def __init__(self, db_path: str, author_username: str = "pascal_cescato_692b7a8a20"):
+    def __init__(self, db_path: str, author_username: str = "pascal_cescato_692b7a8a20", use_cache: bool = True):
         self.db = DatabaseManager(db_path)
         self.author_username = author_username
-
-    def article_follower_correlation(self):
+        self.report_cache = ReportCache(db_path) if use_cache else None
+    
+    @cached_section("advanced.follower_correlation", tables=("article_metrics", "follower_events"))
+    def compute_follower_correlation(self) -> List[FollowerGain]:
         """Calcule le gain de followers réel (Fenêtre +/- 6h)."""
         conn = self.db.get_connection()
-        print("\n📊 ARTICLE → FOLLOWER CORRELATION (ROBUST DELTA)")
-        print("=" * 110)
         
         articles = conn.execute("""
             SELECT article_id, title, published_at, MAX(views) as total_views
-            FROM article_metrics WHERE published_at IS NOT NULL 
+            FROM article_metrics WHERE published_at IS NOT NULL
             GROUP BY article_id ORDER BY published_at DESC
         """).fetchall()
-
-        print(f"{'Article':<45} {'Date':<12} {'Gain':>8} {'Start':>8} {'End':>8} {'Views':>8}")
-        print("-" * 110)
-
+        
+        results = []
         for art in articles:
             pub_date = art['published_at']
             # Start: J+0
             start = conn.execute("""
-                SELECT follower_count FROM follower_events 
+                SELECT follower_count FROM follower_events
                 WHERE julianday(collected_at) BETWEEN julianday(?) - 0.25 AND julianday(?) + 0.25
                 ORDER BY ABS(julianday(collected_at) - julianday(?)) ASC LIMIT 1
             """, (pub_date, pub_date, pub_date)).fetchone()
@@ -39,26 +97,36 @@ class AdvancedAnalytics:
             # End: J+7
             target_end = (datetime.fromisoformat(pub_date.replace('Z', '+00:00')) + timedelta(days=7)).isoformat()
             end = conn.execute("""
-                SELECT follower_count FROM follower_events 
+                SELECT follower_count FROM follower_events
                 WHERE julianday(collected_at) BETWEEN julianday(?) - 0.25 AND julianday(?) + 0.25
                 ORDER BY ABS(julianday(collected_at) - julianday(?)) ASC LIMIT 1
             """, (target_end, target_end, target_end)).fetchone()
-
+            
             if start and end:
                 gain = end['follower_count'] - start['follower_count']
                 if gain != 0 or start['follower_count'] > 0:
-                    title = (art['title'][:42] + "...") if len(art['title']) > 45 else art['title']
-                    print(f"{title:<45} {pub_date[:10]:<12} {gain:>8} {start['follower_count']:>8} {end['follower_count']:>8} {art['total_views']:>8}")
-
-    def comment_engagement_correlation(self):
+                    results.append(FollowerGain(art['article_id'], art['title'], pub_date, gain,
+                                                start['follower_count'], end['follower_count'], art['total_views']))
+        conn.close()
+        return results
+    
+    def article_follower_correlation(self):
+        print("\n📊 ARTICLE → FOLLOWER CORRELATION (ROBUST DELTA)")
+        print("=" * 110)
+        print(f"{'Article':<45} {'Date':<12} {'Gain':>8} {'Start':>8} {'End':>8} {'Views':>8}")
+        print("-" * 110)
+        
+        for row in self.compute_follower_correlation():
+            title = (row.title[:42] + "...") if len(row.title) > 45 else row.title
+            print(f"{title:<45} {row.published_at[:10]:<12} {row.gain:>8} {row.start:>8} {row.end:>8} {row.views:>8}")
+    
+    @cached_section("advanced.comment_engagement", tables=("article_metrics", "comments"))
+    def compute_comment_engagement(self) -> AuthorInteraction:
         """Analyse l'impact de tes interactions sur l'engagement."""
         conn = self.db.get_connection()
         # Détection auto de l'auteur
         top_user = conn.execute("SELECT author_username FROM comments GROUP BY author_username ORDER BY COUNT(*) DESC LIMIT 1").fetchone()
         detected_author = top_user['author_username'] if top_user else self.author_username
-
-        print(f"\n💬 AUTHOR INTERACTION ↔ ENGAGEMENT (Detected: @{detected_author})")
-        print("=" * 110)
         
         articles = conn.execute("""
             SELECT am.article_id, am.title, MAX(am.views) as views, MAX(am.reactions) as reactions,
@@ -66,35 +134,55 @@ class AdvancedAnalytics:
                 (SELECT COUNT(*) FROM comments WHERE article_id = am.article_id AND author_username = ?) as author_replies
             FROM article_metrics am GROUP BY am.article_id ORDER BY reader_comments DESC
         """, (detected_author, detected_author)).fetchall()
+        conn.close()
         
-        print(f"{'Article':<45} {'Readers':>10} {'Author':>10} {'Reply %':>10} {'Engage %':>10}")
-        print("-" * 110)
-        
+        results = []
         for art in articles:
             reply_rate = (art['author_replies'] / art['reader_comments'] * 100) if art['reader_comments'] > 0 else 0
             engage_rate = ((art['reactions'] + art['reader_comments']) / art['views'] * 100) if art['views'] > 0 else 0
-            title = (art['title'][:42] + "...") if len(art['title']) > 45 else art['title']
-            print(f"{title:<45} {art['reader_comments']:>10} {art['author_replies']:>10} {reply_rate:>9.1f}% {engage_rate:>9.2f}%")
-
-    def velocity_milestone_correlation(self):
-        """Corrélation Vitesse vs Événements."""
-        conn = self.db.get_connection()
-        print(f"\n⚡ VELOCITY PEAKS ↔ MILESTONE EVENTS")
+            results.append(InteractionStats(art['article_id'], art['title'], art['reader_comments'],
+                                            art['author_replies'], reply_rate, engage_rate))
+        return AuthorInteraction(detected_author, results)
+    
+    def comment_engagement_correlation(self):
+        result = self.compute_comment_engagement()
+        
+        print(f"\n💬 AUTHOR INTERACTION ↔ ENGAGEMENT (Detected: @{result.detected_author})")
         print("=" * 110)
+        print(f"{'Article':<45} {'Readers':>10} {'Author':>10} {'Reply %':>10} {'Engage %':>10}")
+        print("-" * 110)
         
+        for art in result.articles:
+            title = (art.title[:42] + "...") if len(art.title) > 45 else art.title
+            print(f"{title:<45} {art.reader_comments:>10} {art.author_replies:>10} {art.reply_rate:>9.1f}% {art.engage_rate:>9.2f}%")
+    
+    @cached_section("advanced.velocity_milestones", tables=("article_metrics", "milestone_events"))
+    def compute_velocity_milestones(self) -> List[MilestoneVelocity]:
+        """Corrélation Vitesse vs Événements."""
+        conn = self.db.get_connection()
         milestones = conn.execute("SELECT * FROM milestone_events WHERE article_id IS NOT NULL ORDER BY occurred_at DESC").fetchall()
-        print(f"{'Event Type':<20} {'Article ID':<12} {'Time':<20} {'Before (v/h)':>15} {'After (v/h)':>15} {'Impact %':>10}")
-        print("-" * 110)
+        conn.close()
         
+        results = []
         for m in milestones:
             v_before = self._calculate_period_velocity(m['article_id'], m['occurred_at'], -24)
             v_after = self._calculate_period_velocity(m['article_id'], m['occurred_at'], 24)
             
             # Correction division par zéro / Impact 100% si départ à 0
             impact = ((v_after - v_before) / v_before * 100) if v_before > 0 else (100.0 if v_after > 0 else 0.0)
-
-            print(f"{m['event_type']:<20} {m['article_id']:<12} {m['occurred_at'][:19]:<20} {v_before:>15.2f} {v_after:>15.2f} {impact:>9.1f}%")
-
+            
+            results.append(MilestoneVelocity(m['event_type'], m['article_id'], m['occurred_at'], v_before, v_after, impact))
+        return results
+    
+    def velocity_milestone_correlation(self):
+        print(f"\n⚡ VELOCITY PEAKS ↔ MILESTONE EVENTS")
+        print("=" * 110)
+        print(f"{'Event Type':<20} {'Article ID':<12} {'Time':<20} {'Before (v/h)':>15} {'After (v/h)':>15} {'Impact %':>10}")
+        print("-" * 110)
+        
+        for m in self.compute_velocity_milestones():
+            print(f"{m.event_type:<20} {m.article_id:<12} {m.occurred_at[:19]:<20} {m.velocity_before:>15.2f} {m.velocity_after:>15.2f} {m.impact_pct:>9.1f}%")
+    
     def _calculate_period_velocity(self, article_id, event_time, hours_offset):
         """Calcule la vélocité sur 24h avant ou après."""
         conn = self.db.get_connection()
@@ -105,17 +193,25 @@ class AdvancedAnalytics:
         t_min, t_max = (t_event, t_target) if hours_offset > 0 else (t_target, t_event)
         
         metrics = conn.execute("""
-            SELECT views, collected_at FROM article_metrics 
+            SELECT views, collected_at FROM article_metrics
             WHERE article_id = ? AND collected_at BETWEEN ? AND ?
             ORDER BY collected_at ASC
         """, (article_id, t_min.isoformat(), t_max.isoformat())).fetchall()
+        conn.close()
         
         if len(metrics) < 2: return 0.0
         
+        # Normalisé par l'intervalle réel entre le premier et le dernier snapshot
+        # (une collecte manquée ne dilue plus le delta sur toute la fenêtre)
+        hours = (parse_ts(metrics[-1]['collected_at']) - parse_ts(metrics[0]['collected_at'])).total_seconds() / 3600
+        if hours <= 0: return 0.0
+        
         v_diff = abs(metrics[-1]['views'] - metrics[0]['views'])
-        return v_diff / abs(hours_offset)
+        return v_diff / hours
     
-    def weighted_follower_attribution(self, hours=168):
+    @cached_section("advanced.follower_attribution", tables=("article_metrics", "follower_events"),
+                    time_bucket="%Y-%m-%d %H")
+    def compute_follower_attribution(self, hours=168) -> FollowerAttribution:
         """
         Attribue les nouveaux followers au prorata du trafic (Share of Voice).
         Analyse les 'hours' dernières heures.
@@ -126,55 +222,41 @@ class AdvancedAnalytics:
         end_time = datetime.now()
         start_time = end_time - timedelta(hours=hours)
         
-        print(f"\n📈 PROGRESSION REPORT (Last {hours} hours)")
-        print("=" * 110)
-        
         # 2. Calculer le gain de followers total sur la période
         # Recherche par proximité temporelle (point le plus proche)
         f_start_result = conn.execute("""
-            SELECT follower_count, collected_at FROM follower_events 
+            SELECT follower_count, collected_at FROM follower_events
             ORDER BY ABS(strftime('%s', collected_at) - strftime('%s', ?)) ASC LIMIT 1
         """, (start_time.isoformat(),)).fetchone()
         
         f_end_result = conn.execute("""
-            SELECT follower_count, collected_at FROM follower_events 
+            SELECT follower_count, collected_at FROM follower_events
             ORDER BY ABS(strftime('%s', collected_at) - strftime('%s', ?)) ASC LIMIT 1
         """, (end_time.isoformat(),)).fetchone()
         
-        if not f_start_result or not f_end_result:
-            print("❌ Besoin d'au moins deux collectes pour calculer une progression.")
-            return
+        # Besoin de 2 collectes distinctes
+        if not f_start_result or not f_end_result or f_start_result['collected_at'] == f_end_result['collected_at']:
+            conn.close()
+            return FollowerAttribution(hours, "insufficient_data")
         
-        # Vérifier que ce ne sont pas les mêmes points (besoin de 2 collectes distinctes)
-        if f_start_result['collected_at'] == f_end_result['collected_at']:
-            print("❌ Besoin d'au moins deux collectes pour calculer une progression.")
-            return
-        
-        # Vérifier la tolérance de 30 minutes pour le point de départ
+        # Écart aux cibles (tolérance de 30 minutes, vérifiée à l'affichage)
         f_start_time = datetime.fromisoformat(f_start_result['collected_at'].replace('Z', '+00:00').replace(' ', 'T')).replace(tzinfo=None)
         f_end_time = datetime.fromisoformat(f_end_result['collected_at'].replace('Z', '+00:00').replace(' ', 'T')).replace(tzinfo=None)
         
-        start_delta = abs((f_start_time - start_time).total_seconds() / 60)  # en minutes
-        end_delta = abs((f_end_time - end_time).total_seconds() / 60)
-        
-        if start_delta > 30:
-            print(f"⚠️ Point de départ trouvé à {start_delta:.0f} min de la cible (tolérance: 30 min)")
-        if end_delta > 30:
-            print(f"⚠️ Point de fin trouvé à {end_delta:.0f} min de la cible (tolérance: 30 min)")
-        
-        # Calculer l'intervalle réel analysé
-        actual_interval = f_end_time - f_start_time
-        actual_hours = actual_interval.total_seconds() / 3600
-        actual_minutes = (actual_interval.total_seconds() % 3600) / 60
+        result = FollowerAttribution(
+            hours, "ok",
+            start_delta_minutes=abs((f_start_time - start_time).total_seconds() / 60),
+            end_delta_minutes=abs((f_end_time - end_time).total_seconds() / 60),
+            # Intervalle réel analysé
+            interval_seconds=(f_end_time - f_start_time).total_seconds(),
+            total_gain=f_end_result['follower_count'] - f_start_result['follower_count'],
+        )
         
-        f_start = f_start_result
-        f_end = f_end_result
-        total_gain = f_end['follower_count'] - f_start['follower_count']
+        if result.total_gain <= 0:
+            conn.close()
+            result.status = "no_gain"
+            return result
         
-        if total_gain <= 0:
-            print(f"ℹ️ Aucun gain de followers sur les {hours} dernières heures.")
-            return
-
         # 3. Calculer les vues gagnées par CHAQUE article sur la période
         articles = self.db.get_all_active_articles()
         attribution_data = []
@@ -183,14 +265,14 @@ class AdvancedAnalytics:
         for art in articles:
             # Vues au début de la fenêtre (recherche par proximité)
             v_start = conn.execute("""
-                SELECT views FROM article_metrics 
+                SELECT views FROM article_metrics
                 WHERE article_id = ?
                 ORDER BY ABS(strftime('%s', collected_at) - strftime('%s', ?)) ASC LIMIT 1
             """, (art['article_id'], start_time.isoformat())).fetchone()
             
             # Vues à la fin (recherche par proximité)
             v_end = conn.execute("""
-                SELECT views FROM article_metrics 
+                SELECT views FROM article_metrics
                 WHERE article_id = ?
                 ORDER BY ABS(strftime('%s', collected_at) - strftime('%s', ?)) ASC LIMIT 1
             """, (art['article_id'], end_time.isoformat())).fetchone()
@@ -198,49 +280,97 @@ class AdvancedAnalytics:
             if v_start and v_end:
                 gain = v_end['views'] - v_start['views']
                 if gain > 0:
-                    attribution_data.append({
-                        'title': art['title'],
-                        'views_gain': gain
-                    })
+                    attribution_data.append((art['title'], gain))
                     global_traffic_gain += gain
-
+        conn.close()
+        
+        result.total_traffic = global_traffic_gain
         if global_traffic_gain == 0:
+            result.status = "no_traffic"
+            return result
+        
+        # Trier par gain de vues pour voir les "moteurs" en haut
+        attribution_data.sort(key=lambda x: x[1], reverse=True)
+        
+        for title, views_gain in attribution_data:
+            share = (views_gain / global_traffic_gain)
+            # On multiplie le gain total par la part de trafic de l'article
+            result.articles.append(AttributedArticle(title, views_gain, share, share * result.total_gain))
+        return result
+    
+    def weighted_follower_attribution(self, hours=168):
+        result = self.compute_follower_attribution(hours=hours)
+        
+        print(f"\n📈 PROGRESSION REPORT (Last {hours} hours)")
+        print("=" * 110)
+        
+        if result.status == "insufficient_data":
+            print("❌ Besoin d'au moins deux collectes pour calculer une progression.")
+            return
+        
+        if result.start_delta_minutes > 30:
+            print(f"⚠️ Point de départ trouvé à {result.start_delta_minutes:.0f} min de la cible (tolérance: 30 min)")
+        if result.end_delta_minutes > 30:
+            print(f"⚠️ Point de fin trouvé à {result.end_delta_minutes:.0f} min de la cible (tolérance: 30 min)")
+        
+        if result.status == "no_gain":
+            print(f"ℹ️ Aucun gain de followers sur les {hours} dernières heures.")
+            return
+        
+        if result.status == "no_traffic":
             print("❌ Aucun trafic détecté sur la période.")
             return
-
+        
+        actual_hours = result.interval_seconds / 3600
+        actual_minutes = (result.interval_seconds % 3600) / 60
+        
         # 4. Affichage du rapport pondéré
-        print(f"Total Gain: +{total_gain} followers | Total Traffic: {global_traffic_gain} views")
+        print(f"Total Gain: +{result.total_gain} followers | Total Traffic: {result.total_traffic} views")
         print(f"Intervalle réel : {int(actual_hours)}h{int(actual_minutes)}m")
         print("-" * 110)
         print(f"{'Article':<50} {'Views':>12} {'Traffic %':>12} {'Followers':>15}")
         print("-" * 110)
         
-        # Trier par gain de vues pour voir les "moteurs" en haut
-        attribution_data.sort(key=lambda x: x['views_gain'], reverse=True)
-        
-        for item in attribution_data:
-            share = (item['views_gain'] / global_traffic_gain)
-            # On multiplie le gain total par la part de trafic de l'article
-            attributed_followers = share * total_gain
-            
-            title = (item['title'][:47] + "...") if len(item['title']) > 50 else item['title']
-            print(f"{title:<50} {item['views_gain']:>12,} {share:>11.1%} {attributed_followers:>15.1f}")
-
-    def full_report(self, hours=168):
+        for item in result.articles:
+            title = (item.title[:47] + "...") if len(item.title) > 50 else item.title
+            print(f"{title:<50} {item.views_gain:>12,} {item.share:>11.1%} {item.followers:>15.1f}")
+    
+    def full_report(self, hours=168, workers=None):
         print("\n" + "=" * 110)
         print(" " * 38 + "📊 ADVANCED ANALYTICS REPORT")
         print("=" * 110)
-        self.article_follower_correlation()
-        self.comment_engagement_correlation()
-        self.velocity_milestone_correlation()
-        self.weighted_follower_attribution(hours=hours)
+        # Sections indépendantes en lecture seule : exécutées en parallèle, affichées dans l'ordre
+        ReportRunner(workers).run([
+            self.article_follower_correlation,
+            self.comment_engagement_correlation,
+            self.velocity_milestone_correlation,
+            lambda: self.weighted_follower_attribution(hours=hours),
+        ])
+    
+    def compute_full_report(self, hours=168, workers=None):
+        """Toutes les sections sous forme d'objets résultat (section -> résultat)."""
+        sections = {
+            'follower_correlation': self.compute_follower_correlation,
+            'comment_engagement': self.compute_comment_engagement,
+            'velocity_milestones': self.compute_velocity_milestones,
+            'follower_attribution': lambda: self.compute_follower_attribution(hours=hours),
+        }
+        results = ReportRunner(workers).run(list(sections.values()))
+        return dict(zip(sections, results))
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--db', default='devto_metrics.db')
     parser.add_argument('--hours', type=int, default=168, help='Période d\'analyse en heures (défaut: 168 = 7 jours)')
+    parser.add_argument('--no-cache', action='store_true', help='Recalcule toutes les sections (ignore le cache)')
+    parser.add_argument('--workers', type=int, help='Sections exécutées en parallèle (1 = séquentiel)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Format de sortie')
     args = parser.parse_args()
-    AdvancedAnalytics(args.db).full_report(hours=args.hours)
+    analytics = AdvancedAnalytics(args.db, use_cache=not args.no_cache)
+    if args.format == 'json':
+        print(dump_json(analytics.compute_full_report(hours=args.hours, workers=args.workers)))
+    else:
+        analytics.full_report(hours=args.hours, workers=args.workers)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
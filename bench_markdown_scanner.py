@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark : ancien parse_markdown (5 passes regex) vs scanner en une passe.
+
+Usage:
+    python3 bench_markdown_scanner.py                  # corpus article_content de la base
+    python3 bench_markdown_scanner.py --synthetic 200  # corpus généré (base vide)
+"""
+
+import argparse
+import random
+import re
+import time
+from core.database import DatabaseManager
+from core.markdown_scanner import scan_markdown
+
+def legacy_parse_markdown(markdown):
+    """Ancienne implémentation de ContentCollector.parse_markdown (référence)."""
+    code_blocks = []
+    links = []
+
+    code_pattern = r'```(\w+)?\n(.*?)```'
+    for i, match in enumerate(re.finditer(code_pattern, markdown, re.DOTALL), 1):
+        code_text = match.group(2).strip()
+        code_blocks.append({
+            'language': match.group(1) or "text",
+            'code_text': code_text,
+            'line_count': len(code_text.split('\n')),
+            'block_order': i
+        })
+
+    link_pattern = r'\[([^\]]+)\]\(([^\)]+)\)'
+    for match in re.finditer(link_pattern, markdown):
+        url = match.group(2)
+        if url.startswith('#'):
+            link_type = 'anchor'
+        elif url.startswith('http'):
+            link_type = 'internal' if 'dev.to' in url else 'external'
+        else:
+            link_type = 'relative'
+        links.append({'url': url, 'link_text': match.group(1), 'link_type': link_type})
+
+    image_pattern = r'!\[([^\]]*)\]\(([^\)]+)\)'
+    images_count = len(re.findall(image_pattern, markdown))
+
+    heading_pattern = r'^#{1,6}\s+.+$'
+    headings_count = len(re.findall(heading_pattern, markdown, re.MULTILINE))
+
+    text_without_code = re.sub(code_pattern, '', markdown, flags=re.DOTALL)
+    words = text_without_code.split()
+
+    metrics = {
+        'word_count': len(words),
+        'char_count': len(markdown),
+        'code_blocks_count': len(code_blocks),
+        'links_count': len(links),
+        'images_count': images_count,
+        'headings_count': headings_count
+    }
+    return code_blocks, links, metrics
+
+def load_corpus(db_path):
+    db = DatabaseManager(db_path)
+    conn = db.get_connection()
+    if not DatabaseManager._table_exists(conn, "article_content"):
+        conn.close()
+        return []
+    rows = conn.execute("SELECT body_markdown FROM article_content").fetchall()
+    conn.close()
+    return [r['body_markdown'] for r in rows if r['body_markdown']]
+
+def synthetic_corpus(n, seed=0):
+    rng = random.Random(seed)
+    words = "the query index docker deploy career agile python database cloud feedback".split()
+    docs = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(10, 40)):
+            kind = rng.random()
+            if kind < 0.1:
+                parts.append(f"## {' '.join(rng.choices(words, k=4))}")
+            elif kind < 0.2:
+                parts.append("```python\n" + "\n".join(f"x = {i}" for i in range(rng.randint(3, 30))) + "\n```")
+            elif kind < 0.25:
+                parts.append("~~~sql\nSELECT 1;\n~~~")
+            elif kind < 0.3:
+                parts.append("{% embed https://dev.to/some/post %}")
+            else:
+                sentence = " ".join(rng.choices(words, k=rng.randint(20, 80)))
+                parts.append(f"{sentence} [a link](https://example.com/{rng.randint(0, 99)}) "
+                             f"![img](https://dev.to/i/{rng.randint(0, 99)}.png)")
+        doc = "\n\n".join(parts)
+        # Un document sur quatre en \r\n, comme body_markdown renvoyé par l'API
+        docs.append(doc.replace("\n", "\r\n") if rng.random() < 0.25 else doc)
+    return docs
+
+def best_of(func, corpus, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in corpus:
+            func(doc)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du parsing markdown")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--synthetic', type=int, help='Nombre de documents générés (au lieu de la base)')
+    parser.add_argument('--repeat', type=int, default=5, help='Répétitions (meilleur temps retenu)')
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.synthetic) if args.synthetic else load_corpus(args.db)
+    if not corpus:
+        print("❌ Corpus vide : lance content_collector.py ou utilise --synthetic N")
+        return
+
+    size = sum(len(doc) for doc in corpus)
+    legacy = best_of(legacy_parse_markdown, corpus, args.repeat)
+    single = best_of(scan_markdown, corpus, args.repeat)
+
+    print(f"\n⏱️  MARKDOWN PARSING ({len(corpus)} documents, {size / 1024:.0f} KiB)")
+    print("-" * 80)
+    print(f"{'Regex (5 passes)':<25} {legacy * 1000:>10.1f} ms")
+    print(f"{'Single pass scanner':<25} {single * 1000:>10.1f} ms   (x{legacy / single:.2f})")
+
+    # Écarts attendus : images comptées à part, fences ~~~ et code indenté reconnus
+    totals = {'code_blocks': [0, 0], 'links': [0, 0], 'images': [0, 0], 'headings': [0, 0], 'words': [0, 0]}
+    liquid = 0
+    for doc in corpus:
+        blocks, links, metrics = legacy_parse_markdown(doc)
+        scan = scan_markdown(doc)
+        for key, old, new in (
+            ('code_blocks', len(blocks), len(scan.code_blocks)),
+            ('links', len(links), len(scan.links)),
+            ('images', metrics['images_count'], len(scan.images)),
+            ('headings', metrics['headings_count'], len(scan.headings)),
+            ('words', metrics['word_count'], scan.word_count),
+        ):
+            totals[key][0] += old
+            totals[key][1] += new
+        liquid += len(scan.liquid_tags)
+
+    print(f"\n{'Count':<15} {'Regex':>10} {'Scanner':>10}")
+    for key, (old, new) in totals.items():
+        print(f"{key:<15} {old:>10} {new:>10}")
+    print(f"{'liquid_tags':<15} {'-':>10} {liquid:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ from datetime import datetime, timezone
 import json
 import os
 from dotenv import load_dotenv
+from core.database import DatabaseManager
+from core.daily_rollup import DailyRollup
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,6 +24,7 @@ class ArticleCleanup:
         self.headers = {"api-key": api_key}
         self.db_path = db_path
         self.conn = None
+        self.rollup = DailyRollup(DatabaseManager(db_path))
     
     def connect(self):
         """Connect to database"""
@@ -29,6 +32,10 @@ class ArticleCleanup:
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row
     
+    def sync_rollup(self):
+        """Répercute is_deleted / purges sur article_latest et daily_rollup (lus par les rapports)."""
+        self.rollup.refresh(self.conn)
+    
     def init_deleted_tracking(self):
         """Add deleted_at column to article_metrics if it doesn't exist"""
         self.connect()
@@ -121,6 +128,7 @@ class ArticleCleanup:
                     WHERE article_id = ?
                 """, (timestamp, article['article_id']))
             
+            self.sync_rollup()
             self.conn.commit()
             print(f"✅ Marked {len(deleted_articles)} articles as deleted")
             print("\n💡 These articles will now be filtered out from most reports")
@@ -216,6 +224,7 @@ class ArticleCleanup:
             cursor.execute("DELETE FROM comments WHERE article_id = ?", (article_id,))
             cursor.execute("DELETE FROM referrers WHERE article_id = ?", (article_id,))
         
+        self.sync_rollup()
         self.conn.commit()
         print(f"✅ Purged {len(article_ids)} articles from database")
     
@@ -231,6 +240,7 @@ class ArticleCleanup:
         """, (article_id,))
         
         if cursor.rowcount > 0:
+            self.sync_rollup()
             self.conn.commit()
             print(f"✅ Article {article_id} restored")
         else:
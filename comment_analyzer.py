@@ -6,10 +6,55 @@ Analyse qualitative de l'engagement via les commentaires
 
 import sqlite3
 import argparse
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import re
+from core.results import dump_json
+
+# --- RESULTS ---
+
+@dataclass(slots=True)
+class CommenterCount:
+    author_username: str
+    author_name: str
+    count: int
+
+@dataclass(slots=True)
+class ArticleCommentStats:
+    article_id: int
+    title: str
+    last_updated: str
+    total_comments: int = 0
+    unique_authors: int = 0
+    avg_length: float = 0.0
+    first_comment: Optional[str] = None
+    last_comment: Optional[str] = None
+    top_commenters: List[CommenterCount] = field(default_factory=list)
+    long_comments: int = 0
+    short_comments: int = 0
+    recent_comments: int = 0
+
+@dataclass(slots=True)
+class ArticleEngagement:
+    article_id: int
+    title: str
+    comment_count: int
+    unique_commenters: int
+    avg_length: float
+    first_comment: str
+    last_comment: str
+
+@dataclass(slots=True)
+class EngagedReader:
+    author_username: str
+    author_name: str
+    articles_commented: int
+    total_comments: int
+    avg_length: float
+    first_interaction: str
+    last_interaction: str
 
 class CommentAnalyzer:
     def __init__(self, db_path: str):
@@ -17,8 +62,8 @@ class CommentAnalyzer:
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row
     
-    def analyze_article_comments(self, article_id: int):
-        """Deep analysis of comments for a specific article"""
+    def compute_article_comments(self, article_id: int) -> Optional[ArticleCommentStats]:
+        """Deep analysis of comments for a specific article (None if no comments)"""
         cursor = self.conn.cursor()
         
         # Get article info
@@ -32,14 +77,7 @@ class CommentAnalyzer:
         
         article = cursor.fetchone()
         if not article:
-            print(f"❌ No comments found for article {article_id}")
-            return
-        
-        print(f"\n💬 COMMENT ANALYSIS")
-        print("=" * 80)
-        print(f"Article: {article['article_title']}")
-        print(f"Last updated: {article['collected_at']}")
-        print("=" * 80)
+            return None
         
         # Get all comments
         cursor.execute("""
@@ -51,25 +89,69 @@ class CommentAnalyzer:
         
         comments = cursor.fetchall()
         
+        result = ArticleCommentStats(
+            article_id=article_id,
+            title=article['article_title'],
+            last_updated=article['collected_at'],
+        )
         if not comments:
+            return result
+        
+        # Basic stats
+        result.total_comments = len(comments)
+        result.unique_authors = len(set(c['author_username'] for c in comments))
+        result.avg_length = sum(c['body_length'] for c in comments) / result.total_comments
+        result.first_comment = comments[0]['created_at']
+        result.last_comment = comments[-1]['created_at']
+        
+        # Top commenters
+        author_counts = Counter(c['author_username'] for c in comments)
+        for author, count in author_counts.most_common(5):
+            author_name = next((c['author_name'] for c in comments if c['author_username'] == author), author)
+            result.top_commenters.append(CommenterCount(author, author_name, count))
+        
+        # Engagement depth
+        result.long_comments = sum(1 for c in comments if c['body_length'] > 200)
+        result.short_comments = sum(1 for c in comments if c['body_length'] < 50)
+        
+        # Recent activity
+        cursor.execute("""
+            SELECT COUNT(*) as count
+            FROM comments
+            WHERE article_id = ?
+            AND created_at >= datetime('now', '-7 days')
+        """, (article_id,))
+        result.recent_comments = cursor.fetchone()['count']
+        
+        return result
+    
+    def render_article_comments(self, article_id: int, stats: Optional[ArticleCommentStats]):
+        if stats is None:
+            print(f"❌ No comments found for article {article_id}")
+            return
+        
+        print(f"\n💬 COMMENT ANALYSIS")
+        print("=" * 80)
+        print(f"Article: {stats.title}")
+        print(f"Last updated: {stats.last_updated}")
+        print("=" * 80)
+        
+        if not stats.total_comments:
             print("\n No comments yet")
             return
         
-        # Basic stats
-        total_comments = len(comments)
-        unique_authors = len(set(c['author_username'] for c in comments))
-        avg_length = sum(c['body_length'] for c in comments) / total_comments
+        total_comments = stats.total_comments
         
         print(f"\n📊 OVERVIEW")
         print("-" * 80)
         print(f"Total comments: {total_comments}")
-        print(f"Unique commenters: {unique_authors}")
-        print(f"Average length: {avg_length:.0f} characters")
-        print(f"Comments per person: {total_comments/unique_authors:.1f}")
+        print(f"Unique commenters: {stats.unique_authors}")
+        print(f"Average length: {stats.avg_length:.0f} characters")
+        print(f"Comments per person: {total_comments/stats.unique_authors:.1f}")
         
         # Timeline
-        first_comment = datetime.fromisoformat(comments[0]['created_at'].replace('Z', '+00:00'))
-        last_comment = datetime.fromisoformat(comments[-1]['created_at'].replace('Z', '+00:00'))
+        first_comment = datetime.fromisoformat(stats.first_comment.replace('Z', '+00:00'))
+        last_comment = datetime.fromisoformat(stats.last_comment.replace('Z', '+00:00'))
         duration = last_comment - first_comment
         
         print(f"\n⏱️  TIMELINE")
@@ -78,13 +160,11 @@ class CommentAnalyzer:
         print(f"Last comment: {last_comment.strftime('%Y-%m-%d %H:%M')}")
         print(f"Duration: {duration.days} days, {duration.seconds // 3600} hours")
         
-        # Top commenters
-        author_counts = Counter(c['author_username'] for c in comments)
         print(f"\n👥 TOP COMMENTERS")
         print("-" * 80)
-        for author, count in author_counts.most_common(5):
-            author_name = next((c['author_name'] for c in comments if c['author_username'] == author), author)
-            print(f"{author_name} (@{author}): {count} comment{'s' if count > 1 else ''}")
+        for commenter in stats.top_commenters:
+            count = commenter.count
+            print(f"{commenter.author_name} (@{commenter.author_username}): {count} comment{'s' if count > 1 else ''}")
         
         # Comment velocity (comments per day)
         if duration.days > 0:
@@ -93,29 +173,20 @@ class CommentAnalyzer:
             print("-" * 80)
             print(f"Comments per day: {comments_per_day:.1f}")
         
-        # Engagement depth
-        long_comments = sum(1 for c in comments if c['body_length'] > 200)
-        short_comments = sum(1 for c in comments if c['body_length'] < 50)
-        
         print(f"\n🎯 ENGAGEMENT DEPTH")
         print("-" * 80)
-        print(f"Long comments (>200 chars): {long_comments} ({long_comments/total_comments*100:.1f}%)")
-        print(f"Short comments (<50 chars): {short_comments} ({short_comments/total_comments*100:.1f}%)")
-        
-        # Recent activity
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM comments
-            WHERE article_id = ?
-            AND created_at >= datetime('now', '-7 days')
-        """, (article_id,))
-        recent = cursor.fetchone()
+        print(f"Long comments (>200 chars): {stats.long_comments} ({stats.long_comments/total_comments*100:.1f}%)")
+        print(f"Short comments (<50 chars): {stats.short_comments} ({stats.short_comments/total_comments*100:.1f}%)")
         
         print(f"\n🔥 RECENT ACTIVITY")
         print("-" * 80)
-        print(f"Comments in last 7 days: {recent['count']}")
+        print(f"Comments in last 7 days: {stats.recent_comments}")
     
-    def compare_article_engagement(self, limit: int = 10):
+    def analyze_article_comments(self, article_id: int):
+        """Deep analysis of comments for a specific article"""
+        self.render_article_comments(article_id, self.compute_article_comments(article_id))
+    
+    def compute_article_engagement(self, limit: int = 10) -> List[ArticleEngagement]:
         """Compare comment engagement across articles"""
         cursor = self.conn.cursor()
         
@@ -134,26 +205,34 @@ class CommentAnalyzer:
             LIMIT ?
         """, (limit,))
         
-        articles = cursor.fetchall()
-        
+        return [
+            ArticleEngagement(a['article_id'], a['article_title'], a['comment_count'], a['unique_commenters'],
+                              a['avg_length'] if a['avg_length'] else 0, a['first_comment'], a['last_comment'])
+            for a in cursor.fetchall()
+        ]
+    
+    def render_article_engagement(self, articles: List[ArticleEngagement]):
         print(f"\n📊 ARTICLE ENGAGEMENT COMPARISON")
         print("=" * 100)
         print(f"{'Article':<50} {'Comments':<10} {'Unique':<8} {'Avg Length':<12} {'Duration'}")
         print("-" * 100)
         
         for article in articles:
-            title = article['article_title'][:47] + "..." if len(article['article_title']) > 50 else article['article_title']
+            title = article.title[:47] + "..." if len(article.title) > 50 else article.title
             
-            first = datetime.fromisoformat(article['first_comment'].replace('Z', '+00:00'))
-            last = datetime.fromisoformat(article['last_comment'].replace('Z', '+00:00'))
+            first = datetime.fromisoformat(article.first_comment.replace('Z', '+00:00'))
+            last = datetime.fromisoformat(article.last_comment.replace('Z', '+00:00'))
             duration = last - first
             duration_str = f"{duration.days}d {duration.seconds//3600}h"
             
-            avg_len = article['avg_length'] if article['avg_length'] else 0
-            print(f"{title:<50} {article['comment_count']:<10} {article['unique_commenters']:<8} "
-                  f"{avg_len:<12.0f} {duration_str}")
+            print(f"{title:<50} {article.comment_count:<10} {article.unique_commenters:<8} "
+                  f"{article.avg_length:<12.0f} {duration_str}")
     
-    def find_engaged_readers(self):
+    def compare_article_engagement(self, limit: int = 10):
+        """Compare comment engagement across articles"""
+        self.render_article_engagement(self.compute_article_engagement(limit))
+    
+    def compute_engaged_readers(self) -> List[EngagedReader]:
         """Find your most engaged readers (across all articles)"""
         cursor = self.conn.cursor()
         
@@ -173,27 +252,35 @@ class CommentAnalyzer:
             LIMIT 20
         """)
         
-        readers = cursor.fetchall()
-        
+        return [
+            EngagedReader(r['author_username'], r['author_name'], r['articles_commented'], r['total_comments'],
+                          r['avg_length'] if r['avg_length'] else 0, r['first_interaction'], r['last_interaction'])
+            for r in cursor.fetchall()
+        ]
+    
+    def render_engaged_readers(self, readers: List[EngagedReader]):
         print(f"\n🌟 YOUR MOST ENGAGED READERS")
         print("=" * 100)
         print(f"{'Reader':<30} {'Articles':<10} {'Comments':<10} {'Avg Length':<12} {'Active Period'}")
         print("-" * 100)
         
         for reader in readers:
-            name = f"{reader['author_name']} (@{reader['author_username']})"[:28]
+            name = f"{reader.author_name} (@{reader.author_username})"[:28]
             
-            first = datetime.fromisoformat(reader['first_interaction'].replace('Z', '+00:00'))
-            last = datetime.fromisoformat(reader['last_interaction'].replace('Z', '+00:00'))
+            first = datetime.fromisoformat(reader.first_interaction.replace('Z', '+00:00'))
+            last = datetime.fromisoformat(reader.last_interaction.replace('Z', '+00:00'))
             period = (last - first).days
             period_str = f"{period} days" if period > 0 else "same day"
             
-            avg_len = reader['avg_length'] if reader['avg_length'] else 0
-            print(f"{name:<30} {reader['articles_commented']:<10} {reader['total_comments']:<10} "
-                  f"{avg_len:<12.0f} {period_str}")
+            print(f"{name:<30} {reader.articles_commented:<10} {reader.total_comments:<10} "
+                  f"{reader.avg_length:<12.0f} {period_str}")
     
-    def comment_timing_analysis(self):
-        """Analyze when comments typically arrive"""
+    def find_engaged_readers(self):
+        """Find your most engaged readers (across all articles)"""
+        self.render_engaged_readers(self.compute_engaged_readers())
+    
+    def compute_comment_timing(self) -> Dict[str, int]:
+        """Comments per delay bucket after publication (empty if no data)"""
         cursor = self.conn.cursor()
         
         cursor.execute("""
@@ -207,16 +294,10 @@ class CommentAnalyzer:
             WHERE article_metrics.published_at IS NOT NULL
         """)
         
-        comments = cursor.fetchall()
-        
-        if not comments:
-            print("❌ No data available for timing analysis")
-            return
-        
         # Group by time since publication
         time_buckets = defaultdict(int)
         
-        for comment in comments:
+        for comment in cursor.fetchall():
             pub = datetime.fromisoformat(comment['article_published'].replace('Z', '+00:00'))
             comm = datetime.fromisoformat(comment['comment_time'].replace('Z', '+00:00'))
             hours_diff = (comm - pub).total_seconds() / 3600
@@ -232,17 +313,28 @@ class CommentAnalyzer:
             else:
                 time_buckets['1+ months'] += 1
         
+        return dict(sorted(time_buckets.items()))
+    
+    def render_comment_timing(self, time_buckets: Dict[str, int]):
+        if not time_buckets:
+            print("❌ No data available for timing analysis")
+            return
+        
         print(f"\n⏰ COMMENT TIMING DISTRIBUTION")
         print("=" * 80)
         print(f"When do comments typically arrive after publication?")
         print("-" * 80)
         
         total = sum(time_buckets.values())
-        for bucket, count in sorted(time_buckets.items()):
+        for bucket, count in time_buckets.items():
             percentage = count / total * 100
             bar = '█' * int(percentage / 2)
             print(f"{bucket:<15} {count:>4} ({percentage:>5.1f}%) {bar}")
     
+    def comment_timing_analysis(self):
+        """Analyze when comments typically arrive"""
+        self.render_comment_timing(self.compute_comment_timing())
+    
     def close(self):
         """Close database connection"""
         if self.conn:
@@ -265,12 +357,25 @@ def main():
                        help='Analyze comment timing patterns')
     parser.add_argument('--full-report', action='store_true',
                        help='Generate full comment analysis report')
+    parser.add_argument('--format', choices=['text', 'json'], default='text',
+                       help='Output format')
     
     args = parser.parse_args()
     
     analyzer = CommentAnalyzer(args.db)
     
-    if args.full_report:
+    if args.format == 'json':
+        results = {}
+        if args.article:
+            results['article'] = analyzer.compute_article_comments(args.article)
+        if args.full_report or args.compare:
+            results['compare'] = analyzer.compute_article_engagement()
+        if args.full_report or args.engaged_readers:
+            results['engaged_readers'] = analyzer.compute_engaged_readers()
+        if args.full_report or args.timing:
+            results['timing'] = analyzer.compute_comment_timing()
+        print(dump_json(results))
+    elif args.full_report:
         analyzer.compare_article_engagement()
         analyzer.find_engaged_readers()
         analyzer.comment_timing_analysis()
@@ -6,30 +6,52 @@ Collects article content (markdown, code blocks, links) for future NLP analysis
 Usage:
     python3 content_collector.py --collect-all    # First run: get all articles
     python3 content_collector.py --collect-new    # Subsequent: only new articles
+    python3 content_collector.py --collect-changed  # New + edited since last collection (edited_at)
     python3 content_collector.py --article 123    # Specific article
+    python3 content_collector.py --collect-all --workers 4 --rate 4   # Concurrent collection
 """
 
 import requests
 import argparse
-import re
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 import os
-import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Import DatabaseManager from core
 from core.database import DatabaseManager
+from core.article_versions import ArticleVersions, describe_changes
+from core.comment_store import text_hash
+from core.markdown_scanner import scan_markdown
+from core.rate_limiter import RateLimiter
 
 # Load environment variables from .env file
 load_dotenv()
 
+def parse_markdown_body(markdown: str) -> Tuple[List[Dict], List[Dict], Dict]:
+    """Module-level so it can run in worker processes (see ContentCollector.parse_markdown)"""
+    scan = scan_markdown(markdown)
+    
+    metrics = {
+        'word_count': scan.word_count,
+        'char_count': scan.char_count,
+        'code_blocks_count': len(scan.code_blocks),
+        'links_count': len(scan.links),
+        'images_count': len(scan.images),
+        'headings_count': len(scan.headings)
+    }
+    
+    return scan.code_blocks, scan.links, metrics
+
 class ContentCollector:
     def __init__(self, api_key: str, db_path: str = "devto_metrics.db"):
         self.api_key = api_key
         self.db_manager = DatabaseManager(db_path)
         self.base_url = "https://dev.to/api"
         self.headers = {"api-key": api_key}
+        self.versions = ArticleVersions(self.db_manager)
     
     def init_db(self):
         """Initialize database with content tables"""
@@ -54,6 +76,7 @@ class ContentCollector:
                 headings_count INTEGER,
                 
                 -- Metadata
+                body_hash TEXT,
                 collected_at TIMESTAMP NOT NULL,
                 
                 FOREIGN KEY (article_id) REFERENCES article_metrics(article_id)
@@ -166,113 +189,209 @@ class ContentCollector:
             print(f"❌ Unknown mode: {mode}")
             return []
     
-    def fetch_article_content(self, article_id: int) -> Optional[Dict]:
+    def fetch_article_list(self) -> Dict[int, Dict]:
         """
-        Fetch article content from DEV.to API
+        Published articles from /articles/me/all (title, tags, edited_at...)
         
         Returns:
-            Dict with markdown, html, etc. or None if error
+            Dict article_id -> article
         """
-        try:
+        articles = {}
+        page = 1
+        while True:
             response = requests.get(
-                f"{self.base_url}/articles/{article_id}",
+                f"{self.base_url}/articles/me/all",
                 headers=self.headers,
-                timeout=10
+                params={"per_page": 1000, "page": page},
+                timeout=30
             )
+            if response.status_code != 200:
+                print(f"⚠️  API error {response.status_code} on article list")
+                break
+            
+            data = response.json()
+            for art in data:
+                if art.get('published_at'):
+                    articles[art['id']] = art
+            if len(data) < 1000:
+                break
+            page += 1
+        
+        return articles
+    
+    def get_changed_articles(self, listing: Dict[int, Dict]) -> List[int]:
+        """
+        Articles never collected, or whose edited_at differs from the last
+        collected version (article_history.edited_at_api)
+        """
+        conn = self.db_manager.get_connection()
+        collected = {row['article_id'] for row in conn.execute("SELECT article_id FROM article_content")}
+        known_edits = {
+            row['article_id']: row['edited_at_api']
+            for row in conn.execute("""
+                SELECT article_id, edited_at_api FROM (
+                    SELECT article_id, edited_at_api,
+                           ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY id DESC) as rn
+                    FROM article_history
+                    WHERE edited_at_api IS NOT NULL
+                ) WHERE rn = 1
+            """)
+        }
+        conn.close()
+        
+        new = [article_id for article_id in listing if article_id not in collected]
+        edited = [
+            article_id for article_id, art in listing.items()
+            if article_id in collected and art.get('edited_at')
+            and art['edited_at'] != known_edits.get(article_id)
+        ]
+        
+        print(f"📝 Found {len(new)} new and {len(edited)} edited articles")
+        return sorted(new + edited)
+    
+    def record_versions(self, articles: List[Dict]) -> int:
+        """
+        Fill article_history.content_hash / edited_at_api for freshly collected
+        bodies: one version row per article whose body hash or edited_at moved
+        (the version already recorded by ContentTracker at snapshot time is
+        completed with edited_at_api). The body itself goes to the
+        article_versions chain (keyframe or delta).
+        """
+        if not articles:
+            return 0
+        
+        conn = self.db_manager.get_connection()
+        ids = [art['id'] for art in articles]
+        placeholders = ','.join('?' * len(ids))
+        
+        bodies = {
+            row['article_id']: row
+            for row in conn.execute(
+                f"SELECT article_id, body_hash, body_markdown FROM article_content WHERE article_id IN ({placeholders})", ids
+            )
+        }
+        latest = {
+            row['article_id']: row
+            for row in conn.execute(f"""
+                SELECT id, article_id, content_hash, edited_at_api FROM (
+                    SELECT id, article_id, content_hash, edited_at_api,
+                           ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY id DESC) as rn
+                    FROM article_history
+                    WHERE article_id IN ({placeholders}) AND content_hash IS NOT NULL
+                ) WHERE rn = 1
+            """, ids)
+        }
+        
+        timestamp = datetime.now(timezone.utc).isoformat()
+        recorded = 0
+        for art in articles:
+            content = bodies.get(art['id'])
+            if not content:
+                continue
             
-            if response.status_code == 200:
-                return response.json()
+            tags = ",".join(art.get('tag_list', []))
+            last = latest.get(art['id'])
+            if last and last['content_hash'] == content['body_hash'] and last['edited_at_api'] in (None, art.get('edited_at')):
+                history_id = last['id']
+                if last['edited_at_api'] is None:
+                    conn.execute("UPDATE article_history SET edited_at_api = ? WHERE id = ?",
+                                 (art.get('edited_at'), history_id))
             else:
-                print(f"  ⚠️  API error {response.status_code} for article {article_id}")
-                return None
+                cursor = conn.execute("""
+                    INSERT INTO article_history (article_id, title, slug, tags, cover_image, content_hash, edited_at_api, changed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (art['id'], art.get('title'), art.get('slug'), tags, art.get('cover_image'),
+                      content['body_hash'], art.get('edited_at'), timestamp))
+                history_id = cursor.lastrowid
+                recorded += 1
+            
+            # The chain skips bodies/titles/tags it already has
+            added = self.versions.add(conn, art['id'], content['body_markdown'], art.get('title'), tags,
+                                      history_id=history_id, created_at=timestamp)
+            if added and added[1]:
+                print(f"  ✏️  #{art['id']} v{added[0]}: {describe_changes(added[1])}")
+        
+        conn.commit()
+        conn.close()
+        
+        print(f"🗂️  {recorded} new body version(s) recorded in article_history")
+        return recorded
+    
+    def fetch_article_content(self, article_id: int, limiter: Optional[RateLimiter] = None) -> Optional[Dict]:
+        """
+        Fetch article content from DEV.to API
+        
+        With a limiter, calls are spaced across all workers and a 429
+        response pushes every pending call back (Retry-After) before retrying.
+        
+        Returns:
+            Dict with markdown, html, etc. or None if error
+        """
+        for attempt in range(3):
+            if limiter:
+                limiter.acquire()
+            try:
+                response = requests.get(
+                    f"{self.base_url}/articles/{article_id}",
+                    headers=self.headers,
+                    timeout=10
+                )
                 
-        except Exception as e:
-            print(f"  ❌ Error fetching article {article_id}: {e}")
-            return None
+                if response.status_code == 200:
+                    return response.json()
+                elif response.status_code == 429 and limiter:
+                    retry_after = response.headers.get('Retry-After', '')
+                    delay = float(retry_after) if retry_after.isdigit() else 5.0
+                    print(f"  ⏳ Rate limited on article {article_id}, backing off {delay:.0f}s")
+                    limiter.backoff(delay)
+                else:
+                    print(f"  ⚠️  API error {response.status_code} for article {article_id}")
+                    return None
+                    
+            except Exception as e:
+                print(f"  ❌ Error fetching article {article_id}: {e}")
+                return None
+        return None
+    
+    def get_titles(self, article_ids: List[int]) -> Dict[int, str]:
+        """Latest known title of each article, in one query"""
+        conn = self.db_manager.get_connection()
+        # SQLite : colonnes nues d'un GROUP BY avec MAX() = ligne du max
+        rows = conn.execute("""
+            SELECT article_id, title, MAX(collected_at)
+            FROM article_metrics
+            GROUP BY article_id
+        """).fetchall()
+        conn.close()
+        
+        wanted = set(article_ids)
+        return {row['article_id']: row['title'] for row in rows if row['article_id'] in wanted}
     
     def parse_markdown(self, markdown: str) -> Tuple[List[Dict], List[Dict], Dict]:
         """
         Parse markdown to extract:
-        - Code blocks
-        - Links
+        - Code blocks (``` / ~~~ fences and indented code)
+        - Links (images are counted separately)
         - Basic metrics
         
+        Single pass over the body, see core/markdown_scanner.py
+        
         Returns:
             (code_blocks, links, metrics)
         """
-        code_blocks = []
-        links = []
-        
-        # Extract code blocks
-        # Pattern: ```language\ncode\n```
-        code_pattern = r'```(\w+)?\n(.*?)```'
-        for i, match in enumerate(re.finditer(code_pattern, markdown, re.DOTALL), 1):
-            language = match.group(1) or "text"
-            code_text = match.group(2).strip()
-            line_count = len(code_text.split('\n'))
-            
-            code_blocks.append({
-                'language': language,
-                'code_text': code_text,
-                'line_count': line_count,
-                'block_order': i
-            })
-        
-        # Extract links
-        # Pattern: [text](url)
-        link_pattern = r'\[([^\]]+)\]\(([^\)]+)\)'
-        for match in re.finditer(link_pattern, markdown):
-            link_text = match.group(1)
-            url = match.group(2)
-            
-            # Determine link type
-            if url.startswith('#'):
-                link_type = 'anchor'
-            elif url.startswith('http'):
-                if 'dev.to' in url:
-                    link_type = 'internal'
-                else:
-                    link_type = 'external'
-            else:
-                link_type = 'relative'
-            
-            links.append({
-                'url': url,
-                'link_text': link_text,
-                'link_type': link_type
-            })
-        
-        # Extract images
-        # Pattern: ![alt](url)
-        image_pattern = r'!\[([^\]]*)\]\(([^\)]+)\)'
-        images_count = len(re.findall(image_pattern, markdown))
-        
-        # Count headings
-        # Pattern: # Heading, ## Heading, etc.
-        heading_pattern = r'^#{1,6}\s+.+$'
-        headings_count = len(re.findall(heading_pattern, markdown, re.MULTILINE))
-        
-        # Calculate metrics
-        # Remove code blocks for word count (to not count code as words)
-        text_without_code = re.sub(code_pattern, '', markdown, flags=re.DOTALL)
-        words = text_without_code.split()
-        
-        metrics = {
-            'word_count': len(words),
-            'char_count': len(markdown),
-            'code_blocks_count': len(code_blocks),
-            'links_count': len(links),
-            'images_count': images_count,
-            'headings_count': headings_count
-        }
-        
-        return code_blocks, links, metrics
+        return parse_markdown_body(markdown)
     
-    def save_article_content(self, article_id: int, article_data: Dict):
+    def save_article_content(self, article_id: int, article_data: Dict,
+                             parsed: Optional[Tuple] = None, conn=None):
         """
         Save article content to database
+        
+        parsed: (code_blocks, links, metrics) already computed by a worker process
+        conn: shared writer connection (the caller commits)
         """
-        conn = self.db_manager.get_connection()
+        should_close = conn is None
+        if conn is None:
+            conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         timestamp = datetime.now(timezone.utc).isoformat()
         
@@ -281,18 +400,45 @@ class ContentCollector:
         
         if not markdown:
             print(f"  ⚠️  No markdown content for article {article_id}")
-            conn.close()
-            return
+            if should_close:
+                conn.close()
+            return False
+        
+        # Same body as the stored one: code blocks and links are still valid
+        body_hash = text_hash(markdown)
+        row = cursor.execute(
+            "SELECT body_hash FROM article_content WHERE article_id = ?", (article_id,)
+        ).fetchone()
+        if row and row['body_hash'] == body_hash:
+            cursor.execute("""
+                UPDATE article_content SET body_html = ?, collected_at = ? WHERE article_id = ?
+            """, (html, timestamp, article_id))
+            if should_close:
+                conn.commit()
+                conn.close()
+            print(f"  ♻️  Body unchanged, code blocks and links kept")
+            return True
         
         # Parse markdown
-        code_blocks, links, metrics = self.parse_markdown(markdown)
+        code_blocks, links, metrics = parsed or self.parse_markdown(markdown)
         
-        # Save main content
+        # Save main content (UPSERT, not REPLACE: the full-text index triggers see an UPDATE)
         cursor.execute("""
-            INSERT OR REPLACE INTO article_content
+            INSERT INTO article_content
             (article_id, body_markdown, body_html, word_count, char_count,
-             code_blocks_count, links_count, images_count, headings_count, collected_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             code_blocks_count, links_count, images_count, headings_count, body_hash, collected_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(article_id) DO UPDATE SET
+                body_markdown = excluded.body_markdown,
+                body_html = excluded.body_html,
+                word_count = excluded.word_count,
+                char_count = excluded.char_count,
+                code_blocks_count = excluded.code_blocks_count,
+                links_count = excluded.links_count,
+                images_count = excluded.images_count,
+                headings_count = excluded.headings_count,
+                body_hash = excluded.body_hash,
+                collected_at = excluded.collected_at
         """, (
             article_id,
             markdown,
@@ -303,6 +449,7 @@ class ContentCollector:
             metrics['links_count'],
             metrics['images_count'],
             metrics['headings_count'],
+            body_hash,
             timestamp
         ))
         
@@ -337,69 +484,120 @@ class ContentCollector:
                 link['link_type']
             ))
         
-        conn.commit()
-        conn.close()
+        if should_close:
+            conn.commit()
+            conn.close()
         
         # Print summary
         print(f"  ✅ Saved: {metrics['word_count']} words, "
               f"{metrics['code_blocks_count']} code blocks, "
               f"{metrics['links_count']} links")
+        return True
     
-    def collect_articles(self, article_ids: List[int]):
+    def collect_articles(self, article_ids: List[int], workers: int = 1, rate: float = 2.0):
         """
         Collect content for a list of articles
+        
+        workers > 1: bodies are fetched by a thread pool sharing one rate limiter,
+        parsed in worker processes and written by this thread on a single connection.
+        rate: max API calls per second (2.0 = the historical 0.5s delay)
+        
+        Returns:
+            IDs of the articles saved
         """
         if not article_ids:
             print("📭 No articles to collect")
-            return
+            return []
         
         print(f"\n🚀 Starting collection for {len(article_ids)} article(s)...")
         print("=" * 80)
         
-        successful = 0
-        failed = 0
+        titles = self.get_titles(article_ids)
+        limiter = RateLimiter(rate)
+        
+        if workers <= 1:
+            saved = self._collect_serial(article_ids, titles, limiter)
+        else:
+            saved = self._collect_concurrent(article_ids, titles, limiter, workers)
+        
+        # Summary
+        print("\n" + "=" * 80)
+        print("📊 COLLECTION SUMMARY")
+        print("=" * 80)
+        print(f"✅ Successful: {len(saved)}")
+        print(f"❌ Failed:     {len(article_ids) - len(saved)}")
+        print(f"📦 Total:      {len(article_ids)}")
+        return saved
+    
+    def _collect_serial(self, article_ids, titles, limiter):
+        saved = []
         
         for i, article_id in enumerate(article_ids, 1):
-            # Get article title for nicer display
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT title FROM article_metrics 
-                WHERE article_id = ? 
-                LIMIT 1
-            """, (article_id,))
-            
-            row = cursor.fetchone()
-            conn.close()
-            title = row['title'][:60] if row else f"Article {article_id}"
+            title = titles.get(article_id, f"Article {article_id}")[:60]
             
             print(f"\n[{i}/{len(article_ids)}] {title}...")
             print(f"  📥 Fetching content from API...")
             
-            # Fetch from API
-            article_data = self.fetch_article_content(article_id)
+            # Fetch from API (the limiter spaces calls, like the old 0.5s delay)
+            article_data = self.fetch_article_content(article_id, limiter)
             
             if article_data:
                 # Save to database
                 try:
-                    self.save_article_content(article_id, article_data)
-                    successful += 1
+                    if self.save_article_content(article_id, article_data):
+                        saved.append(article_id)
                 except Exception as e:
                     print(f"  ❌ Error saving: {e}")
-                    failed += 1
-            else:
-                failed += 1
-            
-            # Small delay to be nice to API
-            time.sleep(0.5)
         
-        # Summary
-        print("\n" + "=" * 80)
-        print("📊 COLLECTION SUMMARY")
-        print("=" * 80)
-        print(f"✅ Successful: {successful}")
-        print(f"❌ Failed:     {failed}")
-        print(f"📦 Total:      {len(article_ids)}")
+        return saved
+    
+    def _collect_concurrent(self, article_ids, titles, limiter, workers):
+        saved = []
+        done = 0
+        parse_workers = min(workers, os.cpu_count() or 1)
+        print(f"⚡ {workers} fetch workers, {parse_workers} parse processes, {limiter.interval:.2f}s between API calls")
+        
+        conn = self.db_manager.get_connection()
+        
+        def write(article_id, article_data, parse_future):
+            nonlocal done
+            done += 1
+            print(f"\n[{done}/{len(article_ids)}] {titles.get(article_id, f'Article {article_id}')[:60]}...")
+            try:
+                if self.save_article_content(article_id, article_data, parse_future.result(), conn):
+                    conn.commit()
+                    saved.append(article_id)
+            except Exception as e:
+                conn.rollback()
+                print(f"  ❌ Error saving: {e}")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as fetchers, \
+                    ProcessPoolExecutor(max_workers=parse_workers) as parsers:
+                fetches = {
+                    fetchers.submit(self.fetch_article_content, article_id, limiter): article_id
+                    for article_id in article_ids
+                }
+                # Écritures dans l'ordre de fin des fetchs, dès que le parsing est prêt
+                pending = deque()
+                for future in as_completed(fetches):
+                    article_id = fetches[future]
+                    article_data = future.result()
+                    if not article_data:
+                        done += 1
+                        continue
+                    
+                    markdown = article_data.get('body_markdown') or ''
+                    pending.append((article_id, article_data, parsers.submit(parse_markdown_body, markdown)))
+                    while pending and pending[0][2].done():
+                        write(*pending.popleft())
+                
+                while pending:
+                    write(*pending.popleft())
+        finally:
+            conn.close()
+        
+        return saved
     
     def show_stats(self):
         """Show statistics about collected content"""
@@ -506,11 +704,17 @@ def main():
                            help='Collect ALL articles (first run)')
     mode_group.add_argument('--collect-new', action='store_true',
                            help='Collect only NEW articles (not yet in DB)')
+    mode_group.add_argument('--collect-changed', action='store_true',
+                           help='Collect NEW and EDITED articles (edited_at from the article list)')
     mode_group.add_argument('--article', type=int, metavar='ID',
                            help='Collect specific article by ID')
     
     parser.add_argument('--stats', action='store_true',
                        help='Show statistics after collection')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Concurrent fetch workers (default: 1, sequential)')
+    parser.add_argument('--rate', type=float, default=2.0,
+                       help='Max API calls per second across all workers (default: 2)')
     
     args = parser.parse_args()
     
@@ -539,15 +743,25 @@ def main():
         elif args.collect_new:
             mode = "new"
             specific_id = None
+        elif args.collect_changed:
+            mode = "changed"
+            specific_id = None
         elif args.article:
             mode = "specific"
             specific_id = args.article
         
         # Get articles to collect
-        article_ids = collector.get_articles_to_collect(mode, specific_id)
+        if mode == "changed":
+            listing = collector.fetch_article_list()
+            article_ids = collector.get_changed_articles(listing)
+        else:
+            article_ids = collector.get_articles_to_collect(mode, specific_id)
         
         # Collect
-        collector.collect_articles(article_ids)
+        saved = collector.collect_articles(article_ids, workers=args.workers, rate=args.rate)
+        
+        if mode == "changed":
+            collector.record_versions([listing[article_id] for article_id in saved])
         
         # Show stats
         if args.stats or mode == "all":
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+from core.database import DatabaseManager
+from core.markdown_scanner import scan_markdown
+from core.results import dump_json
+
+KEYFRAME_INTERVAL = 10
+
+@dataclass(slots=True)
+class ArticleVersion:
+    article_id: int
+    version: int
+    created_at: str
+    is_keyframe: bool
+    content_hash: str
+    title: Optional[str]
+    tags: Optional[str]
+    changes: Optional[Dict]
+
+def make_delta(old_lines, new_lines):
+    """Delta ligne à ligne : ["=", i1, i2] copie des lignes de la version précédente, ["+", lignes] ajout."""
+    ops = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            ops.append(["=", i1, i2])
+        elif j2 > j1:
+            ops.append(["+", new_lines[j1:j2]])
+    return ops
+
+def apply_delta(old_lines, ops):
+    lines = []
+    for op in ops:
+        if op[0] == "=":
+            lines.extend(old_lines[op[1]:op[2]])
+        else:
+            lines.extend(op[1])
+    return lines
+
+def sections(markdown):
+    """Empreinte de chaque section (découpage sur les titres, hors blocs de code)."""
+    # Mêmes fins de ligne que scan_markdown, dont les offsets de titres sont relatifs au texte en \n
+    markdown = (markdown or "").replace("\r\n", "\n")
+    headings = scan_markdown(markdown).headings
+    bounds = [0] + [h['offset'] for h in headings] + [len(markdown)]
+    names = ["(intro)"] + [h['text'] for h in headings]
+
+    result = {}
+    for name, start, end in zip(names, bounds, bounds[1:]):
+        key = name
+        n = 2
+        while key in result:  # titres en double : "Setup", "Setup #2"
+            key = f"{name} #{n}"
+            n += 1
+        result[key] = hashlib.sha1(markdown[start:end].encode("utf-8")).hexdigest()
+    return result
+
+def diff_versions(old_body, new_body, old_title=None, new_title=None, old_tags=None, new_tags=None):
+    """Ce qui a changé entre deux versions : titre, tags, sections, lignes."""
+    changes = {}
+    if old_title != new_title:
+        changes['title'] = [old_title, new_title]
+
+    old_set = set(filter(None, (old_tags or "").split(",")))
+    new_set = set(filter(None, (new_tags or "").split(",")))
+    if old_set != new_set:
+        changes['tags'] = {'added': sorted(new_set - old_set), 'removed': sorted(old_set - new_set)}
+
+    if old_body != new_body:
+        before, after = sections(old_body), sections(new_body)
+        changes['sections'] = {
+            'added': [s for s in after if s not in before],
+            'removed': [s for s in before if s not in after],
+            'modified': [s for s in after if s in before and before[s] != after[s]],
+        }
+        old_lines, new_lines = old_body.splitlines(), new_body.splitlines()
+        added = removed = 0
+        for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+            if tag != 'equal':
+                removed += i2 - i1
+                added += j2 - j1
+        changes['lines'] = {'added': added, 'removed': removed}
+    return changes
+
+def describe_changes(changes):
+    """Résumé d'une ligne (description des milestones)."""
+    parts = []
+    if 'title' in changes:
+        parts.append(f"title '{changes['title'][0]}' → '{changes['title'][1]}'")
+    if 'tags' in changes:
+        tags = [f"+{t}" for t in changes['tags']['added']] + [f"-{t}" for t in changes['tags']['removed']]
+        parts.append(f"tags {' '.join(tags)}")
+    if 'sections' in changes:
+        s = changes['sections']
+        touched = s['added'] + s['modified'] + s['removed']
+        label = ", ".join(touched[:3]) + ("..." if len(touched) > 3 else "")
+        parts.append(f"body +{changes['lines']['added']}/-{changes['lines']['removed']} lines"
+                     + (f" ({label})" if touched else ""))
+    return "; ".join(parts) or "no change"
+
+class ArticleVersions:
+    """
+    Historique des corps d'articles (table article_versions, liée à article_history).
+
+    Une version sur KEYFRAME_INTERVAL stocke le texte complet (zlib), les autres
+    un delta compressé par rapport à la version précédente : reconstruire une
+    version coûte au plus KEYFRAME_INTERVAL - 1 applications de delta. Les
+    changements (titre, tags, sections) sont calculés à l'écriture et stockés en
+    JSON à côté, pour que les timelines ne lisent jamais les corps.
+    """
+
+    def __init__(self, db: DatabaseManager, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.db = db
+        self.keyframe_interval = keyframe_interval
+
+    def add(self, conn, article_id, markdown, title=None, tags=None, history_id=None, created_at=None):
+        """
+        Ajoute une version si le corps, le titre ou les tags ont changé (sans commit).
+        Retourne (version, changes) ou None si rien n'a changé.
+        """
+        content_hash = hashlib.sha1(markdown.encode("utf-8")).hexdigest()
+        created_at = created_at or datetime.now(timezone.utc).isoformat()
+
+        last = conn.execute("""
+            SELECT version, content_hash, title, tags,
+                   (SELECT MAX(version) FROM article_versions
+                    WHERE article_id = ? AND is_keyframe = 1) as keyframe
+            FROM article_versions
+            WHERE article_id = ?
+            ORDER BY version DESC LIMIT 1
+        """, (article_id, article_id)).fetchone()
+
+        if last is None:
+            conn.execute("""
+                INSERT INTO article_versions
+                (article_id, version, history_id, is_keyframe, content_hash, title, tags, changes, created_at, body)
+                VALUES (?, 1, ?, 1, ?, ?, ?, NULL, ?, ?)
+            """, (article_id, history_id, content_hash, title, tags, created_at,
+                  zlib.compress(markdown.encode("utf-8"))))
+            return 1, None
+
+        if last['content_hash'] == content_hash and last['title'] == title and last['tags'] == tags:
+            return None
+
+        previous = self.body(article_id, last['version'], conn)
+        changes = diff_versions(previous, markdown, last['title'], title, last['tags'], tags)
+        version = last['version'] + 1
+
+        full = zlib.compress(markdown.encode("utf-8"))
+        delta = zlib.compress(json.dumps(
+            make_delta(previous.splitlines(keepends=True), markdown.splitlines(keepends=True))
+        ).encode("utf-8"))
+        # Keyframe périodique, ou quand le delta n'est pas plus petit (réécriture complète)
+        is_keyframe = version - last['keyframe'] >= self.keyframe_interval or len(delta) >= len(full)
+
+        conn.execute("""
+            INSERT INTO article_versions
+            (article_id, version, history_id, is_keyframe, content_hash, title, tags, changes, created_at, body)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (article_id, version, history_id, int(is_keyframe), content_hash, title, tags,
+              json.dumps(changes), created_at, full if is_keyframe else delta))
+        return version, changes
+
+    def body(self, article_id, version=None, conn=None):
+        """Texte d'une version (la dernière par défaut) : keyframe + deltas suivants."""
+        should_close = conn is None
+        if conn is None:
+            conn = self.db.get_connection()
+
+        if version is None:
+            version = conn.execute(
+                "SELECT MAX(version) FROM article_versions WHERE article_id = ?", (article_id,)
+            ).fetchone()[0]
+
+        rows = conn.execute("""
+            SELECT version, is_keyframe, body FROM article_versions
+            WHERE article_id = ? AND version <= ? AND version >= (
+                SELECT MAX(version) FROM article_versions
+                WHERE article_id = ? AND version <= ? AND is_keyframe = 1
+            )
+            ORDER BY version
+        """, (article_id, version, article_id, version)).fetchall()
+
+        if should_close:
+            conn.close()
+        if not rows:
+            return None
+
+        lines = zlib.decompress(rows[0]['body']).decode("utf-8").splitlines(keepends=True)
+        for row in rows[1:]:
+            lines = apply_delta(lines, json.loads(zlib.decompress(row['body'])))
+        return "".join(lines)
+
+    def compute_history(self, article_id: Optional[int] = None, since: Optional[str] = None,
+                        edits_only: bool = False) -> List[ArticleVersion]:
+        """
+        Versions (métadonnées et changements, sans les corps).
+        edits_only : uniquement les modifications (version > 1), pour annoter une timeline.
+        """
+        where, params = [], []
+        if article_id is not None:
+            where.append("article_id = ?")
+            params.append(article_id)
+        if since:
+            where.append("created_at >= ?")
+            params.append(since)
+        if edits_only:
+            where.append("version > 1")
+
+        conn = self.db.get_connection()
+        rows = conn.execute(f"""
+            SELECT article_id, version, created_at, is_keyframe, content_hash, title, tags, changes
+            FROM article_versions
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY created_at, article_id, version
+        """, params).fetchall()
+        conn.close()
+
+        return [
+            ArticleVersion(r['article_id'], r['version'], r['created_at'], bool(r['is_keyframe']),
+                           r['content_hash'], r['title'], r['tags'],
+                           json.loads(r['changes']) if r['changes'] else None)
+            for r in rows
+        ]
+
+    def render_history(self, versions: List[ArticleVersion]):
+        if not versions:
+            print("❌ Aucune version enregistrée (lance content_collector.py --collect-changed)")
+            return
+
+        print(f"\n🗂️  VERSIONS ({len(versions)})")
+        print("-" * 80)
+        for v in versions:
+            marker = "🔑" if v.is_keyframe else "  "
+            summary = describe_changes(v.changes) if v.changes else "version initiale"
+            print(f"{marker} #{v.article_id} v{v.version:<3} {v.created_at[:16]}  {summary}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Historique des versions d'articles")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--article', type=int, help='Article ID (défaut : toutes les modifications)')
+    parser.add_argument('--version', type=int, help='Affiche le markdown de cette version (avec --article)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Format de sortie')
+    args = parser.parse_args()
+
+    versions = ArticleVersions(DatabaseManager(args.db))
+
+    if args.version is not None:
+        if args.article is None:
+            parser.error("--version requiert --article")
+        body = versions.body(args.article, args.version)
+        print(body if body is not None else f"❌ Version {args.version} introuvable")
+    else:
+        history = versions.compute_history(args.article, edits_only=args.article is None)
+        if args.format == 'json':
+            print(dump_json(history))
+        else:
+            versions.render_history(history)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from core.database import DatabaseManager
+from core.rate_limiter import RateLimiter
+
+CHUNK_DAYS = 90
+BATCH_CHUNKS = 50
+
+def historical_rows(article_id, data, timestamp):
+    """Réponse de /analytics/historical (date -> stats) -> lignes de daily_analytics, triées par date."""
+    return [
+        (
+            article_id, date_str,
+            stats['page_views']['total'],
+            stats['page_views'].get('average_read_time_in_seconds', 0),
+            stats['page_views'].get('total_read_time_in_seconds', 0),
+            stats['reactions']['total'],
+            stats['reactions'].get('like', 0),
+            stats['reactions'].get('readinglist', 0),
+            stats['reactions'].get('unicorn', 0),
+            stats['comments']['total'],
+            stats['follows']['total'],
+            timestamp,
+        )
+        for date_str, stats in sorted(data.items())
+    ]
+
+UPSERT_DAILY = """
+    INSERT INTO daily_analytics
+    (article_id, date, page_views, average_read_time_seconds, total_read_time_seconds,
+     reactions_total, reactions_like, reactions_readinglist, reactions_unicorn,
+     comments_total, follows_total, collected_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(article_id, date) DO UPDATE SET
+        page_views = excluded.page_views,
+        average_read_time_seconds = excluded.average_read_time_seconds,
+        total_read_time_seconds = excluded.total_read_time_seconds,
+        reactions_total = excluded.reactions_total,
+        reactions_like = excluded.reactions_like,
+        reactions_readinglist = excluded.reactions_readinglist,
+        reactions_unicorn = excluded.reactions_unicorn,
+        comments_total = excluded.comments_total,
+        follows_total = excluded.follows_total,
+        collected_at = excluded.collected_at
+"""
+
+def plan_chunks(articles, since: date, until: date, chunk_days: int = CHUNK_DAYS):
+    """
+    Découpe le backfill en (article_id, start, end) : fenêtres de chunk_days jours
+    de max(since, publication) à until inclus.
+    """
+    chunks = []
+    for art in articles:
+        if not art.get('published_at'):
+            continue
+        start = max(since, datetime.fromisoformat(art['published_at'].replace('Z', '+00:00')).date())
+        while start <= until:
+            end = min(start + timedelta(days=chunk_days - 1), until)
+            chunks.append((art['id'], start.isoformat(), end.isoformat()))
+            start = end + timedelta(days=1)
+    return chunks
+
+@dataclass(slots=True)
+class BackfillSummary:
+    planned: int
+    skipped: int
+    fetched: int
+    failed: int
+    rows: int
+    seconds: float
+
+class HistoricalBackfill:
+    """
+    Backfill de daily_analytics sur une longue période, en une exécution sans surveillance.
+
+    - Travail découpé en chunks (article, plage de dates), récupérés par un pool de
+      threads qui se partagent un RateLimiter (un 429 repousse tous les appels).
+    - Checkpoint : chaque chunk chargé est noté dans backfill_chunks, dans la même
+      transaction que ses lignes ; une relance reprend là où la précédente s'est arrêtée.
+      Un chunk qui contient aujourd'hui n'est jamais noté (journée encore ouverte).
+    - Chargement en lot : lignes triées par (article_id, date) avant l'insertion
+      (parcours séquentiel de l'index UNIQUE), index secondaires supprimés pendant le
+      chargement puis reconstruits une seule fois à la fin.
+    """
+
+    def __init__(self, db: DatabaseManager, headers, base_url="https://dev.to/api",
+                 workers: int = 4, rate: float = 2.0, chunk_days: int = CHUNK_DAYS):
+        self.db = db
+        self.headers = headers
+        self.base_url = base_url
+        self.workers = workers
+        self.limiter = RateLimiter(rate)
+        self.chunk_days = chunk_days
+
+    def fetch_chunk(self, article_id, start, end):
+        """Stats quotidiennes d'un article sur [start, end], ou None après échec (chunk repris à la relance)."""
+        for attempt in range(3):
+            self.limiter.acquire()
+            try:
+                r = requests.get(
+                    f"{self.base_url}/analytics/historical",
+                    headers=self.headers,
+                    params={"article_id": article_id, "start": start, "end": end},
+                    timeout=30
+                )
+            except Exception as e:
+                print(f"  ❌ #{article_id} {start}→{end}: {e}")
+                return None
+
+            if r.status_code == 200:
+                return r.json()
+            if r.status_code == 429:
+                retry_after = r.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else 5.0
+                print(f"  ⏳ Rate limited, backing off {delay:.0f}s")
+                self.limiter.backoff(delay)
+                continue
+            print(f"  ⚠️  API error {r.status_code} for #{article_id} {start}→{end}")
+            return None
+        return None
+
+    def done_chunks(self, conn):
+        return {(row[0], row[1], row[2]) for row in conn.execute(
+            "SELECT article_id, start_date, end_date FROM backfill_chunks"
+        )}
+
+    def run(self, articles, since: date, until: date = None) -> BackfillSummary:
+        started = time.perf_counter()
+        today = datetime.now(timezone.utc).date()
+        until = min(until or today, today)
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        conn = self.db.get_connection()
+        planned = plan_chunks(articles, since, until, self.chunk_days)
+        done = self.done_chunks(conn)
+        chunks = [chunk for chunk in planned if chunk not in done]
+        summary = BackfillSummary(len(planned), len(planned) - len(chunks), 0, 0, 0, 0.0)
+
+        print(f"🗂️  {len(planned)} chunks planned ({self.chunk_days} days), "
+              f"{summary.skipped} already loaded, {len(chunks)} to fetch")
+        if not chunks:
+            conn.close()
+            return summary
+
+        print(f"⚡ {self.workers} workers, {self.limiter.interval:.2f}s between API calls")
+        indexes = self._drop_secondary_indexes(conn)
+        rows, checkpoints = [], []
+
+        def flush():
+            # Lignes et checkpoints dans la même transaction : pas de chunk noté sans ses données
+            rows.sort(key=lambda row: (row[0], row[1]))
+            conn.executemany(UPSERT_DAILY, rows)
+            conn.executemany("""
+                INSERT OR REPLACE INTO backfill_chunks (article_id, start_date, end_date, row_count, loaded_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, checkpoints)
+            conn.commit()
+            summary.rows += len(rows)
+            rows.clear()
+            checkpoints.clear()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(self.fetch_chunk, *chunk): chunk for chunk in chunks}
+                for i, future in enumerate(as_completed(futures), 1):
+                    article_id, start, end = futures[future]
+                    data = future.result()
+                    if data is None:
+                        summary.failed += 1
+                    else:
+                        summary.fetched += 1
+                        chunk_rows = historical_rows(article_id, data, timestamp)
+                        rows.extend(chunk_rows)
+                        if end < today.isoformat():
+                            checkpoints.append((article_id, start, end, len(chunk_rows), timestamp))
+
+                    if i % BATCH_CHUNKS == 0:
+                        flush()
+                        print(f"  📥 [{i}/{len(chunks)}] {summary.rows} rows loaded")
+                flush()
+        finally:
+            self._rebuild_indexes(conn, indexes)
+            conn.close()
+
+        summary.seconds = time.perf_counter() - started
+        return summary
+
+    @staticmethod
+    def _drop_secondary_indexes(conn):
+        """Supprime les index non uniques de daily_analytics ; retourne leur DDL pour les recréer."""
+        indexes = conn.execute("""
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND tbl_name = 'daily_analytics' AND sql IS NOT NULL
+              AND sql NOT LIKE 'CREATE UNIQUE%'
+        """).fetchall()
+        for name, _ in indexes:
+            conn.execute(f"DROP INDEX {name}")
+        conn.commit()
+        return [sql for _, sql in indexes]
+
+    @staticmethod
+    def _rebuild_indexes(conn, indexes):
+        if not indexes:
+            return
+        print(f"🔧 Rebuilding {len(indexes)} index(es) on daily_analytics...")
+        for sql in indexes:
+            conn.execute(sql)
+        conn.commit()
+
+    def render_summary(self, summary: BackfillSummary):
+        print("\n" + "=" * 60)
+        print("📊 BACKFILL SUMMARY")
+        print("=" * 60)
+        print(f"🗂️  Chunks planned:  {summary.planned}")
+        print(f"⏭️  Already loaded:  {summary.skipped}")
+        print(f"✅ Fetched:         {summary.fetched}")
+        print(f"❌ Failed:          {summary.failed}" + ("  (relancer pour reprendre)" if summary.failed else ""))
+        print(f"📈 Rows loaded:     {summary.rows:,}")
+        print(f"⏱️  Duration:        {summary.seconds:.1f}s")
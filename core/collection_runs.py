@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Index des collectes (table collection_runs, écrite par devto_tracker.py) :
+trous de collecte, cadence réelle du cron, articles sautés par exécution.
+
+Usage:
+    python3 -m core.collection_runs --cadence
+    python3 -m core.collection_runs --gaps --days 90
+    python3 -m core.collection_runs --skipped --format json
+"""
+
+import argparse
+import json
+import statistics
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from core.database import DatabaseManager
+from core.results import dump_json
+
+# --- RESULTS ---
+
+@dataclass(slots=True)
+class RunGap:
+    after_run_id: int
+    before_run_id: int
+    start: str
+    end: str
+    hours: float
+    missed_runs: int
+
+@dataclass(slots=True)
+class CadenceReport:
+    runs: int
+    median_hours: Optional[float]
+    mean_hours: Optional[float]
+    min_hours: Optional[float]
+    max_hours: Optional[float]
+    median_duration_seconds: Optional[float]
+    histogram: Dict[str, int]
+    cron_guess: str
+
+@dataclass(slots=True)
+class SkippedRun:
+    run_id: int
+    started_at: str
+    covered: int
+    skipped: List[int]
+
+def parse_ts(value):
+    """Horodatage ISO ('T' ou espace, 'Z', naïf = UTC) -> datetime aware."""
+    parsed = datetime.fromisoformat(value.replace(' ', 'T').replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+# Tranches d'intervalle (heures) de diagnose.py
+_BUCKETS = ((1, "< 1h"), (2, "1-2h"), (4, "2-4h"), (6, "4-6h"), (float('inf'), "≥ 6h"))
+# Cadences cron usuelles (heures)
+_CRON_HOURS = (1, 2, 3, 4, 6, 8, 12, 24)
+
+def _bucket(hours):
+    return next(label for limit, label in _BUCKETS if hours < limit)
+
+class CollectionRuns:
+    """Une ligne par exécution du collecteur ; les rapports ne relisent jamais article_metrics."""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def start(self, conn, timestamp):
+        """Ouvre une collecte (timestamp = collected_at de ses snapshots). Retourne run_id."""
+        return conn.execute("INSERT INTO collection_runs (started_at) VALUES (?)", (timestamp,)).lastrowid
+
+    def finish(self, conn, run_id, article_ids, duration_seconds):
+        """
+        Clôt une collecte : articles couverts, et articles connus (article_latest,
+        non supprimés) absents de cette collecte. À appeler après DailyRollup.refresh,
+        qui répercute sur article_latest les suppressions et purges de cleanup_articles.py.
+        """
+        covered = set(article_ids)
+        skipped = sorted(
+            row[0] for row in conn.execute("SELECT article_id FROM article_latest WHERE is_deleted = 0")
+            if row[0] not in covered
+        )
+        conn.execute("""
+            UPDATE collection_runs
+            SET duration_seconds = ?, articles_covered = ?, articles_skipped = ?, skipped_ids = ?
+            WHERE run_id = ?
+        """, (round(duration_seconds, 2), len(covered), len(skipped), json.dumps(skipped), run_id))
+        return skipped
+
+    def _runs(self, days):
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        conn = self.db.get_connection()
+        rows = conn.execute("""
+            SELECT run_id, started_at, duration_seconds, articles_covered, articles_skipped, skipped_ids
+            FROM collection_runs WHERE started_at >= ? ORDER BY started_at
+        """, (cutoff,)).fetchall()
+        conn.close()
+        return rows
+
+    @staticmethod
+    def _intervals(runs):
+        return [(a, b, (parse_ts(b['started_at']) - parse_ts(a['started_at'])).total_seconds() / 3600)
+                for a, b in zip(runs, runs[1:])]
+
+    def compute_cadence(self, days: int = 30) -> CadenceReport:
+        runs = self._runs(days)
+        hours = [h for _, _, h in self._intervals(runs)]
+        durations = [r['duration_seconds'] for r in runs if r['duration_seconds'] is not None]
+        if not hours:
+            return CadenceReport(len(runs), None, None, None, None, None, {}, "not enough runs")
+
+        median = statistics.median(hours)
+        histogram = Counter(_bucket(h) for h in hours)
+        standard = min(_CRON_HOURS, key=lambda h: abs(median - h))
+        if abs(median - standard) <= 0.15 * standard:
+            guess = "hourly" if standard == 1 else "daily" if standard == 24 else f"every {standard}h"
+        else:
+            guess = f"non-standard (~{median:.1f}h)"
+
+        return CadenceReport(
+            len(runs), median, statistics.mean(hours), min(hours), max(hours),
+            statistics.median(durations) if durations else None,
+            {label: histogram[label] for _, label in _BUCKETS if histogram[label]}, guess
+        )
+
+    def compute_gaps(self, days: int = 30, expected_hours: float = None, factor: float = 1.5) -> List[RunGap]:
+        """Intervalles plus longs que factor × cadence attendue (par défaut : médiane observée)."""
+        intervals = self._intervals(self._runs(days))
+        if not intervals:
+            return []
+        expected = expected_hours or statistics.median(h for _, _, h in intervals)
+        return [
+            RunGap(a['run_id'], b['run_id'], a['started_at'], b['started_at'], h, max(round(h / expected) - 1, 1))
+            for a, b, h in intervals if h > factor * expected
+        ]
+
+    def compute_skipped(self, days: int = 30) -> List[SkippedRun]:
+        return [
+            SkippedRun(r['run_id'], r['started_at'], r['articles_covered'], json.loads(r['skipped_ids']))
+            for r in self._runs(days) if r['articles_skipped']
+        ]
+
+    def render_cadence(self, report: CadenceReport, days: int):
+        print(f"\n⏱️  COLLECTION CADENCE (last {days} days, {report.runs} runs)")
+        print("=" * 60)
+        if report.median_hours is None:
+            print("   Pas assez de collectes")
+            return
+        print(f"   Median interval: {report.median_hours:.2f}h → cron {report.cron_guess}")
+        print(f"   Mean / min / max: {report.mean_hours:.2f}h / {report.min_hours:.2f}h / {report.max_hours:.2f}h")
+        if report.median_duration_seconds is not None:
+            print(f"   Median run duration: {report.median_duration_seconds:.1f}s")
+        print("\n   Distribution des intervalles:")
+        width = max(report.histogram.values())
+        for label, count in report.histogram.items():
+            print(f"   {label:<6} {count:>5}  {'█' * max(1, round(count / width * 40))}")
+
+    def render_gaps(self, gaps: List[RunGap], days: int):
+        print(f"\n🕳️  COLLECTION GAPS (last {days} days)")
+        print("=" * 80)
+        if not gaps:
+            print("✅ Aucun trou de collecte")
+            return
+        print(f"{'From':<22} {'To':<22} {'Hours':>8} {'Missed':>8}")
+        print("-" * 80)
+        for g in gaps:
+            print(f"{g.start[:19]:<22} {g.end[:19]:<22} {g.hours:>8.1f} {g.missed_runs:>8}")
+        print(f"\n⚠️  {len(gaps)} gap(s), ~{sum(g.missed_runs for g in gaps)} missed run(s)")
+
+    def render_skipped(self, runs: List[SkippedRun], days: int):
+        print(f"\n⏭️  ARTICLES SKIPPED BY RUN (last {days} days)")
+        print("=" * 80)
+        if not runs:
+            print("✅ Toutes les collectes ont couvert tous les articles connus")
+            return
+        for r in runs:
+            ids = ", ".join(str(a) for a in r.skipped[:10]) + (", …" if len(r.skipped) > 10 else "")
+            print(f"#{r.run_id:<6} {r.started_at[:19]}  {r.covered} covered, {len(r.skipped)} skipped: {ids}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index des collectes : cadence, trous, articles sautés")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--cadence', action='store_true', help='Cadence réelle du cron (défaut)')
+    parser.add_argument('--gaps', action='store_true', help='Trous de collecte')
+    parser.add_argument('--skipped', action='store_true', help='Articles sautés par collecte')
+    parser.add_argument('--days', type=int, default=30, help='Période analysée (jours)')
+    parser.add_argument('--expected-hours', type=float, help='Cadence attendue pour --gaps (défaut : médiane)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Format de sortie')
+    args = parser.parse_args()
+
+    runs = CollectionRuns(DatabaseManager(args.db))
+    if args.gaps:
+        result, render = runs.compute_gaps(args.days, args.expected_hours), runs.render_gaps
+    elif args.skipped:
+        result, render = runs.compute_skipped(args.days), runs.render_skipped
+    else:
+        result, render = runs.compute_cadence(args.days), runs.render_cadence
+
+    if args.format == 'json':
+        print(dump_json(result))
+    else:
+        render(result, args.days)
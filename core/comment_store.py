@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+from html.parser import HTMLParser
+from core.database import DatabaseManager
+
+class _TextExtractor(HTMLParser):
+    """Extraction de texte en flux : pas d'arbre, les blocs <code>/<pre> sont ignorés."""
+
+    SKIPPED = {"code", "pre"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED:
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+def html_to_text(html):
+    """Texte brut d'un commentaire HTML, sans les blocs de code."""
+    if not html:
+        return ""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return " ".join(parser.parts).strip()
+
+def text_hash(text):
+    """Empreinte du texte nettoyé : clé des résultats NLP (un texte identique n'est scoré qu'une fois)."""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+def insert_comment(conn, comment_id, article_id, body_html, created_at, collected_at=None,
+                   article_title=None, author_username=None, author_name=None):
+    """
+    Point d'entrée unique des collecteurs pour enregistrer un commentaire.
+    body_text et body_hash sont calculés ici, une fois pour toutes ; un commentaire
+    déjà connu dont le texte a été édité est mis à jour (et son verdict spam remis
+    à recalculer). Retourne True si le commentaire est nouveau.
+    """
+    body_html = body_html or ""
+    body_text = html_to_text(body_html)
+    body_hash = text_hash(body_text)
+    cursor = conn.execute("""
+        INSERT OR IGNORE INTO comments
+        (comment_id, article_id, article_title, author_username, author_name,
+         body_html, body_text, body_hash, body_length, created_at, collected_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    """, (
+        comment_id, article_id, article_title, author_username, author_name,
+        body_html, body_text, body_hash, len(body_html), created_at, collected_at
+    ))
+    if cursor.rowcount > 0:
+        return True
+
+    conn.execute("""
+        UPDATE comments
+        SET body_html = ?, body_text = ?, body_hash = ?, body_length = ?, spam_score = NULL
+        WHERE comment_id = ? AND body_hash IS NOT ?
+    """, (body_html, body_text, body_hash, len(body_html), comment_id, body_hash))
+    return False
+
+def backfill_body_text(db: DatabaseManager, recompute=False, batch_size=1000):
+    """Remplit body_text / body_hash pour les commentaires qui n'en ont pas (ou tous avec recompute)."""
+    conn = db.get_connection()
+    where = "" if recompute else "WHERE (body_text IS NULL OR body_hash IS NULL)"
+    # Parcours par rowid croissant : pas de curseur ouvert pendant les écritures
+    last_rowid = 0
+    updated = 0
+    while True:
+        rows = conn.execute(f"""
+            SELECT rowid AS rid, body_html FROM comments
+            {where} {"AND" if where else "WHERE"} rowid > ?
+            ORDER BY rowid LIMIT ?
+        """, (last_rowid, batch_size)).fetchall()
+        if not rows:
+            break
+
+        texts = [(html_to_text(r['body_html']), r['rid']) for r in rows]
+        conn.executemany(
+            "UPDATE comments SET body_text = ?, body_hash = ? WHERE rowid = ?",
+            [(text, text_hash(text), rid) for text, rid in texts]
+        )
+        conn.commit()
+        updated += len(rows)
+        last_rowid = rows[-1]['rid']
+
+    conn.close()
+    return updated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill du texte nettoyé des commentaires")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--all', action='store_true', help='Recalcule body_text pour tous les commentaires')
+    args = parser.parse_args()
+
+    updated = backfill_body_text(DatabaseManager(args.db), recompute=args.all)
+    print(f"✅ body_text à jour ({updated} commentaires traités)")
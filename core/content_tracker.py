@@ -10,43 +10,120 @@ import json
 import time
 from datetime import datetime, timezone, timedelta
 from core.database import DatabaseManager
+from core.comment_store import insert_comment, text_hash
+
+def _body_hash(art):
+    body = art['body_markdown']
+    if body is None:
+        raise KeyError('body_markdown')
+    return text_hash(body)
 
 class ContentTracker:
-    """Détecte les changements de contenu (titre, tags) et logue les milestones."""
+    """Détecte les changements de contenu (titre, slug, tags, couverture, corps) et logue les milestones."""
+    
+    # Champs suivis : colonne article_history -> valeur tirée d'un article de /articles/me/all
+    FIELDS = {
+        'title': lambda art: art['title'],
+        'slug': lambda art: art['slug'],
+        'tags': lambda art: ",".join(art['tag_list']),
+        'cover_image': lambda art: art['cover_image'],
+        'content_hash': _body_hash,
+    }
     
     def __init__(self, db: DatabaseManager):
         self.db = db
     
+    def latest_versions(self, conn):
+        """Dernière version connue de chaque article, en une requête : article_id -> Row"""
+        rows = conn.execute("""
+            SELECT article_id, title, slug, tags, cover_image, content_hash FROM (
+                SELECT article_id, title, slug, tags, cover_image, content_hash,
+                       ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY id DESC) as rn
+                FROM article_history
+            ) WHERE rn = 1
+        """).fetchall()
+        return {row['article_id']: row for row in rows}
+    
+    def check_batch(self, articles, conn, timestamp=None):
+        """
+        Compare toute la liste d'articles (format /articles/me/all) avec les dernières
+        versions connues, en mémoire. Les nouvelles versions et les milestones sont
+        insérés en lot dans la transaction de conn (sans commit).
+        Un champ absent de l'article (ex. body_markdown) reprend la valeur précédente.
+        edited_at_api reste réservé à content_collector.py (édition dont le corps a été collecté).
+        Retourne [(article_id, [champs modifiés])].
+        """
+        timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+        latest = self.latest_versions(conn)
+        
+        versions, milestones, changed = [], [], []
+        for art in articles:
+            last = latest.get(art['id'])
+            current = {}
+            for field, extract in self.FIELDS.items():
+                try:
+                    current[field] = extract(art)
+                except (KeyError, TypeError):
+                    current[field] = last[field] if last else None
+            
+            if last is None:
+                fields = []
+            else:
+                fields = [field for field in self.FIELDS if current[field] != last[field]]
+                if not fields:
+                    continue
+            
+            versions.append((art['id'], current['title'], current['slug'], current['tags'],
+                             current['cover_image'], current['content_hash'], timestamp))
+            for field in fields:
+                # Champ jamais suivi jusqu'ici (anciennes versions) : renseigné sans milestone
+                if last[field] is not None:
+                    milestones.append((art['id'], *self._describe(field, last[field], current[field]), timestamp))
+            if fields:
+                changed.append((art['id'], fields))
+        
+        conn.executemany("""
+            INSERT INTO article_history (article_id, title, slug, tags, cover_image, content_hash, changed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, versions)
+        conn.executemany("""
+            INSERT INTO milestone_events (article_id, event_type, description, occurred_at)
+            VALUES (?, ?, ?, ?)
+        """, milestones)
+        
+        for _, event_type, description, _ in milestones:
+            print(f"📢 {description}")
+        return changed
+    
+    @staticmethod
+    def _describe(field, old, new):
+        """(event_type, description) du milestone d'un champ modifié"""
+        if field == 'title':
+            return 'title_change', f"Title change: '{old}' → '{new}'"
+        if field == 'slug':
+            return 'slug_change', f"Slug change: {old} → {new}"
+        if field == 'tags':
+            before, after = set(filter(None, (old or "").split(","))), set(filter(None, (new or "").split(",")))
+            diff = [f"+{t}" for t in sorted(after - before)] + [f"-{t}" for t in sorted(before - after)]
+            return 'tags_change', f"Tags change: {' '.join(diff)}"
+        if field == 'cover_image':
+            return 'cover_change', "Cover image changed" if new else "Cover image removed"
+        return 'body_change', "Body edited"
+    
     def check_content_updates(self, article_id, current_title, current_tags, conn=None):
         """
-        Compare le contenu actuel avec la dernière version connue.
-        Logue un milestone si le titre a changé.
+        Compare le contenu actuel d'un article avec sa dernière version connue.
+        (Un seul article : les collecteurs passent par check_batch.)
         """
         should_close = conn is None
         if conn is None:
             conn = self.db.get_connection()
         
-        # Récupérer la dernière version connue
-        cursor = conn.execute("""
-            SELECT title, tags FROM article_history 
-            WHERE article_id = ? 
-            ORDER BY changed_at DESC LIMIT 1
-        """, (article_id,))
-        last_version = cursor.fetchone()
-        
-        # Si c'est la première fois ou si quelque chose a changé
-        if not last_version or last_version['title'] != current_title or last_version['tags'] != current_tags:
-            # Sauvegarder la nouvelle version
-            conn.execute("""
-                INSERT INTO article_history (article_id, title, tags, changed_at) 
-                VALUES (?, ?, ?, ?)
-            """, (article_id, current_title, current_tags, datetime.now()))
-            
-            # Si c'est un changement de titre (événement majeur)
-            if last_version and last_version['title'] != current_title:
-                description = f"Title change: '{last_version['title']}' → '{current_title}'"
-                self.db.log_milestone(article_id, 'title_change', description, conn)
-                print(f"📢 {description}")
+        self.check_batch([{
+            'id': article_id,
+            'title': current_title,
+            'tag_list': current_tags.split(",") if current_tags else [],
+        }], conn)
         
         if should_close:
             conn.commit()
@@ -76,15 +153,16 @@ class DevToTracker:
             return
 
         # 1. Metrics & Content Tracking
-        for art in articles:
-            if not art.get('published_at'): continue # On track le contenu publié
-            
+        published = [art for art in articles if art.get('published_at')] # On track le contenu publié
+        for art in published:
             # Sauvegarde métriques
             self.db.log_article_metrics(art, timestamp)
-            
-            # Détection de changements (via ContentTracker)
-            tags_str = ",".join(art.get('tag_list', []))
-            self.content_tracker.check_content_updates(art['id'], art['title'], tags_str)
+        
+        # Détection de changements (via ContentTracker, toute la liste en une passe)
+        conn = self.db.get_connection()
+        self.content_tracker.check_batch(published, conn, timestamp)
+        conn.commit()
+        conn.close()
 
         # 2. Followers (Snapshot global)
         self._collect_followers(timestamp)
@@ -145,12 +223,9 @@ class DevToTracker:
                 r = requests.get(f"{self.base_url}/comments", params={"a_id": art['id']})
                 if r.status_code == 200:
                     for c in r.json():
-                        conn.execute("""
-                            INSERT OR IGNORE INTO comments 
-                            (comment_id, article_id, author_username, body_html, collected_at, created_at) 
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (c['id_code'], art['id'], c['user']['username'], c['body_html'], timestamp, c['created_at']))
-                        if conn.total_changes > 0: new_comments += 1
+                        if insert_comment(conn, c['id_code'], art['id'], c['body_html'], c['created_at'], timestamp,
+                                          author_username=c['user']['username']):
+                            new_comments += 1
         print(f"💬 New comments synced: {new_comments}")
 
     def _fetch_historical_analytics(self, article_id, timestamp):
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+from core.database import DatabaseManager
+
+class DailyRollup:
+    """
+    Maintient daily_rollup (valeurs de fin de journée + deltas par article)
+    et article_latest (dernier snapshot connu) à partir de article_metrics.
+
+    Seuls les jours ayant reçu de nouveaux snapshots depuis le dernier passage
+    sont recalculés : le coût ne dépend plus de la fréquence du cron. Les UPDATE de
+    is_deleted et les purges (cleanup_articles.py) ne créent pas de nouvel id : ils
+    sont rattrapés par _resync, qui ne lit que article_latest et les snapshots référencés.
+    """
+
+    STATE_KEY = "daily_rollup.last_metric_id"
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def refresh(self, conn=None):
+        """Intègre les snapshots arrivés depuis le dernier passage. Retourne le nombre d'articles touchés."""
+        should_close = conn is None
+        if conn is None:
+            conn = self.db.get_connection()
+
+        resynced = self._resync(conn)
+
+        last_id = int(self.db.get_state(self.STATE_KEY, 0, conn))
+        max_id = conn.execute("SELECT MAX(id) FROM article_metrics").fetchone()[0]
+
+        touched = []
+        if max_id is not None and max_id > last_id:
+            # Premier jour impacté par article : tout ce qui suit est recalculé
+            touched = conn.execute("""
+                SELECT article_id, MIN(substr(collected_at, 1, 10)) as first_day
+                FROM article_metrics
+                WHERE id > ? AND id <= ?
+                GROUP BY article_id
+            """, (last_id, max_id)).fetchall()
+
+            for row in touched:
+                self._rebuild_article(conn, row['article_id'], row['first_day'])
+                self._refresh_latest(conn, row['article_id'])
+
+            self.db.set_state(self.STATE_KEY, max_id, conn)
+
+        if should_close:
+            conn.commit()
+            conn.close()
+        return len(touched) + resynced
+
+    def _resync(self, conn):
+        """
+        Rattrape les changements sans nouveau snapshot : is_deleted modifié sur le
+        snapshot de référence, ou snapshot de référence supprimé (article purgé :
+        retiré d'article_latest et de daily_rollup ; purge partielle : recalculé).
+        """
+        conn.execute("""
+            UPDATE article_latest SET is_deleted = (
+                SELECT COALESCE(m.is_deleted, 0) FROM article_metrics m WHERE m.id = article_latest.metric_id
+            )
+            WHERE EXISTS (
+                SELECT 1 FROM article_metrics m
+                WHERE m.id = article_latest.metric_id AND COALESCE(m.is_deleted, 0) != article_latest.is_deleted
+            )
+        """)
+        resynced = conn.execute("SELECT changes()").fetchone()[0]
+
+        stale = [row[0] for row in conn.execute("""
+            SELECT article_id FROM article_latest l
+            WHERE NOT EXISTS (SELECT 1 FROM article_metrics m WHERE m.id = l.metric_id)
+        """)]
+        for article_id in stale:
+            conn.execute("DELETE FROM daily_rollup WHERE article_id = ?", (article_id,))
+            conn.execute("DELETE FROM article_latest WHERE article_id = ?", (article_id,))
+            first_day = conn.execute(
+                "SELECT MIN(substr(collected_at, 1, 10)) FROM article_metrics WHERE article_id = ?", (article_id,)
+            ).fetchone()[0]
+            if first_day:
+                self._rebuild_article(conn, article_id, first_day)
+                self._refresh_latest(conn, article_id)
+        return resynced + len(stale)
+
+    def _rebuild_article(self, conn, article_id, first_day):
+        """Recalcule les jours >= first_day pour un article."""
+        days = conn.execute("""
+            SELECT day, views, reactions, comments, first_views, first_reactions, first_comments, n
+            FROM (
+                SELECT
+                    substr(collected_at, 1, 10) as day,
+                    views, reactions, comments,
+                    MIN(views) OVER w_day as first_views,
+                    MIN(reactions) OVER w_day as first_reactions,
+                    MIN(comments) OVER w_day as first_comments,
+                    COUNT(*) OVER w_day as n,
+                    ROW_NUMBER() OVER (PARTITION BY substr(collected_at, 1, 10)
+                                       ORDER BY collected_at DESC, id DESC) as rn
+                FROM article_metrics
+                WHERE article_id = ? AND collected_at >= ?
+                WINDOW w_day AS (PARTITION BY substr(collected_at, 1, 10))
+            )
+            WHERE rn = 1
+            ORDER BY day
+        """, (article_id, first_day)).fetchall()
+
+        previous = conn.execute("""
+            SELECT views_eod, reactions_eod, comments_eod FROM daily_rollup
+            WHERE article_id = ? AND day < ?
+            ORDER BY day DESC LIMIT 1
+        """, (article_id, first_day)).fetchone()
+
+        rows = []
+        for d in days:
+            if previous:
+                base = (previous[0] or 0, previous[1] or 0, previous[2] or 0)
+            else:
+                # Premier jour suivi : seule la croissance intra-journée est connue
+                base = (d['first_views'] or 0, d['first_reactions'] or 0, d['first_comments'] or 0)
+
+            views, reactions, comments = d['views'] or 0, d['reactions'] or 0, d['comments'] or 0
+            rows.append((
+                article_id, d['day'], views, reactions, comments,
+                views - base[0], reactions - base[1], comments - base[2], d['n']
+            ))
+            previous = (views, reactions, comments)
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO daily_rollup
+            (article_id, day, views_eod, reactions_eod, comments_eod,
+             views_delta, reactions_delta, comments_delta, snapshots)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    def _refresh_latest(self, conn, article_id):
+        """Met à jour article_latest avec le snapshot le plus récent."""
+        conn.execute("""
+            INSERT OR REPLACE INTO article_latest
+            (article_id, metric_id, collected_at, title, slug, published_at, tags,
+             reading_time_minutes, views, reactions, comments, is_deleted)
+            SELECT article_id, id, collected_at, title, slug, published_at, tags,
+                   reading_time_minutes, views, reactions, comments, COALESCE(is_deleted, 0)
+            FROM article_metrics
+            WHERE article_id = ?
+            ORDER BY collected_at DESC, id DESC
+            LIMIT 1
+        """, (article_id,))
+
+if __name__ == "__main__":
+    touched = DailyRollup(DatabaseManager()).refresh()
+    print(f"✅ daily_rollup à jour ({touched} articles recalculés)")
@@ -1,28 +1,68 @@
 import sqlite3
 import os
+import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
+
+_thread_state = threading.local()
+
+def connect(db_path, read_only=None):
+    """
+    Ouvre une connexion avec row_factory.
+    Par défaut en lecture seule si le thread courant exécute une section de rapport.
+    """
+    if read_only is None:
+        read_only = getattr(_thread_state, 'read_only', False)
+
+    if read_only:
+        conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+@contextmanager
+def read_only_connections():
+    """Toutes les connexions ouvertes par ce thread dans le bloc sont en lecture seule."""
+    previous = getattr(_thread_state, 'read_only', False)
+    _thread_state.read_only = True
+    try:
+        yield
+    finally:
+        _thread_state.read_only = previous
 
 class DatabaseManager:
+    # Bases déjà migrées dans ce process (évite de rejouer les migrations à chaque instanciation)
+    _migrated = set()
+    _migration_lock = threading.Lock()
+
     def __init__(self, db_path="devto_metrics.db"):
         self.db_path = db_path
-        self._run_migrations()
+        with self._migration_lock:
+            key = os.path.abspath(db_path)
+            if key not in self._migrated:
+                self._run_migrations()
+                self._migrated.add(key)
 
     def get_connection(self):
         """Retourne une connexion avec row_factory pour accès par nom de colonne."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return connect(self.db_path)
 
     def _run_migrations(self):
         """Assure que le schéma est à jour sans casser les données existantes."""
-        conn = self.get_connection()
+        conn = connect(self.db_path, read_only=False)
         cursor = conn.cursor()
 
+        # WAL : les rapports lisent en parallèle pendant qu'une collecte écrit
+        cursor.execute("PRAGMA journal_mode=WAL")
+
         # 1. Migration article_metrics : ajout de is_deleted
         try:
             cursor.execute("SELECT is_deleted FROM article_metrics LIMIT 1")
         except sqlite3.OperationalError:
-            print("🔧 Migration : Ajout de 'is_deleted' dans article_metrics...")
+            print("🔧 Migration : Ajout de 'is_deleted' dans article_metrics...", file=sys.stderr)
             cursor.execute("ALTER TABLE article_metrics ADD COLUMN is_deleted INTEGER DEFAULT 0")
 
         # 2. Table historique : Création avec edited_at_api
@@ -43,7 +83,7 @@ class DatabaseManager:
         try:
             cursor.execute("SELECT edited_at_api FROM article_history LIMIT 1")
         except sqlite3.OperationalError:
-            print("🔧 Migration : Ajout de 'edited_at_api' dans article_history...")
+            print("🔧 Migration : Ajout de 'edited_at_api' dans article_history...", file=sys.stderr)
             cursor.execute("ALTER TABLE article_history ADD COLUMN edited_at_api TEXT")
 
         # 3. Table des événements marquants (Milestones)
@@ -57,11 +97,465 @@ class DatabaseManager:
             )
         """)
 
+        # 4. État des traitements incrémentaux (high-water marks, etc.)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # 5. Agrégats journaliers (fin de journée + deltas) et dernier état connu
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_rollup (
+                article_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                views_eod INTEGER,
+                reactions_eod INTEGER,
+                comments_eod INTEGER,
+                views_delta INTEGER,
+                reactions_delta INTEGER,
+                comments_delta INTEGER,
+                snapshots INTEGER,
+                PRIMARY KEY (article_id, day)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_rollup_day ON daily_rollup(day)")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_latest (
+                article_id INTEGER PRIMARY KEY,
+                metric_id INTEGER,
+                collected_at TIMESTAMP,
+                title TEXT,
+                slug TEXT,
+                published_at TIMESTAMP,
+                tags TEXT,
+                reading_time_minutes INTEGER,
+                views INTEGER,
+                reactions INTEGER,
+                comments INTEGER,
+                is_deleted INTEGER DEFAULT 0
+            )
+        """)
+
+        if self._table_exists(cursor, "article_metrics"):
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_article_metrics_article_time
+                ON article_metrics(article_id, collected_at)
+            """)
+
+        # 6. Texte nettoyé des commentaires (calculé à l'insertion, cf. core/comment_store.py)
+        if self._table_exists(cursor, "comments"):
+            try:
+                cursor.execute("SELECT body_text FROM comments LIMIT 1")
+            except sqlite3.OperationalError:
+                print("🔧 Migration : Ajout de 'body_text' dans comments...", file=sys.stderr)
+                cursor.execute("ALTER TABLE comments ADD COLUMN body_text TEXT")
+
+            # 7. Verdict spam persisté (cf. core/spam.py)
+            try:
+                cursor.execute("SELECT spam_score, is_spam FROM comments LIMIT 1")
+            except sqlite3.OperationalError:
+                print("🔧 Migration : Ajout de 'spam_score' / 'is_spam' dans comments...", file=sys.stderr)
+                cursor.execute("ALTER TABLE comments ADD COLUMN spam_score REAL")
+                cursor.execute("ALTER TABLE comments ADD COLUMN is_spam INTEGER DEFAULT 0")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_comments_spam ON comments(is_spam, author_username)")
+
+        # 8. File des questions sans réponse (cf. core/questions.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS open_questions (
+                comment_id TEXT PRIMARY KEY,
+                article_id INTEGER,
+                article_title TEXT,
+                author_username TEXT,
+                created_at TIMESTAMP,
+                resolved_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_open_questions_pending
+            ON open_questions(created_at) WHERE resolved_at IS NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_open_questions_article
+            ON open_questions(article_id) WHERE resolved_at IS NULL
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS author_replies (
+                article_id INTEGER PRIMARY KEY,
+                last_reply_at TIMESTAMP
+            )
+        """)
+
+        # 9. Thème de chaque article (cf. core/topic_intelligence.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_themes (
+                article_id INTEGER PRIMARY KEY,
+                theme TEXT NOT NULL,
+                title TEXT,
+                tags TEXT,
+                classified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # 10. Topic modeling incrémental (cf. core/topic_model.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS topic_terms (
+                term_id INTEGER PRIMARY KEY,
+                term TEXT NOT NULL UNIQUE
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS topic_documents (
+                doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                content_hash TEXT,
+                UNIQUE (source, source_id)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS topics (
+                topic INTEGER PRIMARY KEY,
+                top_terms TEXT,
+                method TEXT,
+                fitted_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS doc_topics (
+                doc_id INTEGER NOT NULL,
+                topic INTEGER NOT NULL,
+                weight REAL,
+                PRIMARY KEY (doc_id, topic)
+            )
+        """)
+
+        # 11. Index MinHash / LSH des commentaires (cf. core/near_duplicates.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS comment_minhash (
+                comment_id TEXT PRIMARY KEY,
+                signature BLOB NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS comment_lsh (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                comment_id TEXT NOT NULL,
+                PRIMARY KEY (band, bucket, comment_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS comment_clusters (
+                comment_id TEXT PRIMARY KEY,
+                cluster_id TEXT NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_comment_clusters_cluster ON comment_clusters(cluster_id)")
+
+        # 12. Sentiment journalier par article (cf. core/sentiment_trends.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment_daily (
+                article_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                n INTEGER NOT NULL,
+                mean REAL,
+                pos INTEGER DEFAULT 0,
+                neg INTEGER DEFAULT 0,
+                neu INTEGER DEFAULT 0,
+                PRIMARY KEY (article_id, day)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_daily_day ON sentiment_daily(day)")
+
+        # 13. Résultats NLP indexés par (empreinte du texte, version de l'analyseur)
+        if self._table_exists(cursor, "comments"):
+            try:
+                cursor.execute("SELECT body_hash FROM comments LIMIT 1")
+            except sqlite3.OperationalError:
+                print("🔧 Migration : Ajout de 'body_hash' dans comments...", file=sys.stderr)
+                cursor.execute("ALTER TABLE comments ADD COLUMN body_hash TEXT")
+
+        if self._table_exists(cursor, "comment_insights"):
+            try:
+                cursor.execute("SELECT content_hash, analyzer_version FROM comment_insights LIMIT 1")
+            except sqlite3.OperationalError:
+                print("🔧 Migration : Ajout de 'content_hash' / 'analyzer_version' dans comment_insights...", file=sys.stderr)
+                cursor.execute("ALTER TABLE comment_insights ADD COLUMN content_hash TEXT")
+                cursor.execute("ALTER TABLE comment_insights ADD COLUMN analyzer_version TEXT")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment_cache (
+                content_hash TEXT NOT NULL,
+                analyzer_version TEXT NOT NULL,
+                score REAL NOT NULL,
+                scored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (content_hash, analyzer_version)
+            )
+        """)
+
+        # 14. Empreinte du corps des articles (cf. content_collector.py --collect-changed)
+        if self._table_exists(cursor, "article_content"):
+            try:
+                cursor.execute("SELECT body_hash FROM article_content LIMIT 1")
+            except sqlite3.OperationalError:
+                print("🔧 Migration : Ajout de 'body_hash' dans article_content...", file=sys.stderr)
+                cursor.execute("ALTER TABLE article_content ADD COLUMN body_hash TEXT")
+
+        # 15. Chaîne de versions du corps des articles (cf. core/article_versions.py)
+        # body en dernier : les requêtes de timeline ne lisent pas les pages de débordement
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_versions (
+                article_id INTEGER NOT NULL,
+                version INTEGER NOT NULL,
+                history_id INTEGER,
+                is_keyframe INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                title TEXT,
+                tags TEXT,
+                changes TEXT,
+                created_at TIMESTAMP NOT NULL,
+                body BLOB NOT NULL,
+                PRIMARY KEY (article_id, version)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_versions_created ON article_versions(created_at)")
+
+        # 16. Recherche plein texte (FTS5, cf. search.py), synchronisée par triggers
+        self._create_fts_indexes(cursor)
+
+        # 17. Versions d'articles : couverture suivie, dernière version par article indexée
+        try:
+            cursor.execute("SELECT cover_image FROM article_history LIMIT 1")
+        except sqlite3.OperationalError:
+            print("🔧 Migration : Ajout de 'cover_image' dans article_history...", file=sys.stderr)
+            cursor.execute("ALTER TABLE article_history ADD COLUMN cover_image TEXT")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_history_article ON article_history(article_id, id)")
+
+        # 18. Analytics quotidiennes (nouvelles installations) + checkpoints du backfill (cf. core/backfill.py)
+        # idx_daily_analytics_date est supprimé pendant un backfill : recréé ici si celui-ci a été interrompu
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_analytics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                article_id INTEGER NOT NULL,
+                date DATE NOT NULL,
+                page_views INTEGER,
+                average_read_time_seconds INTEGER,
+                total_read_time_seconds INTEGER,
+                reactions_total INTEGER,
+                reactions_like INTEGER,
+                reactions_readinglist INTEGER,
+                reactions_unicorn INTEGER,
+                comments_total INTEGER,
+                follows_total INTEGER,
+                collected_at TIMESTAMP NOT NULL,
+                UNIQUE(article_id, date)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_analytics_date ON daily_analytics(date)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_chunks (
+                article_id INTEGER NOT NULL,
+                start_date DATE NOT NULL,
+                end_date DATE NOT NULL,
+                row_count INTEGER NOT NULL,
+                loaded_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (article_id, start_date, end_date)
+            )
+        """)
+
+        # 19. Anomalies ouvertes des contrôles d'intégrité (cf. core/integrity.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS integrity_findings (
+                check_name TEXT NOT NULL,
+                ref TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                article_id INTEGER,
+                detail TEXT NOT NULL,
+                rows INTEGER,
+                first_seen TIMESTAMP NOT NULL,
+                last_seen TIMESTAMP NOT NULL,
+                PRIMARY KEY (check_name, ref)
+            )
+        """)
+
+        # 20. Index des collectes (cf. core/collection_runs.py) : une ligne par exécution du collecteur
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS collection_runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TIMESTAMP NOT NULL UNIQUE,
+                duration_seconds REAL,
+                articles_covered INTEGER,
+                articles_skipped INTEGER,
+                skipped_ids TEXT
+            )
+        """)
+        if self._table_exists(cursor, "article_metrics"):
+            try:
+                cursor.execute("SELECT run_id FROM article_metrics LIMIT 1")
+            except sqlite3.OperationalError:
+                # Collectes passées : un snapshot = un collected_at (durée et articles sautés inconnus)
+                print("🔧 Migration : Ajout de 'run_id' dans article_metrics (index des collectes)...", file=sys.stderr)
+                cursor.execute("ALTER TABLE article_metrics ADD COLUMN run_id INTEGER")
+                cursor.execute("""
+                    INSERT OR IGNORE INTO collection_runs (started_at, articles_covered)
+                    SELECT collected_at, COUNT(*) FROM article_metrics
+                    GROUP BY collected_at ORDER BY collected_at
+                """)
+                cursor.execute("""
+                    UPDATE article_metrics SET run_id = (
+                        SELECT run_id FROM collection_runs r WHERE r.started_at = article_metrics.collected_at
+                    )
+                """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_metrics_run ON article_metrics(run_id)")
+
+        # 21. Compteurs de modifications par table (clés du cache de rapports, cf. core/report_cache.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS table_versions (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._create_version_triggers(cursor)
+
+        # 22. Empreinte du texte signé (cf. core/near_duplicates.py) : un commentaire édité est re-signé
+        try:
+            cursor.execute("SELECT body_hash FROM comment_minhash LIMIT 1")
+        except sqlite3.OperationalError:
+            print("🔧 Migration : Ajout de 'body_hash' dans comment_minhash...", file=sys.stderr)
+            cursor.execute("ALTER TABLE comment_minhash ADD COLUMN body_hash TEXT")
+            if self._table_exists(cursor, "comments"):
+                # Signatures existantes rattachées au texte actuel ; commentaires déjà vus
+                # mais trop courts pour être signés : signature vide
+                cursor.execute("""
+                    UPDATE comment_minhash SET body_hash = (
+                        SELECT c.body_hash FROM comments c WHERE c.comment_id = comment_minhash.comment_id
+                    )
+                """)
+                cursor.execute("""
+                    INSERT OR IGNORE INTO comment_minhash (comment_id, signature, body_hash)
+                    SELECT comment_id, X'', body_hash FROM comments
+                    WHERE rowid <= (SELECT CAST(value AS INTEGER) FROM sync_state WHERE key = 'near_dup.last_comment_rowid')
+                """)
+
         conn.commit()
         conn.close()
 
+    # Index FTS5 à contenu externe : (table fts, table source, colonne rowid, colonnes, tokenizer)
+    FTS_INDEXES = (
+        ("comments_fts", "comments", "rowid", ("body_text",), "unicode61 remove_diacritics 2"),
+        ("articles_fts", "article_content", "article_id", ("body_markdown",), "unicode61 remove_diacritics 2"),
+        ("code_fts", "article_code_blocks", "id", ("code_text",), "unicode61 tokenchars '_'"),
+    )
+
+    def _create_fts_indexes(self, cursor):
+        """
+        Crée les index plein texte des tables sources déjà présentes (les tables de
+        contenu sont créées par content_collector.py au premier lancement).
+        Un index créé est rempli une fois ('rebuild'), les triggers le tiennent à jour ensuite.
+        """
+        for fts, source, rowid, columns, tokenizer in self.FTS_INDEXES:
+            if not self._table_exists(cursor, source):
+                continue
+
+            cols = ", ".join(columns)
+            new_cols = ", ".join(f"new.{c}" for c in columns)
+            old_cols = ", ".join(f"old.{c}" for c in columns)
+
+            if not self._table_exists(cursor, fts):
+                try:
+                    cursor.execute(f"""
+                        CREATE VIRTUAL TABLE {fts} USING fts5(
+                            {cols}, content='{source}', content_rowid='{rowid}',
+                            tokenize="{tokenizer}", prefix='2 3'
+                        )
+                    """)
+                except sqlite3.OperationalError as e:
+                    # SQLite compilé sans FTS5 : la recherche reste indisponible
+                    print(f"⚠️  FTS5 indisponible ({e}), recherche plein texte désactivée", file=sys.stderr)
+                    return
+                print(f"🔧 Migration : Index plein texte {fts}...", file=sys.stderr)
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN
+                    INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_cols});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{rowid}, {old_cols});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {source} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{rowid}, {old_cols});
+                    INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_cols});
+                END
+            """)
+
+    # Tables lues par les sections de rapport en cache (cached_section(tables=...))
+    VERSIONED_TABLES = (
+        "article_metrics", "article_history", "article_latest", "article_themes", "comments",
+        "daily_analytics", "daily_rollup", "follower_events", "milestone_events",
+    )
+
+    def _create_version_triggers(self, cursor):
+        """
+        table_versions.version est incrémenté à chaque INSERT / UPDATE / DELETE :
+        contrairement à MAX(rowid), une mise à jour en place (is_spam, is_deleted,
+        article_latest) change aussi la version.
+        """
+        for table in self.VERSIONED_TABLES:
+            if not self._table_exists(cursor, table):
+                continue
+            cursor.execute("INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)", (table,))
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table} BEGIN
+                        UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+                    END
+                """)
+
+    @staticmethod
+    def _table_exists(cursor, table):
+        row = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        return row is not None
+
     # --- MÉTHODES UTILITAIRES ---
 
+    def get_state(self, key, default=None, conn=None):
+        """Lit une valeur de sync_state (high-water mark, signature de règles...)."""
+        should_close = conn is None
+        if conn is None:
+            conn = self.get_connection()
+
+        row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+
+        if should_close:
+            conn.close()
+        return row[0] if row else default
+
+    def set_state(self, key, value, conn=None):
+        """Enregistre une valeur dans sync_state."""
+        should_close = conn is None
+        if conn is None:
+            conn = self.get_connection()
+
+        conn.execute("""
+            INSERT OR REPLACE INTO sync_state (key, value, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+        """, (key, str(value)))
+
+        if should_close:
+            conn.commit()
+            conn.close()
+
     def log_milestone(self, article_id, event_type, description, conn=None):
         """Enregistre un événement (changement de titre, curation staff, etc.)"""
         should_close = conn is None
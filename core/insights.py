@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+from datetime import datetime, timedelta, timezone
+from core.database import DatabaseManager
+
+class InsightState:
+    """État partagé par toutes les règles, chargé une seule fois par génération."""
+
+    def __init__(self, articles, followers, top_commenter, today):
+        self.articles = articles            # article_id -> dict (article_latest + fenêtres)
+        self.followers = followers          # 2 derniers follower_events
+        self.top_commenter = top_commenter  # lecteur le plus actif sur 30 jours
+        self.today = today
+
+class InsightEngine:
+    """
+    Génère les insights du dashboard à partir de daily_rollup / article_latest.
+
+    Les fenêtres (recent = 7 derniers jours, mid = J-14..J-7, old = avant J-14)
+    sont calculées en une seule requête avec des fonctions de fenêtrage : premier
+    et dernier état de fin de journée + deltas cumulés par article et par fenêtre.
+    Une nouvelle règle se branche avec @InsightEngine.rule sans requête supplémentaire.
+    """
+
+    WINDOWS = ("recent", "mid", "old")
+    rules = []
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    @classmethod
+    def rule(cls, func):
+        """Enregistre une règle : func(state) -> str | None."""
+        cls.rules.append(func)
+        return func
+
+    def load_state(self, conn):
+        today = datetime.now(timezone.utc).date()
+        d7 = (today - timedelta(days=7)).isoformat()
+        d14 = (today - timedelta(days=14)).isoformat()
+
+        articles = {}
+        for row in conn.execute("""
+            SELECT article_id, title, published_at, views, reactions, comments
+            FROM article_latest
+            WHERE is_deleted = 0
+        """):
+            article = dict(row)
+            article.update({window: None for window in self.WINDOWS})
+            articles[row['article_id']] = article
+
+        windows = conn.execute("""
+            SELECT
+                article_id, bucket,
+                MIN(day) as first_day,
+                MAX(day) as last_day,
+                MAX(CASE WHEN rn_first = 1 THEN views_eod END) as first_views,
+                MAX(CASE WHEN rn_last = 1 THEN views_eod END) as last_views,
+                MAX(CASE WHEN rn_last = 1 THEN comments_eod END) as last_comments,
+                SUM(views_delta) as views_gain,
+                SUM(reactions_delta) as reactions_gain,
+                SUM(comments_delta) as comments_gain
+            FROM (
+                SELECT
+                    article_id, day, views_eod, comments_eod,
+                    views_delta, reactions_delta, comments_delta, bucket,
+                    ROW_NUMBER() OVER (PARTITION BY article_id, bucket ORDER BY day) as rn_first,
+                    ROW_NUMBER() OVER (PARTITION BY article_id, bucket ORDER BY day DESC) as rn_last
+                FROM (
+                    SELECT *,
+                        CASE WHEN day >= ? THEN 'recent'
+                             WHEN day > ? THEN 'mid'
+                             ELSE 'old' END as bucket
+                    FROM daily_rollup
+                )
+            )
+            GROUP BY article_id, bucket
+        """, (d7, d14)).fetchall()
+
+        for w in windows:
+            if w['article_id'] in articles:
+                articles[w['article_id']][w['bucket']] = dict(w)
+
+        followers = conn.execute("""
+            SELECT follower_count, new_followers_since_last, collected_at
+            FROM follower_events
+            ORDER BY collected_at DESC
+            LIMIT 2
+        """).fetchall()
+
+        top_commenter = conn.execute("""
+            SELECT
+                author_name,
+                COUNT(*) as comment_count,
+                AVG(body_length) as avg_length
+            FROM comments
+            WHERE collected_at >= datetime('now', '-30 days')
+            AND author_name IS NOT NULL
+            GROUP BY author_name
+            ORDER BY comment_count DESC
+            LIMIT 1
+        """).fetchone()
+
+        return InsightState(articles, followers, top_commenter, today)
+
+    def generate(self, conn=None):
+        """Applique toutes les règles sur un état chargé une fois. Retourne la liste des messages."""
+        should_close = conn is None
+        if conn is None:
+            conn = self.db.get_connection()
+
+        state = self.load_state(conn)
+
+        if should_close:
+            conn.close()
+
+        insights = []
+        for rule in self.rules:
+            message = rule(state)
+            if message:
+                insights.append(message)
+        return insights
+
+# --- RÈGLES ---
+
+@InsightEngine.rule
+def article_restarting(state):
+    """Article dont les vues repartent : fin de fenêtre récente vs dernier état d'il y a 14 jours."""
+    best = None
+    for art in state.articles.values():
+        recent, old = art['recent'], art['old']
+        if not recent or not old:
+            continue
+        if old['last_views'] > 50 and recent['last_views'] > old['last_views'] * 1.5:
+            growth = recent['last_views'] - old['last_views']
+            if best is None or growth > best[1]:
+                best = (art, growth)
+
+    if best:
+        return f"🚀 '{best[0]['title'][:60]}...' is restarting: +{best[1]} views this week"
+    return None
+
+@InsightEngine.rule
+def most_engaged_reader(state):
+    top = state.top_commenter
+    if top and top['author_name'] and top['comment_count'] > 2:
+        avg_len = top['avg_length'] if top['avg_length'] else 0
+        return (f"👤 {top['author_name']} is very active: "
+                f"{top['comment_count']} comments this month "
+                f"({avg_len:.0f} chars avg)")
+    return None
+
+@InsightEngine.rule
+def best_recent_engagement(state):
+    cutoff = (state.today - timedelta(days=60)).isoformat()
+    candidates = [
+        a for a in state.articles.values()
+        if a['published_at'] and a['published_at'] >= cutoff and (a['views'] or 0) > 50
+    ]
+    if not candidates:
+        return None
+
+    best = max(candidates, key=lambda a: (a['comments'] or 0) / a['views'])
+    rate = ((best['comments'] or 0) / best['views']) * 100
+    return f"💬 Best engagement: '{best['title'][:60]}...' ({rate:.1f}% comment rate)"
+
+@InsightEngine.rule
+def follower_growth(state):
+    followers = state.followers
+    if len(followers) == 2 and (followers[0]['new_followers_since_last'] or 0) > 5:
+        return (f"👥 +{followers[0]['new_followers_since_last']} new followers recently "
+                f"(total: {followers[0]['follower_count']})")
+    return None
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Contrôles d'intégrité des données (remplace les scripts ponctuels checkcoverage.py,
+checkincremental.py, anrety.py, diagnose_reactions.py et fix.py IncoherenceFixer).
+
+Usage:
+    python3 -m core.integrity                  # lignes ajoutées depuis le dernier passage
+    python3 -m core.integrity --full           # tout re-contrôler
+    python3 -m core.integrity --checks coverage,orphans --format json
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+from core.database import DatabaseManager
+from core.daily_rollup import DailyRollup
+from core.results import dump_json
+
+# --- RESULTS ---
+
+@dataclass(slots=True)
+class Finding:
+    check: str
+    ref: str
+    severity: str
+    article_id: Optional[int]
+    detail: str
+    rows: Optional[int] = None
+
+@dataclass(slots=True)
+class IntegrityReport:
+    full: bool
+    rows_scanned: Dict[str, int]
+    findings: List[Finding]
+    resolved: int
+    open_findings: int
+    seconds: float
+
+# --- CHECKS ---
+
+class Check:
+    """
+    Contrôle branché sur le parcours unique de IntegrityScanner.
+
+    columns : table -> colonnes lues (seules les lignes ajoutées depuis le dernier
+    passage du contrôle lui sont distribuées).
+    state : dict JSON persistant entre deux passages (sync_state).
+    finish() retourne (findings, refs contrôlés sans anomalie -> résolus).
+    """
+
+    name = None
+    columns = {}
+
+    def __init__(self, state):
+        self.state = state
+
+    def begin(self, conn):
+        pass
+
+    def row(self, table, row):
+        pass
+
+    def finish(self, conn):
+        return [], []
+
+def _day(value):
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None  # signalé par DateFormatCheck
+
+class _TouchedArticles(Check):
+    """Base des contrôles par article : articles ayant reçu de nouvelles lignes daily_analytics."""
+
+    columns = {'daily_analytics': ('article_id',)}
+
+    def begin(self, conn):
+        self.touched = set()
+        self.latest = {row['article_id']: row for row in conn.execute(
+            "SELECT article_id, published_at, views, reactions FROM article_latest"
+        )}
+
+    def row(self, table, row):
+        self.touched.add(row['article_id'])
+
+    def _daily_sums(self, conn, column):
+        # Parcours de l'index UNIQUE(article_id, date) : seulement les articles touchés
+        for article_id in sorted(self.touched):
+            total = conn.execute(
+                f"SELECT SUM({column}) FROM daily_analytics WHERE article_id = ?", (article_id,)
+            ).fetchone()[0]
+            yield article_id, total or 0
+
+class CoverageGapCheck(_TouchedArticles):
+    """Jours manquants dans daily_analytics, et période non couverte après la publication."""
+
+    name = "coverage"
+
+    def finish(self, conn):
+        findings, resolved = [], []
+        for article_id in sorted(self.touched):
+            days = [d for d in (_day(r[0]) for r in conn.execute(
+                "SELECT date FROM daily_analytics WHERE article_id = ? ORDER BY date", (article_id,)
+            )) if d]
+            if not days:
+                continue
+            gaps = [(a, b) for a, b in zip(days, days[1:]) if (b - a).days > 1]
+            missing = sum((b - a).days - 1 for a, b in gaps)
+
+            problems = []
+            if gaps:
+                ranges = ", ".join(f"{a.isoformat()}→{b.isoformat()}" for a, b in gaps[:5])
+                problems.append(f"{missing} missing day(s) ({ranges}{', …' if len(gaps) > 5 else ''})")
+            latest = self.latest.get(article_id)
+            published = _day(latest['published_at']) if latest and latest['published_at'] else None
+            if published:
+                lead = (days[0] - published).days
+                if lead > 1:
+                    problems.append(f"no data for the first {lead} days after publication "
+                                    f"(starts {days[0].isoformat()}, see devto_tracker.py --backfill)")
+
+            if problems:
+                findings.append(Finding(self.name, str(article_id), 'medium', article_id, "; ".join(problems)))
+            else:
+                resolved.append(str(article_id))
+        return findings, resolved
+
+class CumulativeIncrementalCheck(_TouchedArticles):
+    """
+    article_metrics est cumulatif (les vues ne baissent jamais), daily_analytics est
+    incrémental (SUM des jours <= total lifetime). Une somme quotidienne au-delà du
+    lifetime signale des valeurs cumulées stockées comme incréments (ou des doublons).
+    """
+
+    name = "cumulative"
+    columns = {'daily_analytics': ('article_id',), 'article_metrics': ('id', 'article_id', 'views', 'collected_at')}
+
+    def row(self, table, row):
+        if table == 'daily_analytics':
+            self.touched.add(row['article_id'])
+            return
+        key = str(row['article_id'])
+        last = self.state.get(key)
+        if last is not None and row['views'] is not None and row['views'] < last:
+            self.decreases.append(Finding(
+                self.name, f"{row['article_id']}:views", 'high', row['article_id'],
+                f"views went down {last} → {row['views']} at {row['collected_at']} (metric #{row['id']})", 1
+            ))
+        if row['views'] is not None:
+            self.state[key] = row['views']
+
+    def begin(self, conn):
+        super().begin(conn)
+        self.decreases = []
+
+    def finish(self, conn):
+        findings, resolved = list(self.decreases), []
+        for article_id, total in self._daily_sums(conn, 'page_views'):
+            latest = self.latest.get(article_id)
+            if latest is None or latest['views'] is None:
+                continue
+            if total > latest['views'] * 1.05 + 10:
+                findings.append(Finding(
+                    self.name, f"{article_id}:daily", 'high', article_id,
+                    f"SUM(daily page_views) = {total} > lifetime views {latest['views']}: "
+                    f"cumulative values stored as daily increments, or duplicate days"
+                ))
+            else:
+                resolved.append(f"{article_id}:daily")
+        return findings, resolved
+
+class ReactionPeriodCheck(_TouchedArticles):
+    """Réactions lifetime (article_metrics) absentes de daily_analytics (période non collectée)."""
+
+    name = "reaction_period"
+    TOLERANCE = 5
+
+    def finish(self, conn):
+        findings, resolved = [], []
+        for article_id, total in self._daily_sums(conn, 'reactions_total'):
+            latest = self.latest.get(article_id)
+            if latest is None or latest['reactions'] is None:
+                continue
+            missing = latest['reactions'] - total
+            if missing > self.TOLERANCE:
+                first = conn.execute(
+                    "SELECT MIN(date) FROM daily_analytics WHERE article_id = ?", (article_id,)
+                ).fetchone()[0]
+                findings.append(Finding(
+                    self.name, str(article_id), 'high', article_id,
+                    f"{missing} of {latest['reactions']} lifetime reactions missing from daily_analytics "
+                    f"(daily data starts {first})"
+                ))
+            else:
+                resolved.append(str(article_id))
+        return findings, resolved
+
+def date_shape(value):
+    """Forme d'un horodatage : 'date', 'T+offset', 'T Z', 'space naive'... ou 'invalid'."""
+    if len(value) == 10:
+        try:
+            date.fromisoformat(value)
+            return 'date'
+        except ValueError:
+            return 'invalid'
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return 'invalid'
+    sep = 'T' if 'T' in value else 'space'
+    if parsed.tzinfo is None:
+        return f"{sep} naive"
+    return f"{sep} Z" if value.endswith('Z') else f"{sep}+offset"
+
+class DateFormatCheck(Check):
+    """
+    Dérive de format des horodatages : chaque colonne garde la forme de sa première
+    valeur contrôlée comme référence ; les valeurs d'une autre forme sont signalées.
+    """
+
+    name = "date_format"
+    COLUMNS = {
+        'article_metrics': ('collected_at', 'published_at'),
+        'daily_analytics': ('date', 'collected_at'),
+        'comments': ('created_at', 'collected_at'),
+        'follower_events': ('collected_at',),
+        'referrers': ('collected_at',),
+        'article_history': ('changed_at',),
+        'milestone_events': ('occurred_at',),
+    }
+    columns = COLUMNS
+
+    def begin(self, conn):
+        self.drift = {}
+
+    def row(self, table, row):
+        for column in self.COLUMNS[table]:
+            value = row[column]
+            if value is None:
+                continue
+            key = f"{table}.{column}"
+            shape = date_shape(str(value))
+            reference = self.state.setdefault(key, shape)
+            if shape != reference:
+                count, example = self.drift.get((key, shape), (0, None))
+                self.drift[(key, shape)] = (count + 1, example or f"rowid {row['_rowid']}: {value!r}")
+
+    def finish(self, conn):
+        findings = [
+            Finding(self.name, f"{key}:{shape}", 'high' if shape == 'invalid' else 'low', None,
+                    f"{key}: '{shape}' values, reference is '{self.state[key]}' (e.g. {example})", count)
+            for (key, shape), (count, example) in sorted(self.drift.items())
+        ]
+        return findings, []
+
+class OrphanRowsCheck(Check):
+    """Lignes rattachées à un article absent de article_metrics."""
+
+    name = "orphans"
+    TABLES = ('daily_analytics', 'referrers', 'comments', 'article_history', 'milestone_events',
+              'article_content', 'article_code_blocks', 'article_links', 'article_versions')
+    columns = {table: ('article_id',) for table in TABLES}
+
+    def begin(self, conn):
+        # article_latest (resynchronisé par compute_check) : une ligne par article de article_metrics
+        self.known = {r[0] for r in conn.execute("SELECT article_id FROM article_latest")}
+        self.orphans = defaultdict(lambda: defaultdict(int))
+
+    def row(self, table, row):
+        if row['article_id'] is not None and row['article_id'] not in self.known:
+            self.orphans[table][row['article_id']] += 1
+
+    def finish(self, conn):
+        findings = []
+        for table, articles in sorted(self.orphans.items()):
+            ids = sorted(articles)
+            shown = ", ".join(str(a) for a in ids[:10]) + (", …" if len(ids) > 10 else "")
+            findings.append(Finding(self.name, table, 'medium', None,
+                                    f"{table}: rows for {len(ids)} unknown article(s): {shown}",
+                                    sum(articles.values())))
+
+        # Tables signalées lors d'un passage précédent : résolues si plus aucune ligne orpheline
+        resolved = []
+        for (table,) in conn.execute(
+            "SELECT ref FROM integrity_findings WHERE check_name = ?", (self.name,)
+        ).fetchall():
+            if table in self.orphans or table not in self.TABLES:
+                continue
+            if not DatabaseManager._table_exists(conn, table) or not conn.execute(f"""
+                SELECT 1 FROM {table}
+                WHERE article_id IS NOT NULL AND article_id NOT IN (SELECT article_id FROM article_latest)
+                LIMIT 1
+            """).fetchone():
+                resolved.append(table)
+        return findings, resolved
+
+# Contrôles disponibles (ordre d'exécution) : ajouter ici une sous-classe de Check
+CHECKS = [CoverageGapCheck, CumulativeIncrementalCheck, ReactionPeriodCheck, DateFormatCheck, OrphanRowsCheck]
+
+# --- SCANNER ---
+
+class IntegrityScanner:
+    """
+    Exécute les contrôles en un seul parcours de chaque table : chaque contrôle garde
+    son high-water mark par table (rowid, dans sync_state) ; les lignes au-delà du plus
+    petit sont lues une fois, en flux, et distribuées aux contrôles qui ne les ont pas vues. Les anomalies ouvertes sont tenues
+    dans integrity_findings (mises à jour, ou supprimées quand un contrôle les résout).
+
+    Limite : une ligne réécrite sur place (UPSERT de daily_analytics) garde son rowid ;
+    les contrôles par article relisent donc l'article entier via l'index (article_id, date).
+    """
+
+    STATE_PREFIX = "integrity."
+
+    def __init__(self, db: DatabaseManager, checks=None):
+        self.db = db
+        self.check_classes = [cls for cls in CHECKS if checks is None or cls.name in checks]
+
+    def compute_check(self, full: bool = False) -> IntegrityReport:
+        started = time.perf_counter()
+        timestamp = datetime.now(timezone.utc).isoformat()
+        conn = self.db.get_connection()
+        # article_latest (référence des contrôles) à jour des derniers snapshots
+        DailyRollup(self.db).refresh(conn)
+
+        if full:
+            for cls in self.check_classes:
+                conn.execute("DELETE FROM sync_state WHERE key LIKE ?", (f"{self.STATE_PREFIX}{cls.name}.%",))
+                conn.execute("DELETE FROM integrity_findings WHERE check_name = ?", (cls.name,))
+
+        checks = []
+        for cls in self.check_classes:
+            check = cls(json.loads(self.db.get_state(f"{self.STATE_PREFIX}{cls.name}.state", "{}", conn)))
+            check.begin(conn)
+            checks.append(check)
+
+        rows_scanned = {}
+        for table, columns, subscribers in self._plan(conn, checks):
+            marks = [(check, int(self.db.get_state(self._mark_key(check, table), 0, conn)))
+                     for check in subscribers]
+            start = min(mark for _, mark in marks)
+            count, max_rowid = 0, start
+            for row in conn.execute(
+                f"SELECT rowid AS _rowid, {', '.join(columns)} FROM {table} WHERE rowid > ? ORDER BY rowid", (start,)
+            ):
+                max_rowid = row['_rowid']
+                for check, mark in marks:
+                    if max_rowid > mark:
+                        check.row(table, row)
+                count += 1
+            rows_scanned[table] = count
+            for check, mark in marks:
+                self.db.set_state(self._mark_key(check, table), max(mark, max_rowid), conn)
+
+        findings, resolved = [], 0
+        for check in checks:
+            check_findings, check_resolved = check.finish(conn)
+            findings.extend(check_findings)
+            resolved += self._store(conn, check.name, check_findings, check_resolved, timestamp)
+            self.db.set_state(f"{self.STATE_PREFIX}{check.name}.state", json.dumps(check.state), conn)
+
+        open_findings = conn.execute("SELECT COUNT(*) FROM integrity_findings").fetchone()[0]
+        conn.commit()
+        conn.close()
+        return IntegrityReport(full, rows_scanned, findings, resolved, open_findings,
+                               time.perf_counter() - started)
+
+    def _mark_key(self, check, table):
+        return f"{self.STATE_PREFIX}{check.name}.{table}.last_rowid"
+
+    @staticmethod
+    def _plan(conn, checks):
+        """[(table, colonnes lues, contrôles abonnés)] pour les tables présentes."""
+        tables = {}
+        for check in checks:
+            for table, columns in check.columns.items():
+                cols, subscribers = tables.setdefault(table, ([], []))
+                cols.extend(c for c in columns if c != 'rowid' and c not in cols)
+                subscribers.append(check)
+        return [(table, cols, subscribers) for table, (cols, subscribers) in tables.items()
+                if DatabaseManager._table_exists(conn, table)]
+
+    @staticmethod
+    def _store(conn, check_name, findings, resolved, timestamp):
+        conn.executemany("""
+            INSERT INTO integrity_findings (check_name, ref, severity, article_id, detail, rows, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(check_name, ref) DO UPDATE SET
+                severity = excluded.severity,
+                detail = excluded.detail,
+                rows = CASE WHEN excluded.rows IS NULL THEN NULL
+                            ELSE COALESCE(integrity_findings.rows, 0) + excluded.rows END,
+                last_seen = excluded.last_seen
+        """, [(check_name, f.ref, f.severity, f.article_id, f.detail, f.rows, timestamp, timestamp)
+              for f in findings])
+        before = conn.total_changes
+        conn.executemany("DELETE FROM integrity_findings WHERE check_name = ? AND ref = ?",
+                         [(check_name, ref) for ref in resolved])
+        return conn.total_changes - before
+
+    def render_check(self, report: IntegrityReport):
+        scanned = sum(report.rows_scanned.values())
+        mode = "full scan" if report.full else "since last run"
+        print(f"\n🩺 INTEGRITY CHECK ({mode}) — {scanned:,} rows in {report.seconds:.2f}s")
+        print("-" * 80)
+        for table, count in report.rows_scanned.items():
+            print(f"   {table:<22} {count:>10,} new rows")
+
+        icons = {'high': '🔴', 'medium': '🟠', 'low': '🟡'}
+        if report.findings:
+            print(f"\n⚠️  {len(report.findings)} finding(s):")
+            for f in report.findings:
+                rows = f" [{f.rows} rows]" if f.rows else ""
+                print(f"{icons[f.severity]} {f.check:<16} {f.detail}{rows}")
+        else:
+            print("\n✅ No new issue")
+        if report.resolved:
+            print(f"✔️  {report.resolved} previous finding(s) resolved")
+        print(f"📋 Open findings: {report.open_findings} (integrity_findings)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contrôles d'intégrité des données")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--full', action='store_true', help='Re-contrôle toutes les lignes')
+    parser.add_argument('--checks', help=f"Contrôles à exécuter ({','.join(c.name for c in CHECKS)})")
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Format de sortie')
+    args = parser.parse_args()
+
+    names = set(args.checks.split(",")) if args.checks else None
+    unknown = (names or set()) - {c.name for c in CHECKS}
+    if unknown:
+        parser.error(f"unknown check(s): {', '.join(sorted(unknown))}")
+
+    scanner = IntegrityScanner(DatabaseManager(args.db), names)
+    report = scanner.compute_check(args.full)
+    if args.format == 'json':
+        print(dump_json(report))
+    else:
+        scanner.render_check(report)
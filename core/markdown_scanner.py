@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Scanner markdown en une passe.
+
+Produit en une seule traversée les blocs de code (``` et ~~~, code indenté),
+liens, images, titres, liquid tags ({% embed ... %}) et le nombre de mots hors
+code, sans construire de copie intermédiaire du texte.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+# Blocs ancrés en début de ligne : fences, code indenté (après une ligne vide), titres
+_BLOCK = (
+    r" {0,3}(?P<fence>`{3,}|~{3,})[ \t]*(?P<info>[^\n]*)"
+    r"(?P<body>(?:\n.*?)??)(?:\n {0,3}(?P=fence)[`~]*[ \t]*(?=\n|\Z)|\Z)"
+    r"|(?:(?<=\n\n)|\A)(?P<indented>(?: {4}|\t)[^\n]*(?:\n(?:(?: {4}|\t)[^\n]*|[ \t]*(?=\n)))*)"
+    r"| {0,3}(?P<hashes>#{1,6})[ \t]+(?P<heading>[^\n]*?)[ \t#]*(?=\n|\Z)"
+)
+# Éléments en ligne : code inline (ignoré), image, lien, liquid tag
+_INLINE = (
+    r"`[^`\n]*`"
+    r"|!\[(?P<alt>[^\]]*)\]\((?P<img>[^)]+)\)"
+    r"|\[(?P<text>[^\]]+)\]\((?P<url>[^)]+)\)"
+    r"|\{%\s*(?P<tag>\w+)\s*(?P<args>.*?)\s*%\}"
+)
+# Chaque alternative commence par un caractère littéral (\n, `, !, [, {) : le moteur
+# saute directement d'un candidat à l'autre au lieu d'essayer chaque position
+_TOKENS = re.compile(r"\n(?:" + _BLOCK + ")|" + _INLINE, re.DOTALL)
+_HEAD = re.compile(_BLOCK, re.DOTALL)
+_INLINE_TOKENS = re.compile(_INLINE, re.DOTALL)
+_LIST_ITEM = re.compile(r" {0,3}(?:[-*+]|\d+[.)])[ \t]")
+
+@dataclass(slots=True)
+class MarkdownScan:
+    code_blocks: List[Dict] = field(default_factory=list)
+    links: List[Dict] = field(default_factory=list)
+    images: List[Dict] = field(default_factory=list)
+    headings: List[Dict] = field(default_factory=list)
+    liquid_tags: List[Dict] = field(default_factory=list)
+    word_count: int = 0
+    char_count: int = 0
+
+def link_type(url):
+    if url.startswith('#'):
+        return 'anchor'
+    if url.startswith('http'):
+        return 'internal' if 'dev.to' in url else 'external'
+    return 'relative'
+
+def _in_list(markdown, pos):
+    """Vrai si le bloc indenté qui commence à pos continue un élément de liste."""
+    end = pos
+    while end > 0:
+        start = markdown.rfind("\n", 0, end - 1) + 1
+        line = markdown[start:end].rstrip("\n")
+        if line.strip():
+            return bool(_LIST_ITEM.match(line)) or line.startswith(("    ", "\t"))
+        end = start
+    return False
+
+def _add_inline(scan, m, kind):
+    if kind == 'url':
+        url = m.group('url')
+        scan.links.append({'url': url, 'link_text': m.group('text'), 'link_type': link_type(url)})
+    elif kind == 'img':
+        scan.images.append({'alt': m.group('alt'), 'url': m.group('img')})
+    elif kind == 'args':
+        scan.liquid_tags.append({'tag': m.group('tag'), 'args': m.group('args')})
+
+def _tokens(markdown):
+    head = _HEAD.match(markdown)
+    if head:
+        yield head
+    yield from _TOKENS.finditer(markdown, head.end() if head else 0)
+
+def scan_markdown(markdown: str) -> MarkdownScan:
+    markdown = markdown or ""
+    scan = MarkdownScan(char_count=len(markdown))
+    # L'API renvoie body_markdown en \r\n : les motifs s'ancrent sur \n (offsets relatifs au texte normalisé)
+    markdown = markdown.replace("\r\n", "\n")
+    # Mots hors code : total moins les mots des blocs de code (marqueurs compris)
+    code_words = 0
+
+    for m in _tokens(markdown):
+        # lastgroup : dernier groupe nommé fermé, identifie l'alternative qui a matché
+        kind = m.lastgroup
+        if kind == 'body':
+            info = m.group('info').strip()
+            language = info.split()[0] if info else "text"
+            code_text = m.group('body').strip()
+        elif kind == 'indented':
+            if _in_list(markdown, m.start('indented')):
+                # Continuation d'un élément de liste : texte ordinaire
+                for inline in _INLINE_TOKENS.finditer(markdown, m.start(), m.end()):
+                    _add_inline(scan, inline, inline.lastgroup)
+                continue
+            language = "text"
+            code_text = "\n".join(
+                line[4:] if line.startswith("    ") else line[1:]
+                for line in m.group('indented').split("\n")
+            ).strip()
+        elif kind == 'heading':
+            scan.headings.append({'level': len(m.group('hashes')), 'text': m.group('heading'), 'offset': m.start('hashes')})
+            continue
+        else:
+            _add_inline(scan, m, kind)
+            continue
+
+        scan.code_blocks.append({
+            'language': language,
+            'code_text': code_text,
+            'line_count': len(code_text.split('\n')),
+            'block_order': len(scan.code_blocks) + 1
+        })
+        code_words += len(m.group(0).split())
+
+    scan.word_count = len(markdown.split()) - code_words
+    return scan
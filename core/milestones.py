@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+import json
+from pathlib import Path
+from core.collection_runs import parse_ts
+from core.database import DatabaseManager
+
+DEFAULT_RULES = Path(__file__).resolve().parent.parent / "milestone_rules.json"
+
+# Champs de /articles/me/all -> colonnes de article_latest
+_METRICS = {
+    'views': 'page_views_count',
+    'reactions': 'public_reactions_count',
+    'comments': 'comments_count',
+}
+
+class MilestoneDetector:
+    """
+    Détection des milestones à l'ingestion, pilotée par milestone_rules.json.
+
+    Chaque nouveau snapshot est comparé à l'état précédent lu dans article_latest
+    (une requête pour toute la collecte) : paliers franchis, premier commentaire,
+    pic de vitesse, saut de réactions (curation staff probable). Aucune relecture
+    de l'historique : O(1) par article et par collecte.
+    """
+
+    def __init__(self, db: DatabaseManager, rules_path=None):
+        self.db = db
+        self.rules_path = Path(rules_path or DEFAULT_RULES)
+        self.rules = json.loads(self.rules_path.read_text(encoding="utf-8"))
+        self.thresholds = {metric: sorted(values) for metric, values in self.rules.get("thresholds", {}).items()}
+        self.velocity_rule = self.rules.get("velocity_spike")
+        self.reaction_rule = self.rules.get("reaction_jump")
+
+    def evaluate(self, previous, current, now):
+        """
+        previous : état article_latest (views, reactions, comments, collected_at, published_at)
+        current : {'views', 'reactions', 'comments'} du nouveau snapshot
+        Retourne [(event_type, description)].
+        """
+        events = []
+        for metric, values in self.thresholds.items():
+            before, after = previous[metric] or 0, current[metric] or 0
+            crossed = [t for t in values if before < t <= after]
+            if crossed:
+                # Plusieurs paliers franchis d'un coup : seul le plus haut est retenu
+                events.append((f"{metric}_milestone", f"Crossed {crossed[-1]:,} {metric}"))
+
+        if self.rules.get("first_comment") and not previous['comments'] and current['comments']:
+            events.append(("first_comment", "First comment"))
+
+        if not previous['collected_at'] or not previous['published_at']:
+            return events
+
+        hours = (now - parse_ts(previous['collected_at'])).total_seconds() / 3600
+        age = (parse_ts(previous['collected_at']) - parse_ts(previous['published_at'])).total_seconds() / 3600
+        if hours <= 0:
+            return events
+
+        for metric, rule, event_type, label in (
+            ('views', self.velocity_rule, 'velocity_spike', "Velocity spike"),
+            ('reactions', self.reaction_rule, 'reaction_jump', "Reactions jumped"),
+        ):
+            if not rule or age < rule.get("min_age_hours", 24):
+                continue
+            delta = (current[metric] or 0) - (previous[metric] or 0)
+            # Référence : rythme moyen depuis la publication
+            baseline = (previous[metric] or 0) / age if age > 0 else 0
+            rate = delta / hours
+            if delta >= rule.get("min_delta", 0) and rate >= rule.get("factor", 3.0) * baseline:
+                description = f"{label}: +{delta} {metric} in {hours:.1f}h ({rate:.1f}/h vs {baseline:.1f}/h avg)"
+                if event_type == 'reaction_jump':
+                    description += " - possible staff curation"
+                events.append((event_type, description))
+
+        return events
+
+    def detect(self, conn, articles, timestamp):
+        """
+        Compare les articles d'une collecte (format /articles/me/all) à article_latest,
+        avant que DailyRollup.refresh ne le mette à jour. Insère les milestones en lot
+        (sans commit) et retourne [(article_id, event_type, description)].
+        """
+        latest = {
+            row['article_id']: row
+            for row in conn.execute("""
+                SELECT article_id, views, reactions, comments, collected_at, published_at
+                FROM article_latest
+            """)
+        }
+        now = parse_ts(timestamp)
+
+        events = []
+        for art in articles:
+            previous = latest.get(art['id'])
+            if previous is None:
+                # Premier snapshot : pas d'état de référence (évite une rafale à l'installation)
+                continue
+            current = {metric: art.get(field) for metric, field in _METRICS.items()}
+            events.extend((art['id'], event_type, description)
+                          for event_type, description in self.evaluate(previous, current, now))
+
+        conn.executemany("""
+            INSERT INTO milestone_events (article_id, event_type, description, occurred_at)
+            VALUES (?, ?, ?, ?)
+        """, [(article_id, event_type, description, timestamp) for article_id, event_type, description in events])
+
+        for article_id, event_type, description in events:
+            print(f"🏁 #{article_id} {description}")
+        return events
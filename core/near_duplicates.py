@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import random
+import re
+import zlib
+from array import array
+from core.database import DatabaseManager
+
+_URL = re.compile(r"(https?://|www\.)\S+", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+_WORD = re.compile(r"\w+")
+
+_PRIME = 4294967311  # premier > 2^32
+_MASK = 0xFFFFFFFF
+
+def normalize_words(text):
+    """Mots normalisés : les URL et nombres (numéros, montants) ne distinguent pas deux variantes."""
+    text = _URL.sub(" url ", (text or "").lower())
+    text = _DIGITS.sub("0", text)
+    return _WORD.findall(text)
+
+class NearDuplicateIndex:
+    """
+    Index de quasi-doublons des commentaires : signatures MinHash sur des
+    shingles de mots, découpées en bandes LSH stockées dans comment_lsh.
+
+    Un nouveau commentaire n'est comparé qu'aux commentaires partageant au moins
+    un bucket (recherche indexée), puis la similarité est estimée sur les
+    signatures. Les commentaires proches sont regroupés dans comment_clusters.
+    comment_minhash garde le body_hash signé (signature vide pour un texte trop
+    court) : un commentaire édité par insert_comment est retiré puis re-signé.
+    """
+
+    STATE_KEY = "near_dup.last_comment_rowid"
+    STATE_PARAMS = "near_dup.params"
+
+    def __init__(self, db: DatabaseManager, num_perm=64, bands=16, shingle_size=3,
+                 threshold=0.6, min_words=8):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.db = db
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.min_words = min_words
+        self.params = f"{num_perm}:{bands}:{shingle_size}:{min_words}"
+
+        rng = random.Random(42)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    @classmethod
+    def from_rules(cls, db: DatabaseManager, rule):
+        """Construit l'index depuis la section near_duplicate de spam_rules.json."""
+        keys = ("num_perm", "bands", "shingle_size", "threshold", "min_words")
+        return cls(db, **{k: rule[k] for k in keys if k in rule})
+
+    def signature(self, text):
+        """Signature MinHash (None si le texte est trop court pour être significatif)."""
+        words = normalize_words(text)
+        if len(words) < self.min_words:
+            return None
+
+        n = self.shingle_size
+        shingles = {zlib.crc32(" ".join(words[i:i + n]).encode("utf-8")) for i in range(len(words) - n + 1)}
+        return array("I", (
+            min(((a * x + b) % _PRIME) & _MASK for x in shingles)
+            for a, b in self._perms
+        ))
+
+    def _buckets(self, sig):
+        for band in range(self.bands):
+            chunk = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            yield band, int.from_bytes(digest, "big", signed=True)
+
+    def similarity(self, sig_a, sig_b):
+        """Estimation de la similarité de Jaccard entre deux signatures."""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / self.num_perm
+
+    def refresh(self, conn=None):
+        """
+        Indexe les commentaires arrivés depuis le dernier passage, et re-signe ceux
+        dont le texte a été édité. Retourne les clusters modifiés (membres ajoutés ou retirés).
+        """
+        should_close = conn is None
+        if conn is None:
+            conn = self.db.get_connection()
+
+        if self.db.get_state(self.STATE_PARAMS, conn=conn) != self.params:
+            # Paramètres changés : les buckets existants ne sont plus comparables
+            for table in ("comment_minhash", "comment_lsh", "comment_clusters"):
+                conn.execute(f"DELETE FROM {table}")
+            self.db.set_state(self.STATE_KEY, 0, conn)
+            self.db.set_state(self.STATE_PARAMS, self.params, conn)
+
+        last_rowid = int(self.db.get_state(self.STATE_KEY, 0, conn))
+        rows = conn.execute("""
+            SELECT rowid AS rid, comment_id, body_text, body_hash FROM comments
+            WHERE rowid > ?
+            ORDER BY rowid
+        """, (last_rowid,)).fetchall()
+        # Commentaires déjà indexés dont le texte a changé depuis leur signature
+        edited = conn.execute("""
+            SELECT c.comment_id, c.body_text, c.body_hash FROM comment_minhash m
+            JOIN comments c ON c.comment_id = m.comment_id
+            WHERE c.rowid <= ? AND m.body_hash IS NOT c.body_hash
+        """, (last_rowid,)).fetchall()
+
+        touched = set()
+        for row in edited:
+            # Son ancien cluster perd un membre : ses verdicts sont à revoir
+            touched.add(self._remove(conn, row['comment_id']))
+        for row in edited + rows:
+            sig = self.signature(row['body_text'])
+            if sig is None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO comment_minhash (comment_id, signature, body_hash) VALUES (?, X'', ?)",
+                    (row['comment_id'], row['body_hash'])
+                )
+                continue
+            cluster = self._add(conn, row['comment_id'], sig, row['body_hash'])
+            if cluster:
+                touched.add(cluster)
+        touched.discard(None)
+
+        if rows:
+            self.db.set_state(self.STATE_KEY, rows[-1]['rid'], conn)
+
+        if should_close:
+            conn.commit()
+            conn.close()
+        return touched
+
+    def _remove(self, conn, comment_id):
+        """Retire un commentaire de l'index (buckets, signature, cluster). Retourne son cluster."""
+        row = conn.execute("SELECT signature FROM comment_minhash WHERE comment_id = ?", (comment_id,)).fetchone()
+        if row and row['signature']:
+            conn.executemany(
+                "DELETE FROM comment_lsh WHERE band = ? AND bucket = ? AND comment_id = ?",
+                [(band, bucket, comment_id) for band, bucket in self._buckets(array("I", row['signature']))]
+            )
+        conn.execute("DELETE FROM comment_minhash WHERE comment_id = ?", (comment_id,))
+        cluster = conn.execute("SELECT cluster_id FROM comment_clusters WHERE comment_id = ?", (comment_id,)).fetchone()
+        conn.execute("DELETE FROM comment_clusters WHERE comment_id = ?", (comment_id,))
+        return cluster['cluster_id'] if cluster else None
+
+    def _add(self, conn, comment_id, sig, body_hash=None):
+        buckets = list(self._buckets(sig))
+
+        candidates = set()
+        for band, bucket in buckets:
+            for r in conn.execute(
+                "SELECT comment_id FROM comment_lsh WHERE band = ? AND bucket = ?", (band, bucket)
+            ):
+                candidates.add(r['comment_id'])
+        candidates.discard(comment_id)
+
+        matches = []
+        for candidate in candidates:
+            row = conn.execute(
+                "SELECT signature FROM comment_minhash WHERE comment_id = ?", (candidate,)
+            ).fetchone()
+            if row and self.similarity(sig, array("I", row['signature'])) >= self.threshold:
+                matches.append(candidate)
+
+        conn.execute(
+            "INSERT OR REPLACE INTO comment_minhash (comment_id, signature, body_hash) VALUES (?, ?, ?)",
+            (comment_id, sig.tobytes(), body_hash)
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO comment_lsh (band, bucket, comment_id) VALUES (?, ?, ?)",
+            [(band, bucket, comment_id) for band, bucket in buckets]
+        )
+
+        if not matches:
+            return None
+
+        # Le plus petit identifiant absorbe les autres (un commentaire peut relier deux clusters)
+        placeholders = ",".join("?" * len(matches))
+        existing = {
+            r['cluster_id'] for r in conn.execute(
+                f"SELECT cluster_id FROM comment_clusters WHERE comment_id IN ({placeholders})", matches
+            )
+        }
+        cluster = min(existing | set(matches))
+        if existing:
+            conn.execute(
+                f"UPDATE comment_clusters SET cluster_id = ? WHERE cluster_id IN ({','.join('?' * len(existing))})",
+                (cluster, *existing)
+            )
+        conn.executemany(
+            "INSERT OR REPLACE INTO comment_clusters (comment_id, cluster_id) VALUES (?, ?)",
+            [(c, cluster) for c in matches + [comment_id]]
+        )
+        return cluster
+
+    def cluster_stats(self, conn):
+        """Pour chaque commentaire d'un cluster : (taille du cluster, auteurs distincts)."""
+        rows = conn.execute("""
+            SELECT k.comment_id, s.size, s.authors
+            FROM comment_clusters k
+            JOIN (
+                SELECT k2.cluster_id, COUNT(*) as size, COUNT(DISTINCT c.author_username) as authors
+                FROM comment_clusters k2
+                JOIN comments c ON c.comment_id = k2.comment_id
+                GROUP BY k2.cluster_id
+            ) s ON s.cluster_id = k.cluster_id
+        """).fetchall()
+        return {r['comment_id']: (r['size'], r['authors']) for r in rows}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quasi-doublons de commentaires (MinHash / LSH)")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--limit', type=int, default=10, help='Nombre de clusters affichés')
+    args = parser.parse_args()
+
+    from core.spam import SpamEngine
+    db = DatabaseManager(args.db)
+    # Mêmes paramètres que le classifieur spam (sinon l'index serait reconstruit à chaque passage)
+    index = NearDuplicateIndex.from_rules(db, SpamEngine().rules.get("near_duplicate", {}))
+    conn = db.get_connection()
+    index.refresh(conn)
+    conn.commit()
+
+    clusters = conn.execute("""
+        SELECT k.cluster_id, COUNT(*) as size, COUNT(DISTINCT c.author_username) as authors,
+               COUNT(DISTINCT c.article_id) as articles, MIN(c.body_text) as sample
+        FROM comment_clusters k
+        JOIN comments c ON c.comment_id = k.comment_id
+        GROUP BY k.cluster_id
+        ORDER BY authors DESC, size DESC
+        LIMIT ?
+    """, (args.limit,)).fetchall()
+    conn.close()
+
+    print(f"\n🧬 CLUSTERS DE QUASI-DOUBLONS ({len(clusters)})")
+    print("-" * 80)
+    for c in clusters:
+        print(f"{c['size']:>4} commentaires · {c['authors']} auteurs · {c['articles']} articles")
+        print(f"     \"{(c['sample'] or '')[:100]}\"")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+import argparse
+import re
+from core.database import DatabaseManager
+
+AUTHOR_USERNAME = "pascal_cescato_692b7a8a20"
+
+_URL = re.compile(r"(https?://|www\.)\S+", re.IGNORECASE)
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+_INTERROGATIVE = re.compile(
+    r"^(how|what|why|when|where|which|who|whom|whose|can|could|would|should|will|"
+    r"is|are|was|were|do|does|did|have|has|any idea|anyone)\b",
+    re.IGNORECASE
+)
+
+def is_question(text):
+    """
+    Détecteur de question sur le texte nettoyé (sans code ni URL) :
+    une phrase qui se termine par '?', ou qui commence par un mot interrogatif
+    sans ponctuation finale ("how do you handle retries").
+    """
+    if not text:
+        return False
+    text = _URL.sub(" ", text)
+    for sentence in _SENTENCE.split(text):
+        sentence = sentence.strip()
+        if len(sentence.split()) < 2:
+            continue
+        if sentence.endswith("?"):
+            return True
+        if _INTERROGATIVE.match(sentence) and sentence[-1] not in ".!" and len(sentence.split()) >= 3:
+            return True
+    return False
+
+class QuestionQueue:
+    """
+    File des questions de lecteurs sans réponse de l'auteur (table open_questions).
+
+    Maintenue incrémentalement à partir des commentaires insérés depuis le dernier
+    passage (high-water mark sur le rowid de comments) : une question est résolue
+    dès qu'une réponse de l'auteur plus récente arrive sur le même article.
+    """
+
+    STATE_KEY = "questions.last_comment_rowid"
+
+    def __init__(self, db: DatabaseManager, author_username=AUTHOR_USERNAME):
+        self.db = db
+        self.author_username = author_username
+
+    def refresh(self, conn=None):
+        """Intègre les nouveaux commentaires. Retourne le nombre de questions ajoutées."""
+        should_close = conn is None
+        if conn is None:
+            conn = self.db.get_connection()
+
+        last_rowid = int(self.db.get_state(self.STATE_KEY, 0, conn))
+        rows = conn.execute("""
+            SELECT rowid AS rid, comment_id, article_id, article_title, author_username,
+                   body_text, created_at, is_spam
+            FROM comments
+            WHERE rowid > ?
+            ORDER BY created_at
+        """, (last_rowid,)).fetchall()
+
+        added = 0
+        for row in rows:
+            if row['author_username'] == self.author_username:
+                self._record_reply(conn, row['article_id'], row['created_at'])
+            elif not row['is_spam'] and is_question(row['body_text']):
+                added += self._enqueue(conn, row)
+
+        if rows:
+            self.db.set_state(self.STATE_KEY, max(r['rid'] for r in rows), conn)
+
+        if should_close:
+            conn.commit()
+            conn.close()
+        return added
+
+    def _record_reply(self, conn, article_id, replied_at):
+        conn.execute("""
+            INSERT INTO author_replies (article_id, last_reply_at) VALUES (?, ?)
+            ON CONFLICT(article_id) DO UPDATE SET last_reply_at = MAX(last_reply_at, excluded.last_reply_at)
+        """, (article_id, replied_at))
+        conn.execute("""
+            UPDATE open_questions SET resolved_at = ?
+            WHERE article_id = ? AND resolved_at IS NULL AND created_at < ?
+        """, (replied_at, article_id, replied_at))
+
+    def _enqueue(self, conn, row):
+        # Une réponse de l'auteur postérieure a déjà pu être collectée
+        reply = conn.execute(
+            "SELECT last_reply_at FROM author_replies WHERE article_id = ?", (row['article_id'],)
+        ).fetchone()
+        resolved_at = reply['last_reply_at'] if reply and reply['last_reply_at'] > row['created_at'] else None
+
+        cursor = conn.execute("""
+            INSERT OR IGNORE INTO open_questions
+            (comment_id, article_id, article_title, author_username, created_at, resolved_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (row['comment_id'], row['article_id'], row['article_title'],
+              row['author_username'], row['created_at'], resolved_at))
+        return cursor.rowcount
+
+    def rebuild(self):
+        """Reconstruit la file depuis zéro (après un changement du détecteur)."""
+        conn = self.db.get_connection()
+        conn.execute("DELETE FROM open_questions")
+        conn.execute("DELETE FROM author_replies")
+        self.db.set_state(self.STATE_KEY, 0, conn)
+        added = self.refresh(conn)
+        conn.commit()
+        conn.close()
+        return added
+
+    def pending(self, conn=None):
+        """
+        Questions sans réponse, plus récentes d'abord.
+        CROSS JOIN : force le parcours de l'index partiel idx_open_questions_pending.
+        """
+        should_close = conn is None
+        if conn is None:
+            conn = self.db.get_connection()
+
+        rows = conn.execute("""
+            SELECT q.comment_id, q.article_title, q.author_username, c.body_text, q.created_at
+            FROM open_questions q
+            CROSS JOIN comments c ON c.comment_id = q.comment_id
+            WHERE q.resolved_at IS NULL AND c.is_spam = 0
+            ORDER BY q.created_at DESC
+        """).fetchall()
+
+        if should_close:
+            conn.close()
+        return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="File des questions sans réponse")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--author', default=AUTHOR_USERNAME, help="Username de l'auteur")
+    parser.add_argument('--rebuild', action='store_true', help='Reconstruit la file depuis zéro')
+    args = parser.parse_args()
+
+    queue = QuestionQueue(DatabaseManager(args.db), args.author)
+    added = queue.rebuild() if args.rebuild else queue.refresh()
+    print(f"✅ File des questions à jour ({added} ajoutées, {len(queue.pending())} en attente)")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+import threading
+import time
+
+class RateLimiter:
+    """
+    Limiteur de débit partagé entre threads : au plus `rate` appels par seconde.
+
+    Chaque appel à acquire() réserve le prochain créneau libre puis dort hors
+    du verrou, de sorte que N workers se répartissent le débit au lieu de
+    dormir chacun 0.5 s après leur requête.
+    """
+
+    def __init__(self, rate: float = 2.0):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def backoff(self, seconds: float):
+        """Repousse tous les créneaux (réponse 429 de l'API)."""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import typing
+from datetime import datetime, timezone
+from core.results import to_jsonable, from_jsonable
+
+# Incrémenté quand la forme des payloads change (les anciennes entrées deviennent inatteignables)
+CACHE_FORMAT = 3
+
+class ReportCache:
+    """
+    Cache des sections de rapport, persisté dans un fichier SQLite annexe.
+
+    Une entrée est identifiée par (format, section, paramètres, version des tables sources).
+    La version d'une table est son compteur dans table_versions, incrémenté par trigger
+    à chaque INSERT / UPDATE / DELETE (cf. DatabaseManager._create_version_triggers).
+    PRAGMA data_version sert à savoir quand ces versions doivent être relues.
+    """
+
+    def __init__(self, db_path: str, cache_path: str = None, max_entries: int = 200):
+        self.db_path = db_path
+        self.cache_path = cache_path or f"{os.path.splitext(db_path)[0]}.cache.db"
+        self.max_entries = max_entries
+        self._probe = None
+        self._data_version = None
+        self._table_versions = {}
+        self._lock = threading.Lock()
+        self._setup()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.cache_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _setup(self):
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS report_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    section TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL,
+                    last_used_at TIMESTAMP NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_report_cache_lru ON report_cache(last_used_at)")
+            conn.commit()
+
+    def data_versions(self, tables):
+        """Retourne la version courante de chaque table source."""
+        with self._lock:
+            return self._data_versions(tables)
+
+    def _data_versions(self, tables):
+        if self._probe is None:
+            self._probe = sqlite3.connect(self.db_path, check_same_thread=False)
+
+        # data_version change dès qu'une autre connexion a commité : on relit alors les tables
+        data_version = self._probe.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._table_versions = {}
+
+        missing = [table for table in tables if table not in self._table_versions]
+        if missing:
+            try:
+                self._table_versions.update(self._probe.execute(
+                    f"SELECT table_name, version FROM table_versions WHERE table_name IN ({','.join('?' * len(missing))})",
+                    missing
+                ).fetchall())
+            except sqlite3.OperationalError:
+                pass
+            for table in missing:
+                if table not in self._table_versions:
+                    # Table sans compteur (créée après les migrations de ce process) : le cache est ignoré
+                    self._table_versions[table] = None
+
+        return {table: self._table_versions[table] for table in sorted(tables)}
+
+    def make_key(self, section, params, tables):
+        """Clé de cache, ou None si une table source n'a pas de compteur (section non cachée)."""
+        versions = self.data_versions(tables)
+        if None in versions.values():
+            return None
+        raw = json.dumps([CACHE_FORMAT, section, params, versions], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = datetime.now(timezone.utc).isoformat()
+        with contextlib.closing(self._connect()) as conn:
+            row = conn.execute("SELECT payload FROM report_cache WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE report_cache SET last_used_at = ? WHERE cache_key = ?", (now, key))
+            conn.commit()
+            return row['payload']
+
+    def put(self, key, section, payload):
+        now = datetime.now(timezone.utc).isoformat()
+        with contextlib.closing(self._connect()) as conn:
+            # Les anciennes versions d'une même section deviennent inatteignables : l'éviction LRU les purge
+            conn.execute("""
+                INSERT OR REPLACE INTO report_cache (cache_key, section, payload, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key, section, payload, now, now))
+            conn.execute("""
+                DELETE FROM report_cache WHERE cache_key IN (
+                    SELECT cache_key FROM report_cache
+                    ORDER BY last_used_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            conn.commit()
+
+    def clear(self):
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("DELETE FROM report_cache")
+            conn.commit()
+
+def cached_section(name, tables, time_bucket=None):
+    """
+    Décorateur pour une méthode compute_* qui retourne un objet résultat.
+
+    Le résultat est stocké en JSON dans self.report_cache et reconstruit (via
+    l'annotation de retour) tant que les tables sources n'ont pas changé.
+    time_bucket (format strftime) ajoute l'heure courante à la clé pour les
+    sections qui dépendent de 'now'.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'report_cache', None)
+            if cache is None:
+                return method(self, *args, **kwargs)
+
+            params = {'args': args, 'kwargs': kwargs}
+            if time_bucket:
+                params['now'] = datetime.now(timezone.utc).strftime(time_bucket)
+            key = cache.make_key(name, params, tables)
+            if key is None:
+                return method(self, *args, **kwargs)
+
+            cached = cache.get(key)
+            if cached is not None:
+                return_type = typing.get_type_hints(method).get('return')
+                return from_jsonable(return_type, json.loads(cached))
+
+            result = method(self, *args, **kwargs)
+            cache.put(key, name, json.dumps(to_jsonable(result), ensure_ascii=False))
+            return result
+        return wrapper
+    return decorator
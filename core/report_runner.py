@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from core.database import read_only_connections
+
+class _ThreadRouter(io.TextIOBase):
+    """Remplace sys.stdout : chaque thread écrit dans son propre tampon s'il en a un."""
+
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def push(self, buffer):
+        self._stack().append(buffer)
+
+    def pop(self):
+        self._stack().pop()
+
+    def write(self, text):
+        stack = self._stack()
+        return (stack[-1] if stack else self.default).write(text)
+
+    def flush(self):
+        stack = self._stack()
+        (stack[-1] if stack else self.default).flush()
+
+@contextlib.contextmanager
+def capture_stdout():
+    """
+    Capture la sortie du thread courant dans un StringIO.
+    Sous ReportRunner, seul le thread appelant est redirigé ; sinon équivaut à redirect_stdout.
+    """
+    buffer = io.StringIO()
+    router = sys.stdout if isinstance(sys.stdout, _ThreadRouter) else None
+
+    if router is None:
+        with contextlib.redirect_stdout(buffer):
+            yield buffer
+    else:
+        router.push(buffer)
+        try:
+            yield buffer
+        finally:
+            router.pop()
+
+class ReportRunner:
+    """
+    Exécute des sections de rapport indépendantes dans un pool de threads.
+
+    Chaque section tourne avec des connexions SQLite en lecture seule (la base est
+    en WAL, sqlite relâche le GIL pendant les requêtes). La sortie de chaque section
+    est tamponnée puis émise dans l'ordre d'origine, dès que possible.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+
+    def _run_section(self, section):
+        with capture_stdout() as buffer, read_only_connections():
+            try:
+                result = section()
+            except Exception as e:
+                return buffer.getvalue(), None, e
+        return buffer.getvalue(), result, None
+
+    def run(self, sections):
+        """
+        sections : liste de callables sans argument (méthodes liées, lambdas).
+        Retourne la liste de leurs valeurs de retour, dans l'ordre.
+        """
+        if not sections:
+            return []
+
+        workers = self.max_workers or min(len(sections), (os.cpu_count() or 1) * 2)
+        if workers <= 1:
+            return [section() for section in sections]
+
+        results = []
+        original = sys.stdout
+        router = _ThreadRouter(original)
+        sys.stdout = router
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(self._run_section, section) for section in sections]
+                for future in futures:
+                    output, result, error = future.result()
+                    original.write(output)
+                    if error is not None:
+                        raise error
+                    results.append(result)
+        finally:
+            sys.stdout = original
+            original.flush()
+        return results
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Sérialisation des objets résultat des rapports (dataclasses à __slots__).
+
+Les méthodes compute_* retournent ces objets ; to_jsonable / from_jsonable
+permettent de les exporter en JSON et de les relire depuis le cache de rapports.
+"""
+import dataclasses
+import json
+import typing
+from datetime import date, datetime
+
+def to_jsonable(obj):
+    """Convertit récursivement un résultat en types JSON."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: to_jsonable(getattr(obj, f.name)) for f in dataclasses.fields(obj)}
+    if isinstance(obj, dict):
+        return {str(k): to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(v) for v in obj]
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return obj
+
+def from_jsonable(tp, data):
+    """Reconstruit un résultat à partir de sa forme JSON et de son annotation de type."""
+    if data is None:
+        return None
+
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+
+    if origin is typing.Union:
+        # Optional[X] : on prend le premier type non-None
+        inner = [a for a in args if a is not type(None)]
+        return from_jsonable(inner[0], data) if inner else data
+    if origin in (list, typing.List):
+        return [from_jsonable(args[0], v) for v in data] if args else list(data)
+    if origin in (dict, typing.Dict):
+        if not args:
+            return dict(data)
+        key_type, value_type = args
+        return {key_type(k): from_jsonable(value_type, v) for k, v in data.items()}
+    if dataclasses.is_dataclass(tp):
+        hints = typing.get_type_hints(tp)
+        return tp(**{
+            f.name: from_jsonable(hints[f.name], data.get(f.name))
+            for f in dataclasses.fields(tp) if f.name in data
+        })
+    return data
+
+def dump_json(results):
+    """Sérialise un ou plusieurs résultats (dict section -> résultat) en JSON lisible."""
+    return json.dumps(to_jsonable(results), ensure_ascii=False, indent=2)
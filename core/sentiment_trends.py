@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import List, Optional
+from core.database import DatabaseManager
+from core.results import dump_json
+
+# Seuils calibrés pour le score compound de VADER
+POSITIVE_THRESHOLD = 0.3
+NEGATIVE_THRESHOLD = -0.2
+
+def mood_for(score):
+    """Application des seuils calibrés"""
+    if score >= POSITIVE_THRESHOLD:
+        return "🌟 Positif"
+    elif score <= NEGATIVE_THRESHOLD:
+        return "😟 Négatif"
+    return "😐 Neutre"
+
+# Agrégats de sentiment_daily depuis comment_insights (hors spam), restreints par {where}
+_AGGREGATE = """
+    INSERT INTO sentiment_daily (article_id, day, n, mean, pos, neg, neu)
+    SELECT c.article_id, substr(c.created_at, 1, 10), COUNT(*), AVG(i.sentiment_score),
+           SUM(i.sentiment_score >= ?), SUM(i.sentiment_score <= ?),
+           SUM(i.sentiment_score > ? AND i.sentiment_score < ?)
+    FROM comment_insights i
+    JOIN comments c ON c.comment_id = i.comment_id
+    WHERE c.is_spam = 0 {where}
+    GROUP BY c.article_id, substr(c.created_at, 1, 10)
+"""
+_THRESHOLD_PARAMS = (POSITIVE_THRESHOLD, NEGATIVE_THRESHOLD, NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD)
+
+@dataclass(slots=True)
+class SentimentPoint:
+    day: str
+    n: int
+    mean: float
+    pos: int
+    neg: int
+    neu: int
+    rolling_n: int
+    rolling_mean: float
+
+@dataclass(slots=True)
+class ChangePoint:
+    day: str
+    mean_before: float
+    mean_after: float
+    n_before: int
+    n_after: int
+
+    @property
+    def shift(self):
+        return self.mean_after - self.mean_before
+
+class SentimentTrends:
+    """
+    Agrégats journaliers du sentiment par article (table sentiment_daily).
+
+    Chaque lot écrit dans comment_insights est ajouté aux agrégats au moment de
+    l'écriture (moyenne mise à jour incrémentalement) : les vues de tendance ne
+    relisent ni ne re-scorent jamais les commentaires. Un verdict spam modifié
+    après coup (SpamEngine.refresh) fait recalculer les seuls jours concernés.
+    """
+
+    # Les compteurs pos/neg/neu dépendent des seuils : un changement de seuil reconstruit l'agrégat
+    STATE_KEY = "sentiment_daily.thresholds"
+    THRESHOLDS = f"{POSITIVE_THRESHOLD}:{NEGATIVE_THRESHOLD}"
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def add(self, conn, results):
+        """Ajoute un lot de scores [(comment_id, score)] aux agrégats (sans commit)."""
+        if not results:
+            return
+        scores = dict(results)
+        ids = list(scores)
+
+        groups = defaultdict(list)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            for row in conn.execute(f"""
+                SELECT comment_id, article_id, substr(created_at, 1, 10) as day
+                FROM comments WHERE comment_id IN ({','.join('?' * len(chunk))})
+            """, chunk):
+                groups[(row['article_id'], row['day'])].append(scores[row['comment_id']])
+
+        conn.executemany("""
+            INSERT INTO sentiment_daily (article_id, day, n, mean, pos, neg, neu)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(article_id, day) DO UPDATE SET
+                mean = (mean * n + excluded.mean * excluded.n) / (n + excluded.n),
+                n = n + excluded.n,
+                pos = pos + excluded.pos,
+                neg = neg + excluded.neg,
+                neu = neu + excluded.neu
+        """, [
+            (article_id, day, len(values), sum(values) / len(values),
+             sum(1 for v in values if v >= POSITIVE_THRESHOLD),
+             sum(1 for v in values if v <= NEGATIVE_THRESHOLD),
+             sum(1 for v in values if NEGATIVE_THRESHOLD < v < POSITIVE_THRESHOLD))
+            for (article_id, day), values in groups.items()
+        ])
+
+    def rebuild(self, conn=None):
+        """Recalcule sentiment_daily depuis comment_insights (ré-analyse, première utilisation)."""
+        should_close = conn is None
+        if conn is None:
+            conn = self.db.get_connection()
+
+        conn.execute("DELETE FROM sentiment_daily")
+        # comment_insights est créée par NLPAnalyzer au premier lancement
+        if DatabaseManager._table_exists(conn, "comment_insights"):
+            conn.execute(_AGGREGATE.format(where=""), _THRESHOLD_PARAMS)
+        self.db.set_state(self.STATE_KEY, self.THRESHOLDS, conn)
+
+        if should_close:
+            conn.commit()
+            conn.close()
+
+    def recompute(self, conn, keys):
+        """
+        Recalcule les agrégats des (article_id, jour) donnés depuis comment_insights
+        (sans commit) : commentaires dont le verdict spam a changé après leur ajout.
+        """
+        keys = sorted({(article_id, day) for article_id, day in keys if day is not None})
+        if not keys:
+            return
+        conn.executemany("DELETE FROM sentiment_daily WHERE article_id = ? AND day = ?", keys)
+        if DatabaseManager._table_exists(conn, "comment_insights"):
+            conn.executemany(
+                _AGGREGATE.format(where="AND c.article_id = ? AND substr(c.created_at, 1, 10) = ?"),
+                [_THRESHOLD_PARAMS + key for key in keys]
+            )
+
+    def ensure_built(self):
+        """Construit les agrégats pour les scores déjà en base (première fois ou seuils modifiés)."""
+        if self.db.get_state(self.STATE_KEY) != self.THRESHOLDS:
+            self.rebuild()
+
+    # --- REQUÊTES ---
+
+    def compute_series(self, article_id: Optional[int] = None, window: int = 7) -> List[SentimentPoint]:
+        """Série journalière (un article ou tous) avec moyenne glissante sur `window` jours calendaires."""
+        where = "WHERE article_id = ?" if article_id is not None else ""
+        params = (article_id,) if article_id is not None else ()
+
+        conn = self.db.get_connection()
+        rows = conn.execute(f"""
+            SELECT day, n, mean, pos, neg, neu,
+                   SUM(n) OVER w as rolling_n,
+                   SUM(mean * n) OVER w / SUM(n) OVER w as rolling_mean
+            FROM (
+                SELECT day, SUM(n) as n, SUM(mean * n) / SUM(n) as mean,
+                       SUM(pos) as pos, SUM(neg) as neg, SUM(neu) as neu
+                FROM sentiment_daily
+                {where}
+                GROUP BY day
+            )
+            WINDOW w AS (ORDER BY julianday(day) RANGE BETWEEN ? PRECEDING AND CURRENT ROW)
+            ORDER BY day
+        """, params + (window - 1,)).fetchall()
+        conn.close()
+
+        return [SentimentPoint(*row) for row in rows]
+
+    def compute_change_points(self, article_id: Optional[int] = None, min_shift: float = 0.2,
+                              min_comments: int = 10, max_points: int = 5) -> List[ChangePoint]:
+        """
+        Ruptures de niveau du sentiment moyen (segmentation binaire sur la série journalière).
+        Une rupture est retenue si l'écart de moyenne dépasse min_shift avec au moins
+        min_comments commentaires de chaque côté.
+        """
+        series = self.compute_series(article_id, window=1)
+        points = []
+
+        def best_split(lo, hi):
+            total_n = sum(p.n for p in series[lo:hi])
+            total_s = sum(p.mean * p.n for p in series[lo:hi])
+            best = None
+            left_n, left_s = 0, 0.0
+            for k in range(lo, hi - 1):
+                left_n += series[k].n
+                left_s += series[k].mean * series[k].n
+                right_n = total_n - left_n
+                if left_n < min_comments or right_n < min_comments:
+                    continue
+                before, after = left_s / left_n, (total_s - left_s) / right_n
+                if abs(after - before) >= min_shift and (best is None or abs(after - before) > abs(best[1].shift)):
+                    best = (k + 1, ChangePoint(series[k + 1].day, before, after, left_n, right_n))
+            return best
+
+        segments = [(0, len(series))]
+        while segments and len(points) < max_points:
+            lo, hi = segments.pop()
+            found = best_split(lo, hi)
+            if found:
+                split, point = found
+                points.append(point)
+                segments.extend([(lo, split), (split, hi)])
+
+        return sorted(points, key=lambda p: p.day)
+
+    def render_trend(self, series: List[SentimentPoint], changes: List[ChangePoint], last_days: int = 30):
+        if not series:
+            print("❌ Pas encore de données de sentiment")
+            return
+
+        print(f"\n📈 TENDANCE DU SENTIMENT ({len(series)} jours avec commentaires)")
+        print("-" * 80)
+        for p in series[-last_days:]:
+            bar = "█" * int(abs(p.rolling_mean) * 20)
+            sign = "+" if p.rolling_mean >= 0 else "-"
+            print(f"{p.day}  n={p.n:<4} jour={p.mean:+.2f}  glissant={p.rolling_mean:+.2f} {sign}{bar}")
+
+        if changes:
+            print("\n⚡ RUPTURES DÉTECTÉES")
+            for c in changes:
+                arrow = "📈" if c.shift > 0 else "📉"
+                print(f"   {arrow} {c.day} : {c.mean_before:+.2f} → {c.mean_after:+.2f} "
+                      f"({c.n_before} / {c.n_after} commentaires)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tendance du sentiment des commentaires")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--article', type=int, help='Article ID (défaut : tous les articles)')
+    parser.add_argument('--window', type=int, default=7, help='Fenêtre glissante en jours')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Format de sortie')
+    args = parser.parse_args()
+
+    trends = SentimentTrends(DatabaseManager(args.db))
+    trends.ensure_built()
+    series = trends.compute_series(args.article, args.window)
+    changes = trends.compute_change_points(args.article)
+
+    if args.format == 'json':
+        print(dump_json({'series': series, 'change_points': changes}))
+    else:
+        trends.render_trend(series, changes)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from pathlib import Path
+from core.database import DatabaseManager
+from core.near_duplicates import NearDuplicateIndex
+from core.sentiment_trends import SentimentTrends
+
+DEFAULT_RULES = Path(__file__).resolve().parent.parent / "spam_rules.json"
+
+_LINK = re.compile(r"<a\s", re.IGNORECASE)
+
+class SpamEngine:
+    """
+    Classifieur de spam piloté par spam_rules.json.
+
+    Les mots-clés sont compilés en une seule regex d'alternance ; les autres
+    signaux (motifs répétés, densité de liens, historique de l'auteur, vague de
+    quasi-doublons postés par plusieurs auteurs) ajoutent leur poids au score. Verdict : score >= threshold.
+    Le verdict est stocké dans comments.spam_score / comments.is_spam ; un
+    changement du fichier de règles (hash dans sync_state) déclenche un re-score complet.
+    """
+
+    STATE_KEY = "spam.rules_hash"
+
+    def __init__(self, rules_path=None):
+        self.rules_path = Path(rules_path or DEFAULT_RULES)
+        raw = self.rules_path.read_text(encoding="utf-8")
+        self.rules = json.loads(raw)
+        self.rules_hash = hashlib.sha256(
+            json.dumps(self.rules, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        self.threshold = self.rules.get("threshold", 1.0)
+        keywords = self.rules.get("keywords", {})
+        terms = sorted(keywords.get("terms", []), key=len, reverse=True)
+        self.keyword_weight = keywords.get("weight", 1.0)
+        self.keyword_re = re.compile("|".join(map(re.escape, terms)), re.IGNORECASE) if terms else None
+        self.patterns = [
+            (p["name"], re.compile(p["regex"], re.IGNORECASE), p.get("weight", 1.0), p.get("min_count", 1))
+            for p in self.rules.get("patterns", [])
+        ]
+        self.link_rule = self.rules.get("link_density")
+        self.author_rule = self.rules.get("author_history")
+        self.duplicate_rule = self.rules.get("near_duplicate")
+
+    def score(self, text, html="", author_prior_spam=0, cluster=None):
+        """Retourne (score, signaux déclenchés). cluster : (taille, auteurs distincts) ou None."""
+        text = text or ""
+        score = 0.0
+        signals = []
+
+        if self.keyword_re and self.keyword_re.search(text):
+            score += self.keyword_weight
+            signals.append("keyword")
+
+        for name, regex, weight, min_count in self.patterns:
+            if len(regex.findall(text)) >= min_count:
+                score += weight
+                signals.append(name)
+
+        if self.link_rule and html:
+            links = len(_LINK.findall(html))
+            words = max(len(text.split()), 1)
+            if links and links * 100 / words > self.link_rule.get("max_links_per_100_words", 5):
+                score += self.link_rule.get("weight", 0.5)
+                signals.append("link_density")
+
+        if self.author_rule and author_prior_spam:
+            score += self.author_rule.get("weight", 0.5)
+            signals.append("author_history")
+
+        if self.duplicate_rule and cluster:
+            size, authors = cluster
+            if size >= self.duplicate_rule.get("min_cluster", 3) and authors >= self.duplicate_rule.get("min_authors", 2):
+                score += self.duplicate_rule.get("weight", 1.0)
+                signals.append("near_duplicate")
+
+        return score, signals
+
+    def is_spam_text(self, text, html="", author_prior_spam=0, cluster=None):
+        return self.score(text, html, author_prior_spam, cluster)[0] >= self.threshold
+
+    def refresh(self, db: DatabaseManager, rescore=False, batch_size=1000):
+        """
+        Score les commentaires sans verdict ; tous si les règles ont changé (ou rescore).
+        Les commentaires sont traités par date : l'historique d'un auteur ne
+        compte que ses commentaires antérieurs déjà classés spam (jamais l'ancien
+        verdict du commentaire re-scoré, ni ses commentaires postérieurs).
+        Retourne le nombre de commentaires scorés.
+        """
+        conn = db.get_connection()
+        rescore = rescore or db.get_state(self.STATE_KEY, conn=conn) != self.rules_hash
+
+        clusters = {}
+        if self.duplicate_rule:
+            index = NearDuplicateIndex.from_rules(db, self.duplicate_rule)
+            touched = index.refresh(conn)
+            if touched and not rescore:
+                # Un cluster qui grossit peut faire basculer ses anciens membres
+                conn.execute(f"""
+                    UPDATE comments SET spam_score = NULL
+                    WHERE comment_id IN (
+                        SELECT comment_id FROM comment_clusters
+                        WHERE cluster_id IN ({','.join('?' * len(touched))})
+                    )
+                """, tuple(touched))
+            clusters = index.cluster_stats(conn)
+
+        # Historique de l'auteur : spams déjà scorés, triés comme le parcours ci-dessous.
+        # Les commentaires à (re)scorer ont spam_score NULL : leur ancien verdict n'est pas compté.
+        prior_spam = defaultdict(list)
+        if not rescore:
+            for row in conn.execute("""
+                SELECT author_username, COALESCE(created_at, '') AS created_at, comment_id FROM comments
+                WHERE is_spam = 1 AND spam_score IS NOT NULL
+                ORDER BY created_at, comment_id
+            """):
+                prior_spam[row['author_username']].append((row['created_at'], row['comment_id']))
+        flagged = Counter()
+
+        where = "" if rescore else "WHERE spam_score IS NULL"
+        rows = conn.execute(f"""
+            SELECT comment_id, article_id, author_username, COALESCE(created_at, '') AS created_at,
+                   substr(comments.created_at, 1, 10) AS day, body_text, body_html, is_spam
+            FROM comments {where}
+            ORDER BY created_at, comment_id
+        """).fetchall()
+
+        updates, flipped = [], []
+        for row in rows:
+            author = row['author_username']
+            # Spams antérieurs : déjà scorés avant ce commentaire, ou classés plus tôt dans ce parcours
+            history = bisect_left(prior_spam[author], (row['created_at'], row['comment_id'])) + flagged[author]
+            score, _ = self.score(row['body_text'], row['body_html'], history, clusters.get(row['comment_id']))
+            spam = score >= self.threshold
+            if spam:
+                flagged[author] += 1
+            updates.append((score, int(spam), row['comment_id']))
+            if int(spam) != (row['is_spam'] or 0):
+                flipped.append((row['article_id'], row['day']))
+
+        for i in range(0, len(updates), batch_size):
+            conn.executemany(
+                "UPDATE comments SET spam_score = ?, is_spam = ? WHERE comment_id = ?",
+                updates[i:i + batch_size]
+            )
+        # Verdict modifié après l'ajout du score à sentiment_daily : agrégats du jour recalculés
+        SentimentTrends(db).recompute(conn, flipped)
+        db.set_state(self.STATE_KEY, self.rules_hash, conn)
+        conn.commit()
+        conn.close()
+        return len(updates)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classement spam des commentaires")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--rules', help='Fichier de règles (défaut : spam_rules.json)')
+    parser.add_argument('--rescore', action='store_true', help='Re-score tous les commentaires')
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    scored = SpamEngine(args.rules).refresh(db, rescore=args.rescore)
+    conn = db.get_connection()
+    spam = conn.execute("SELECT COUNT(*) FROM comments WHERE is_spam = 1").fetchone()[0]
+    conn.close()
+    print(f"✅ {scored} commentaires scorés ({spam} spam au total)")
@@ -1,10 +1,43 @@
 #!/usr/bin/env python3
+import argparse
+import hashlib
 import json
 import re
 from collections import Counter
+from dataclasses import dataclass
+from typing import List
 from core.database import DatabaseManager
+from core.daily_rollup import DailyRollup
+from core.results import dump_json
+
+@dataclass(slots=True)
+class ThemeStats:
+    theme: str
+    count: int
+    views: int
+    reactions: int
+
+@dataclass(slots=True)
+class AuthorDNA:
+    themes: List[ThemeStats]
+    best_engagement_theme: str
+    best_visibility_theme: str
 
 class TopicIntelligence:
+    """
+    Classement thématique des articles, persisté dans article_themes.
+
+    Les mots-clés sont compilés en index inversé token -> thèmes (correspondance
+    sur mots entiers). Un article n'est reclassé que si son titre ou ses tags
+    ont changé dans article_history, ou si la définition des thèmes a changé.
+    """
+
+    STATE_HISTORY = "topic.last_history_id"
+    STATE_THEMES = "topic.themes_hash"
+    DEFAULT_THEME = "Free Exploration"
+
+    _TOKEN = re.compile(r"[a-z0-9+#]+")
+
     def __init__(self, db_path="devto_metrics.db"):
         self.db = DatabaseManager(db_path)
         # Defining your areas of expertise (your DNA)
@@ -13,57 +46,139 @@ class TopicIntelligence:
             "Human & Career": ["cv", "career", "feedback", "developer", "learning", "growth"],
             "Culture & Agile": ["agile", "scrum", "performance", "theater", "laziness", "management"]
         }
+        self._index = {}
+        for theme, keywords in self.themes.items():
+            for kw in keywords:
+                self._index.setdefault(kw.lower(), []).append(theme)
+        self.themes_hash = hashlib.sha256(json.dumps(self.themes, sort_keys=True).encode("utf-8")).hexdigest()
 
     def _get_article_theme(self, title, tags):
         """Identifie le thème dominant d'un article."""
-        text = (title + " " + tags).lower()
-        scores = {theme: 0 for theme in self.themes}
-        
-        for theme, keywords in self.themes.items():
-            for kw in keywords:
-                if kw in text:
-                    scores[theme] += 1
-        
-        # We return the theme with the most matches, or 'Other'
-        max_theme = max(scores, key=scores.get)
-        return max_theme if scores[max_theme] > 0 else "Free Exploration"
+        tokens = set(self._TOKEN.findall(f"{title or ''} {tags or ''}".lower()))
+        scores = Counter()
+        for token in tokens:
+            for theme in self._index.get(token, ()):
+                scores[theme] += 1
 
-    def analyze_dna(self):
-        """Génère le miroir d'impact de ton contenu."""
+        if not scores:
+            return self.DEFAULT_THEME
+        # We return the theme with the most matches (first declared on ties)
+        return max(self.themes, key=lambda theme: scores[theme])
+
+    def refresh_themes(self, conn=None):
+        """Met à jour article_themes. Retourne le nombre d'articles (re)classés."""
+        should_close = conn is None
+        if conn is None:
+            conn = self.db.get_connection()
+
+        # Snapshots pas encore reportés dans article_latest
+        DailyRollup(self.db).refresh(conn)
+
+        if self.db.get_state(self.STATE_THEMES, conn=conn) != self.themes_hash:
+            conn.execute("DELETE FROM article_themes")
+            self.db.set_state(self.STATE_HISTORY, 0, conn)
+
+        last_id = int(self.db.get_state(self.STATE_HISTORY, 0, conn))
+
+        # Articles modifiés depuis le dernier passage : dernière version connue
+        changed = conn.execute("""
+            SELECT h.id, h.article_id, h.title, h.tags
+            FROM article_history h
+            JOIN (
+                SELECT article_id, MAX(id) as id FROM article_history
+                WHERE id > ? GROUP BY article_id
+            ) last ON last.id = h.id
+        """, (last_id,)).fetchall()
+
+        # Articles jamais classés
+        unseen = conn.execute("""
+            SELECT l.article_id, l.title, l.tags
+            FROM article_latest l
+            LEFT JOIN article_themes t ON t.article_id = l.article_id
+            WHERE t.article_id IS NULL
+        """).fetchall()
+
+        rows = {r['article_id']: (r['title'], r['tags']) for r in unseen}
+        rows.update((r['article_id'], (r['title'], r['tags'])) for r in changed)
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO article_themes (article_id, theme, title, tags, classified_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, [
+            (article_id, self._get_article_theme(title, tags), title, tags)
+            for article_id, (title, tags) in rows.items()
+        ])
+
+        if changed:
+            self.db.set_state(self.STATE_HISTORY, max(r['id'] for r in changed), conn)
+        self.db.set_state(self.STATE_THEMES, self.themes_hash, conn)
+
+        if should_close:
+            conn.commit()
+            conn.close()
+        return len(rows)
+
+    def compute_dna(self, refresh=True) -> AuthorDNA:
+        """Agrège vues et réactions par axe thématique (refresh=False : lecture seule des labels)."""
+        if refresh:
+            self.refresh_themes()
         conn = self.db.get_connection()
-        articles = conn.execute("""
-            SELECT article_id, title, tags, MAX(views) as views, MAX(reactions) as reactions 
-            FROM article_metrics GROUP BY article_id
+        totals = conn.execute("""
+            SELECT t.theme, COUNT(*) as count,
+                   COALESCE(SUM(l.views), 0) as views, COALESCE(SUM(l.reactions), 0) as reactions
+            FROM article_themes t
+            JOIN article_latest l ON l.article_id = t.article_id
+            GROUP BY t.theme
         """).fetchall()
+        conn.close()
 
         dna_report = {theme: {"count": 0, "views": 0, "reactions": 0} for theme in self.themes}
-        dna_report["Free Exploration"] = {"count": 0, "views": 0, "reactions": 0}
+        dna_report[self.DEFAULT_THEME] = {"count": 0, "views": 0, "reactions": 0}
 
-        for art in articles:
-            theme = self._get_article_theme(art['title'], art['tags'] or "")
-            dna_report[theme]["count"] += 1
-            dna_report[theme]["views"] += art['views']
-            dna_report[theme]["reactions"] += art['reactions']
+        for row in totals:
+            if row['theme'] in dna_report:
+                dna_report[row['theme']] = {"count": row['count'], "views": row['views'], "reactions": row['reactions']}
+
+        # Best engagement
+        best_engage = max(dna_report, key=lambda x: (dna_report[x]['reactions']/dna_report[x]['views'] if dna_report[x]['views'] > 0 else 0))
+        # Best views
+        best_views = max(dna_report, key=lambda x: (dna_report[x]['views']/dna_report[x]['count'] if dna_report[x]['count'] > 0 else 0))
 
+        return AuthorDNA(
+            themes=[ThemeStats(theme, s['count'], s['views'], s['reactions']) for theme, s in dna_report.items()],
+            best_engagement_theme=best_engage,
+            best_visibility_theme=best_views,
+        )
+
+    def render_dna(self, dna: AuthorDNA):
+        """Affiche le miroir d'impact de ton contenu."""
         print("\n" + "🧬" + " --- AUTHOR CONTENT DNA (MIRROR REPORT) ---")
         print("=" * 80)
         print(f"{'Thematic Axis':<25} {'Articles':<10} {'Avg Views':<12} {'Engagement %':<12}")
         print("-" * 80)
 
-        for theme, stats in dna_report.items():
-            if stats['count'] > 0:
-                avg_views = stats['views'] / stats['count']
-                engage = (stats['reactions'] / stats['views'] * 100) if stats['views'] > 0 else 0
-                print(f"{theme:<25} {stats['count']:<10} {avg_views:<12.0f} {engage:<12.2f}%")
+        for stats in dna.themes:
+            if stats.count > 0:
+                avg_views = stats.views / stats.count
+                engage = (stats.reactions / stats.views * 100) if stats.views > 0 else 0
+                print(f"{stats.theme:<25} {stats.count:<10} {avg_views:<12.0f} {engage:<12.2f}%")
 
         print("\n💡 PRAGMATIC INTERPRETATION:")
-        # Best engagement
-        best_engage = max(dna_report, key=lambda x: (dna_report[x]['reactions']/dna_report[x]['views'] if dna_report[x]['views'] > 0 else 0))
-        print(f"👉 Your community engages most intensely with the '{best_engage}' axis.")
-        
-        # Best views
-        best_views = max(dna_report, key=lambda x: (dna_report[x]['views']/dna_report[x]['count'] if dna_report[x]['count'] > 0 else 0))
-        print(f"👉 The '{best_views}' axis is your strongest driver for raw visibility.")
+        print(f"👉 Your community engages most intensely with the '{dna.best_engagement_theme}' axis.")
+        print(f"👉 The '{dna.best_visibility_theme}' axis is your strongest driver for raw visibility.")
+
+    def analyze_dna(self):
+        """Génère le miroir d'impact de ton contenu."""
+        self.render_dna(self.compute_dna())
 
 if __name__ == "__main__":
-    TopicIntelligence().analyze_dna()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Author content DNA")
+    parser.add_argument('--db', default='devto_metrics.db', help='Path to database')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
+    args = parser.parse_args()
+
+    analyzer = TopicIntelligence(args.db)
+    if args.format == 'json':
+        print(dump_json(analyzer.compute_dna()))
+    else:
+        analyzer.analyze_dna()
\ No newline at end of file
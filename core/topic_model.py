@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Topic modeling incrémental sur le contenu des articles et les commentaires.
+
+Le vocabulaire (topic_terms) et l'inventaire des documents (topic_documents)
+sont en base ; la matrice de comptage (scipy CSR) et le modèle entraîné sont
+persistés à côté de la base (<db>.topics.npz / <db>.topics.pkl).
+Un passage ne tokenise que les documents nouveaux ou modifiés : le TF-IDF est
+recalculé à partir des comptages, sans relire le corpus.
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from scipy import sparse
+from scipy.special import psi
+from sklearn.decomposition import NMF, LatentDirichletAllocation
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from sklearn.preprocessing import normalize
+
+from core.database import DatabaseManager
+from core.results import dump_json
+
+_FENCE = re.compile(r"```.*?```|~~~.*?~~~", re.DOTALL)
+_INLINE_CODE = re.compile(r"`[^`\n]*`")
+_LIQUID = re.compile(r"\{%.*?%\}", re.DOTALL)
+_MD_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_URL = re.compile(r"(https?://|www\.)\S+", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_TOKEN = re.compile(r"[a-z][a-z0-9+#]+")
+
+def markdown_to_text(markdown):
+    """Texte d'un article markdown sans blocs de code, liens bruts ni balises."""
+    text = _FENCE.sub(" ", markdown or "")
+    text = _INLINE_CODE.sub(" ", text)
+    text = _LIQUID.sub(" ", text)
+    text = _MD_LINK.sub(r"\1", text)
+    text = _URL.sub(" ", text)
+    return _TAG.sub(" ", text)
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall((text or "").lower()) if len(t) > 2 and t not in ENGLISH_STOP_WORDS]
+
+@dataclass(slots=True)
+class Topic:
+    topic: int
+    terms: List[str]
+    documents: int
+
+class TopicModel:
+    """
+    Maintient la matrice documents x termes et les poids de topics par document.
+
+    refresh() intègre les nouveaux documents et les projette sur les topics
+    existants ; le modèle est ré-entraîné (à chaud) quand le corpus a grossi de
+    plus de refit_ratio depuis le dernier entraînement, ou à la demande.
+    """
+
+    METHODS = ("nmf", "lda")
+    STATE_FITTED_DOCS = "topics.fitted_docs"
+
+    def __init__(self, db: DatabaseManager, n_topics=8, method="nmf", refit_ratio=0.2):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown topic method: {method}")
+        self.db = db
+        self.n_topics = n_topics
+        self.method = method
+        self.refit_ratio = refit_ratio
+        base = os.path.splitext(db.db_path)[0]
+        self.matrix_path = f"{base}.topics.npz"
+        self.model_path = f"{base}.topics.pkl"
+
+    # --- PERSISTANCE ---
+
+    def _load_matrix(self, n_terms):
+        if not os.path.exists(self.matrix_path):
+            return sparse.csr_matrix((0, n_terms), dtype=np.float32), []
+        data = np.load(self.matrix_path)
+        counts = sparse.csr_matrix(
+            (data['data'], data['indices'], data['indptr']), shape=tuple(data['shape'])
+        )
+        return counts, data['doc_ids'].tolist()
+
+    def _save_matrix(self, counts, doc_ids):
+        np.savez(
+            self.matrix_path, data=counts.data, indices=counts.indices, indptr=counts.indptr,
+            shape=np.array(counts.shape), doc_ids=np.array(doc_ids, dtype=np.int64)
+        )
+
+    def _load_model(self):
+        if not os.path.exists(self.model_path):
+            return None
+        with open(self.model_path, "rb") as f:
+            state = pickle.load(f)
+        # Un modèle d'une autre méthode ou taille est ignoré (ré-entraînement complet)
+        if state['method'] != self.method or state['n_topics'] != self.n_topics:
+            return None
+        return state['model']
+
+    def _save_model(self, model):
+        with open(self.model_path, "wb") as f:
+            pickle.dump({'method': self.method, 'n_topics': self.n_topics, 'model': model}, f)
+
+    def reset(self):
+        """Oublie le corpus indexé et le modèle (prochain refresh : reconstruction complète)."""
+        conn = self.db.get_connection()
+        for table in ("doc_topics", "topics", "topic_documents", "topic_terms"):
+            conn.execute(f"DELETE FROM {table}")
+        self.db.set_state(self.STATE_FITTED_DOCS, 0, conn)
+        conn.commit()
+        conn.close()
+        for path in (self.matrix_path, self.model_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # --- DOCUMENTS ---
+
+    def _pending_documents(self, conn):
+        """
+        Documents nouveaux ou dont le contenu a changé : (source, source_id, texte, empreinte).
+
+        Articles : l'empreinte est article_content.body_hash (sha1 du markdown), comparée
+        en SQL ; seuls les articles modifiés sont relus et convertis en texte.
+        """
+        result = []
+        if DatabaseManager._table_exists(conn, "article_content"):
+            for row in conn.execute("""
+                SELECT ac.article_id, ac.body_markdown, ac.body_hash, d.content_hash FROM article_content ac
+                LEFT JOIN topic_documents d ON d.source = 'article' AND d.source_id = CAST(ac.article_id AS TEXT)
+                WHERE d.doc_id IS NULL OR ac.body_hash IS NULL OR d.content_hash IS NOT ac.body_hash
+            """):
+                markdown = row['body_markdown'] or ""
+                # body_hash absent (lignes antérieures à la colonne) : calculé ici
+                digest = row['body_hash'] or hashlib.sha1(markdown.encode("utf-8")).hexdigest()
+                if row['content_hash'] != digest:
+                    result.append(("article", str(row['article_id']), markdown_to_text(markdown), digest))
+
+        # Commentaires : nouveaux, ou édités (insert_comment réécrit body_text / body_hash)
+        if DatabaseManager._table_exists(conn, "comments"):
+            for row in conn.execute("""
+                SELECT c.comment_id, c.body_text, c.body_hash, d.content_hash FROM comments c
+                LEFT JOIN topic_documents d ON d.source = 'comment' AND d.source_id = c.comment_id
+                WHERE c.is_spam = 0 AND (d.doc_id IS NULL OR c.body_hash IS NULL OR d.content_hash IS NOT c.body_hash)
+            """):
+                text = row['body_text'] or ""
+                digest = row['body_hash'] or hashlib.sha1(text.encode("utf-8")).hexdigest()
+                if row['content_hash'] != digest:
+                    result.append(("comment", row['comment_id'], text, digest))
+        return result
+
+    def _spam_documents(self, conn):
+        """doc_id des commentaires indexés puis classés spam par SpamEngine."""
+        if not DatabaseManager._table_exists(conn, "comments"):
+            return []
+        return [r[0] for r in conn.execute("""
+            SELECT d.doc_id FROM topic_documents d
+            JOIN comments c ON d.source = 'comment' AND d.source_id = c.comment_id
+            WHERE c.is_spam = 1
+        """)]
+
+    def _ingest(self, conn):
+        """
+        Tokenise les documents en attente, retire les commentaires devenus spam et met à
+        jour la matrice. Retourne (comptages, doc_id, doc_id ajoutés, nombre de retirés).
+        """
+        if not os.path.exists(self.matrix_path):
+            # Matrice absente (première passe ou fichier supprimé) : tout est réindexé
+            for table in ("doc_topics", "topic_documents", "topic_terms"):
+                conn.execute(f"DELETE FROM {table}")
+            # Vocabulaire renuméroté : l'ancien modèle ne correspond plus aux colonnes
+            if os.path.exists(self.model_path):
+                os.remove(self.model_path)
+            self.db.set_state(self.STATE_FITTED_DOCS, 0, conn)
+
+        vocab = {r['term']: r['term_id'] for r in conn.execute("SELECT term_id, term FROM topic_terms")}
+        counts, doc_ids = self._load_matrix(len(vocab))
+        if counts.shape[0] != len(doc_ids) or counts.shape[1] > len(vocab):
+            raise RuntimeError(f"{self.matrix_path} is out of sync with the database, run with --reset")
+
+        removed = self._spam_documents(conn)
+        for table in ("doc_topics", "topic_documents"):
+            conn.executemany(f"DELETE FROM {table} WHERE doc_id = ?", [(d,) for d in removed])
+
+        pending = self._pending_documents(conn)
+        if not pending and not removed:
+            return counts, doc_ids, [], 0
+
+        new_terms = []
+        rows, cols, values = [], [], []
+        new_doc_ids = []
+        for i, (source, source_id, text, digest) in enumerate(pending):
+            freqs = {}
+            for token in tokenize(text):
+                term_id = vocab.get(token)
+                if term_id is None:
+                    term_id = vocab[token] = len(vocab)
+                    new_terms.append((term_id, token))
+                freqs[term_id] = freqs.get(term_id, 0) + 1
+            rows.extend([i] * len(freqs))
+            cols.extend(freqs)
+            values.extend(freqs.values())
+
+            cursor = conn.execute("""
+                INSERT INTO topic_documents (source, source_id, content_hash) VALUES (?, ?, ?)
+                ON CONFLICT(source, source_id) DO UPDATE SET content_hash = excluded.content_hash
+                RETURNING doc_id
+            """, (source, source_id, digest))
+            new_doc_ids.append(cursor.fetchone()[0])
+
+        conn.executemany("INSERT INTO topic_terms (term_id, term) VALUES (?, ?)", new_terms)
+
+        # Les documents modifiés remplacent leur ancienne ligne ; les spams sont retirés
+        replaced = set(new_doc_ids) | set(removed)
+        keep = [i for i, doc_id in enumerate(doc_ids) if doc_id not in replaced]
+        counts = counts[keep] if len(keep) != len(doc_ids) else counts
+        doc_ids = [doc_ids[i] for i in keep]
+
+        counts.resize((counts.shape[0], len(vocab)))
+        added = sparse.csr_matrix(
+            (np.array(values, dtype=np.float32), (rows, cols)), shape=(len(pending), len(vocab))
+        )
+        counts = sparse.vstack([counts, added], format="csr")
+        doc_ids = doc_ids + new_doc_ids
+        self._save_matrix(counts, doc_ids)
+        return counts, doc_ids, new_doc_ids, len(removed)
+
+    # --- MODÈLE ---
+
+    @staticmethod
+    def tfidf(counts):
+        """TF-IDF lissé (même formule que sklearn) calculé depuis les comptages."""
+        n_docs = counts.shape[0]
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+        return normalize(counts.multiply(idf).tocsr())
+
+    def _features(self, counts):
+        # LDA travaille sur les comptages bruts, NMF sur le TF-IDF
+        return counts if self.method == "lda" else self.tfidf(counts)
+
+    def _widen(self, model, n_terms):
+        """Étend un modèle existant aux termes apparus depuis son entraînement."""
+        extra = n_terms - model.components_.shape[1]
+        if extra <= 0:
+            return model
+        if self.method == "lda":
+            prior = model.topic_word_prior_
+            model.components_ = np.hstack([model.components_, np.full((self.n_topics, extra), prior)])
+            model.exp_dirichlet_component_ = np.exp(
+                psi(model.components_) - psi(model.components_.sum(axis=1))[:, np.newaxis]
+            )
+        else:
+            model.components_ = np.hstack([model.components_, np.zeros((self.n_topics, extra))])
+        model.n_features_in_ = n_terms
+        return model
+
+    def _fit(self, model, counts, new_rows):
+        """Entraînement à chaud : les topics précédents servent de point de départ."""
+        features = self._features(counts)
+        if self.method == "lda":
+            if model is None:
+                model = LatentDirichletAllocation(
+                    n_components=self.n_topics, learning_method="online", random_state=0
+                )
+                model.fit(features)
+            else:
+                # Mise à jour en ligne sur les seuls nouveaux documents
+                model.partial_fit(features[new_rows] if new_rows else features)
+            return model, model.transform(features)
+
+        if model is None:
+            model = NMF(n_components=self.n_topics, init="nndsvda", max_iter=400, random_state=0)
+            return model, model.fit_transform(features)
+
+        H = np.maximum(model.components_, 1e-6).astype(features.dtype)
+        W = np.maximum(model.transform(features), 1e-6).astype(features.dtype)
+        model = NMF(n_components=self.n_topics, init="custom", max_iter=200, random_state=0)
+        return model, model.fit_transform(features, W=W, H=H)
+
+    def refresh(self, refit=False):
+        """Intègre les nouveaux documents. Retourne (documents ajoutés, ré-entraîné ?)."""
+        conn = self.db.get_connection()
+        counts, doc_ids, new_doc_ids, removed = self._ingest(conn)
+        conn.commit()
+
+        if not doc_ids or counts.shape[0] < self.n_topics or not counts.shape[1]:
+            conn.close()
+            return len(new_doc_ids), False
+
+        model = self._load_model()
+        if model is not None:
+            model = self._widen(model, counts.shape[1])
+
+        fitted_docs = int(self.db.get_state(self.STATE_FITTED_DOCS, 0, conn))
+        # Des spams retirés pèsent encore sur les topics : ré-entraînement (à chaud)
+        refit = refit or model is None or removed > 0 or len(doc_ids) > fitted_docs * (1 + self.refit_ratio)
+
+        if refit:
+            new_set = set(new_doc_ids)
+            new_rows = [i for i, doc_id in enumerate(doc_ids) if doc_id in new_set]
+            model, weights = self._fit(model, counts, new_rows)
+            targets = doc_ids
+            self._save_topics(conn, model)
+            self.db.set_state(self.STATE_FITTED_DOCS, len(doc_ids), conn)
+        elif new_doc_ids:
+            # Projection des seuls nouveaux documents sur les topics existants
+            rows = slice(len(doc_ids) - len(new_doc_ids), None)
+            weights = model.transform(self._features(counts)[rows])
+            targets = new_doc_ids
+            conn.executemany("DELETE FROM doc_topics WHERE doc_id = ?", [(d,) for d in targets])
+        else:
+            conn.close()
+            return 0, False
+
+        self._save_model(model)
+        conn.executemany(
+            "INSERT OR REPLACE INTO doc_topics (doc_id, topic, weight) VALUES (?, ?, ?)",
+            [
+                (doc_id, topic, float(w))
+                for doc_id, row in zip(targets, weights)
+                for topic, w in enumerate(row) if w > 0
+            ]
+        )
+        conn.commit()
+        conn.close()
+        return len(new_doc_ids), refit
+
+    def _save_topics(self, conn, model, top_n=10):
+        terms = {r['term_id']: r['term'] for r in conn.execute("SELECT term_id, term FROM topic_terms")}
+        conn.execute("DELETE FROM topics")
+        conn.execute("DELETE FROM doc_topics")
+        conn.executemany(
+            "INSERT INTO topics (topic, top_terms, method, fitted_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+            [
+                (topic, json.dumps([terms[i] for i in np.argsort(row)[::-1][:top_n]]), self.method)
+                for topic, row in enumerate(model.components_)
+            ]
+        )
+
+    # --- RAPPORT ---
+
+    def compute_topics(self) -> List[Topic]:
+        """Topics avec leurs termes principaux et le nombre de documents dominés."""
+        conn = self.db.get_connection()
+        rows = conn.execute("""
+            SELECT t.topic, t.top_terms, COUNT(d.doc_id) as documents
+            FROM topics t
+            LEFT JOIN (
+                SELECT doc_id, topic, ROW_NUMBER() OVER (PARTITION BY doc_id ORDER BY weight DESC) as rn
+                FROM doc_topics
+            ) d ON d.topic = t.topic AND d.rn = 1
+            GROUP BY t.topic
+            ORDER BY documents DESC
+        """).fetchall()
+        conn.close()
+        return [Topic(r['topic'], json.loads(r['top_terms']), r['documents']) for r in rows]
+
+    def render_topics(self, topics: List[Topic]):
+        if not topics:
+            print("❌ Pas encore de topics (corpus trop petit ?)")
+            return
+
+        print(f"\n🧠 TOPICS ({self.method.upper()})")
+        print("=" * 80)
+        for t in topics:
+            print(f"#{t.topic:<3} {t.documents:>5} docs  {', '.join(t.terms)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Topic modeling incrémental (articles + commentaires)")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--method', choices=TopicModel.METHODS, default='nmf', help='Algorithme de topics')
+    parser.add_argument('--topics', type=int, default=8, help='Nombre de topics')
+    parser.add_argument('--refit', action='store_true', help='Force un ré-entraînement (à chaud)')
+    parser.add_argument('--reset', action='store_true', help='Reconstruit le corpus et le modèle depuis zéro')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
+    args = parser.parse_args()
+
+    model = TopicModel(DatabaseManager(args.db), n_topics=args.topics, method=args.method)
+    if args.reset:
+        model.reset()
+    added, refitted = model.refresh(refit=args.refit)
+
+    if args.format == 'json':
+        print(dump_json(model.compute_topics()))
+    else:
+        print(f"✅ {added} nouveaux documents indexés{' (modèle ré-entraîné)' if refitted else ''}")
+        model.render_topics(model.compute_topics())
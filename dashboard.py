@@ -6,52 +6,154 @@ Un dashboard complet pour comprendre votre impact réel
 
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import List, Optional
 import argparse
 import re
 from core.database import DatabaseManager
-from core.topic_intelligence import TopicIntelligence
+from core.topic_intelligence import TopicIntelligence, AuthorDNA
+from core.daily_rollup import DailyRollup
+from core.insights import InsightEngine
+from core.report_cache import ReportCache, cached_section
+from core.report_runner import ReportRunner
+from core.results import dump_json
+
+# --- RÉSULTATS ---
+
+@dataclass(slots=True)
+class ArticleGrowth:
+    duration_seconds: float
+    views: int
+    reactions: int
+    comments: int
+
+@dataclass(slots=True)
+class RecentComment:
+    author_name: Optional[str]
+    body_length: Optional[int]
+    created_at: Optional[str]
+
+@dataclass(slots=True)
+class LatestArticle:
+    article_id: int
+    title: str
+    published_at: Optional[str]
+    last_check: Optional[str]
+    views: int
+    reactions: int
+    comments: int
+    growth: Optional[ArticleGrowth]
+    recent_comments: List[RecentComment]
+
+@dataclass(slots=True)
+class ArticleSummary:
+    article_id: int
+    title: str
+    published_at: Optional[str]
+    views: int
+    reactions: int
+    comments: int
+
+@dataclass(slots=True)
+class GlobalTrend:
+    articles: int
+    total_views: int
+    total_reactions: int
+    total_comments: int
+    previous_views: Optional[int]
+    avg_views: Optional[float]
+    avg_reactions: Optional[float]
+    avg_comments: Optional[float]
+
+@dataclass(slots=True)
+class CommenterStats:
+    author_name: str
+    author_username: Optional[str]
+    comment_count: int
+    articles_commented: int
+    avg_length: float
+    quality_score: float
+    sentiment: str
+
+@dataclass(slots=True)
+class LoyalReader:
+    author_username: Optional[str]
+    articles: int
+
+@dataclass(slots=True)
+class TopCommenters:
+    commenters: List[CommenterStats]
+    loyal: List[LoyalReader]
+
+@dataclass(slots=True)
+class ArticlePerformance:
+    title: str
+    views: int
+    reactions: int
+    comments: int
+    engagement_rate: float
+    reading_time: Optional[int]
+    avg_comment_length: float
 
 class DevToDashboard:
-    def __init__(self, db_path: str = "devto_metrics.db"):
+    def __init__(self, db_path: str = "devto_metrics.db", use_cache: bool = True):
         self.db = DatabaseManager(db_path)
         self.db_path = db_path
+        # Rattrape les snapshots pas encore agrégés (no-op si à jour)
+        DailyRollup(self.db).refresh()
+        # Thèmes des articles nouveaux ou modifiés (les sections sont en lecture seule)
+        TopicIntelligence(db_path).refresh_themes()
+        self.report_cache = ReportCache(db_path) if use_cache else None
     
-    def show_full_dashboard(self):
+    def show_full_dashboard(self, workers=None):
         """Display full dashboard"""
         
         print("\n" + "="*100)
         print("📊 DEV.TO PERSONAL DASHBOARD")
         print("="*100)
         
-        # 1. Latest article details
-        self.show_latest_article_detail()
-        
-        # 2. Last 5 articles
-        self.show_last_5_articles()
-        
-        # 3. Global trend
-        self.show_global_trend()
-        
-        # 4. Significant insights
-        self.show_significant_insights()
-        
-        # 5. Top commenters with quality and sentiment
-        self.show_top_commenters()
-        
-        # 6. Performance comparison
-        self.show_article_comparison()
-
-        # 7. Author DNA analysis
-        self.display_author_dna()
+        # Independent read-only sections: run concurrently, printed in this order
+        ReportRunner(workers).run([
+            self.show_latest_article_detail,    # 1. Latest article details
+            self.show_last_5_articles,          # 2. Last 5 articles
+            self.show_global_trend,             # 3. Global trend
+            self.show_significant_insights,     # 4. Significant insights
+            self.show_top_commenters,           # 5. Top commenters with quality and sentiment
+            self.show_article_comparison,       # 6. Performance comparison
+            self.display_author_dna,            # 7. Author DNA analysis
+        ])
         
         print("\n" + "="*100)
-
+    
+    def compute_full_dashboard(self, workers=None):
+        """All sections as result objects (section name -> result)"""
+        sections = {
+            'latest_article': self.compute_latest_article_detail,
+            'last_5_articles': self.compute_last_5_articles,
+            'global_trend': self.compute_global_trend,
+            'insights': self.compute_significant_insights,
+            'top_commenters': self.compute_top_commenters,
+            'article_comparison': self.compute_article_comparison,
+            'author_dna': self.compute_author_dna,
+        }
+        results = ReportRunner(workers).run(list(sections.values()))
+        return dict(zip(sections, results))
+    
+    # --- AUTHOR DNA ---
+    
+    @cached_section("dashboard.author_dna", tables=("article_themes", "article_latest"))
+    def compute_author_dna(self) -> AuthorDNA:
+        return TopicIntelligence(self.db_path).compute_dna(refresh=False)
+    
     def display_author_dna(self):
         analyzer = TopicIntelligence(self.db_path)
         print("\n" + "🧬" + " --- VOTRE PROFIL D'AUTEUR (DNA) ---")
-        analyzer.analyze_dna()
+        analyzer.render_dna(self.compute_author_dna())
     
-    def show_latest_article_detail(self):
+    # --- LATEST ARTICLE ---
+    
+    @cached_section("dashboard.latest_article", tables=("article_metrics", "comments"))
+    def compute_latest_article_detail(self) -> Optional[LatestArticle]:
         """Detailed metrics for latest article"""
         conn = self.db.get_connection()
         cursor = conn.cursor()
@@ -74,38 +176,11 @@ class DevToDashboard:
         
         article = cursor.fetchone()
         if not article:
-            print("\n❌ No articles found")
             conn.close()
-            return
+            return None
         
         article_id = article['article_id']
         
-        print(f"\n📝 LATEST ARTICLE: {article['title']}")
-        print("-" * 100)
-        print(f"Article ID: {article_id}")
-        
-        # Format dates safely
-        pub_date = article['published_at'][:10] if article['published_at'] else 'N/A'
-        last_check = article['last_check'][:16] if article['last_check'] else 'N/A'
-        
-        print(f"Published: {pub_date}")
-        print(f"Last updated: {last_check}")
-        print()
-        
-        # Current metrics
-        print(f"📊 Current metrics:")
-        print(f"  Views:     {article['views']:>6}")
-        print(f"  Reactions: {article['reactions']:>6}")
-        print(f"  Comments:  {article['comments']:>6}")
-        
-        # Engagement rate
-        if article['views'] > 0:
-            reaction_rate = (article['reactions'] / article['views']) * 100
-            comment_rate = (article['comments'] / article['views']) * 100
-            print(f"\n💡 Engagement rate:")
-            print(f"  Reaction rate: {reaction_rate:.2f}%")
-            print(f"  Comment rate:  {comment_rate:.2f}%")
-        
         # Evolution over time
         cursor.execute("""
             SELECT 
@@ -119,6 +194,7 @@ class DevToDashboard:
         """, (article_id,))
         
         snapshots = cursor.fetchall()
+        growth = None
         if len(snapshots) > 1:
             first = snapshots[0]
             last = snapshots[-1]
@@ -140,25 +216,12 @@ class DevToDashboard:
             last_time = parse_iso(last['collected_at'])
             
             if first_time and last_time:
-                duration = last_time - first_time
-                hours = duration.total_seconds() / 3600
-
-                total_hours = duration.total_seconds() / 3600
-                if total_hours < 24:
-                    h = int(total_hours)
-                    m = int((total_hours - h) * 60)
-                    duration_str = f"{h}h{m:02d}min"
-                else:
-                    duration_str = f"{duration.days}d {int(duration.seconds/3600)}h"
-                
-                if hours > 0:
-                    views_growth = last['views'] - first['views']
-                    views_per_hour = views_growth / hours
-                    
-                    print(f"Growth (over {duration_str}):")
-                    print(f"  +{views_growth} views ({views_per_hour:.1f} views/hour)")
-                    print(f"  +{last['reactions'] - first['reactions']} reactions")
-                    print(f"  +{last['comments'] - first['comments']} comments")
+                growth = ArticleGrowth(
+                    duration_seconds=(last_time - first_time).total_seconds(),
+                    views=last['views'] - first['views'],
+                    reactions=last['reactions'] - first['reactions'],
+                    comments=last['comments'] - first['comments'],
+                )
         
         # Recent comments
         cursor.execute("""
@@ -172,15 +235,88 @@ class DevToDashboard:
             LIMIT 3
         """, (article_id,))
         
-        recent_comments = cursor.fetchall()
-        if recent_comments:
-            print(f"\n💬 Recent comments:")
-            for comment in recent_comments:
-                created = comment['created_at'][:10] if comment['created_at'] else 'N/A'
-                print(f"  • {comment['author_name']} ({comment['body_length']} chars) - {created}")
+        recent_comments = [
+            RecentComment(c['author_name'], c['body_length'], c['created_at'])
+            for c in cursor.fetchall()
+        ]
+        conn.close()
         
+        return LatestArticle(
+            article_id=article_id,
+            title=article['title'],
+            published_at=article['published_at'],
+            last_check=article['last_check'],
+            views=article['views'],
+            reactions=article['reactions'],
+            comments=article['comments'],
+            growth=growth,
+            recent_comments=recent_comments,
+        )
     
-    def show_last_5_articles(self):
+    def render_latest_article_detail(self, article: Optional[LatestArticle]):
+        if article is None:
+            print("\n❌ No articles found")
+            return
+        
+        print(f"\n📝 LATEST ARTICLE: {article.title}")
+        print("-" * 100)
+        print(f"Article ID: {article.article_id}")
+        
+        # Format dates safely
+        pub_date = article.published_at[:10] if article.published_at else 'N/A'
+        last_check = article.last_check[:16] if article.last_check else 'N/A'
+        
+        print(f"Published: {pub_date}")
+        print(f"Last updated: {last_check}")
+        print()
+        
+        # Current metrics
+        print(f"📊 Current metrics:")
+        print(f"  Views:     {article.views:>6}")
+        print(f"  Reactions: {article.reactions:>6}")
+        print(f"  Comments:  {article.comments:>6}")
+        
+        # Engagement rate
+        if article.views > 0:
+            reaction_rate = (article.reactions / article.views) * 100
+            comment_rate = (article.comments / article.views) * 100
+            print(f"\n💡 Engagement rate:")
+            print(f"  Reaction rate: {reaction_rate:.2f}%")
+            print(f"  Comment rate:  {comment_rate:.2f}%")
+        
+        growth = article.growth
+        if growth:
+            duration = timedelta(seconds=growth.duration_seconds)
+            hours = growth.duration_seconds / 3600
+            
+            if hours < 24:
+                h = int(hours)
+                m = int((hours - h) * 60)
+                duration_str = f"{h}h{m:02d}min"
+            else:
+                duration_str = f"{duration.days}d {int(duration.seconds/3600)}h"
+            
+            if hours > 0:
+                views_per_hour = growth.views / hours
+                
+                print(f"Growth (over {duration_str}):")
+                print(f"  +{growth.views} views ({views_per_hour:.1f} views/hour)")
+                print(f"  +{growth.reactions} reactions")
+                print(f"  +{growth.comments} comments")
+        
+        if article.recent_comments:
+            print(f"\n💬 Recent comments:")
+            for comment in article.recent_comments:
+                created = comment.created_at[:10] if comment.created_at else 'N/A'
+                print(f"  • {comment.author_name} ({comment.body_length} chars) - {created}")
+    
+    def show_latest_article_detail(self):
+        self.render_latest_article_detail(self.compute_latest_article_detail())
+    
+    # --- LAST 5 ARTICLES ---
+    
+    @cached_section("dashboard.last_5_articles", tables=("article_metrics",))
+    def compute_last_5_articles(self) -> List[ArticleSummary]:
         """View of last 5 articles"""
         conn = self.db.get_connection()
         cursor = conn.cursor()
@@ -199,32 +335,43 @@ class DevToDashboard:
             LIMIT 5
         """)
         
-        articles = cursor.fetchall()
-        
+        articles = [
+            ArticleSummary(a['article_id'], a['title'], a['published_at'],
+                           a['views'], a['reactions'], a['comments'])
+            for a in cursor.fetchall()
+        ]
+        conn.close()
+        return articles
+    
+    def render_last_5_articles(self, articles: List[ArticleSummary]):
         print(f"\n\n📚 LAST 5 ARTICLES")
         print("-" * 100)
         print(f"{'Title':<50} {'Published':<12} {'Views':>7} {'Reacts':>7} {'Cmnts':>6} {'Eng%':>6}")
         print("-" * 100)
         
         for article in articles:
-            title = article['title'][:47] + "..." if len(article['title']) > 50 else article['title']
-            pub_date = article['published_at'][:10] if article['published_at'] else 'N/A'
+            title = article.title[:47] + "..." if len(article.title) > 50 else article.title
+            pub_date = article.published_at[:10] if article.published_at else 'N/A'
             
             engagement = 0
-            if article['views'] > 0:
-                engagement = ((article['reactions'] + article['comments']) / article['views']) * 100
+            if article.views > 0:
+                engagement = ((article.reactions + article.comments) / article.views) * 100
             
-            print(f"{title:<50} {pub_date:<12} {article['views']:>7} {article['reactions']:>7} "
-                  f"{article['comments']:>6} {engagement:>5.1f}%")
-        
-        conn.close()
+            print(f"{title:<50} {pub_date:<12} {article.views:>7} {article.reactions:>7} "
+                  f"{article.comments:>6} {engagement:>5.1f}%")
     
-    def show_global_trend(self):
+    def show_last_5_articles(self):
+        self.render_last_5_articles(self.compute_last_5_articles())
+    
+    # --- GLOBAL TREND ---
+    
+    @cached_section("dashboard.global_trend", tables=("daily_rollup", "article_latest"), time_bucket="%Y-%m-%d")
+    def compute_global_trend(self) -> GlobalTrend:
         """Global trend"""
         conn = self.db.get_connection()
         cursor = conn.cursor()
         
-        # Get max metrics per article for last 30 days
+        # Get max metrics per article for last 30 days (daily rollup)
         cursor.execute("""
             SELECT 
                 COUNT(DISTINCT article_id) as articles,
@@ -234,11 +381,11 @@ class DevToDashboard:
             FROM (
                 SELECT 
                     article_id,
-                    MAX(views) as max_views,
-                    MAX(reactions) as max_reactions,
-                    MAX(comments) as max_comments
-                FROM article_metrics
-                WHERE collected_at >= datetime('now', '-30 days')
+                    MAX(views_eod) as max_views,
+                    MAX(reactions_eod) as max_reactions,
+                    MAX(comments_eod) as max_comments
+                FROM daily_rollup
+                WHERE day >= date('now', '-30 days')
                 GROUP BY article_id
             )
         """)
@@ -248,173 +395,101 @@ class DevToDashboard:
         # Get max metrics per article for previous 30 days
         cursor.execute("""
             SELECT 
-                COUNT(DISTINCT article_id) as articles,
-                SUM(max_views) as total_views,
-                SUM(max_reactions) as total_reactions,
-                SUM(max_comments) as total_comments
+                SUM(max_views) as total_views
             FROM (
                 SELECT 
                     article_id,
-                    MAX(views) as max_views,
-                    MAX(reactions) as max_reactions,
-                    MAX(comments) as max_comments
-                FROM article_metrics
-                WHERE collected_at >= datetime('now', '-60 days')
-                AND collected_at < datetime('now', '-30 days')
+                    MAX(views_eod) as max_views
+                FROM daily_rollup
+                WHERE day >= date('now', '-60 days')
+                AND day < date('now', '-30 days')
                 GROUP BY article_id
             )
         """)
         
         previous = cursor.fetchone()
         
+        # Average per article (all time, latest known state)
+        cursor.execute("""
+            SELECT 
+                AVG(views) as avg_views,
+                AVG(reactions) as avg_reactions,
+                AVG(comments) as avg_comments
+            FROM article_latest
+        """)
+        
+        avg = cursor.fetchone()
+        conn.close()
+        
+        return GlobalTrend(
+            articles=recent['articles'] or 0,
+            total_views=recent['total_views'] or 0,
+            total_reactions=recent['total_reactions'] or 0,
+            total_comments=recent['total_comments'] or 0,
+            previous_views=previous['total_views'],
+            avg_views=avg['avg_views'],
+            avg_reactions=avg['avg_reactions'],
+            avg_comments=avg['avg_comments'],
+        )
+    
+    def render_global_trend(self, trend: GlobalTrend):
         print(f"\n\n📈 GLOBAL TREND (Last 30 days)")
         print("-" * 100)
         
-        if recent:
-            print(f"Active articles:   {recent['articles']}")
-            print(f"Total views:       {recent['total_views']:,}")
-            print(f"Total reactions:   {recent['total_reactions']:,}")
-            print(f"Total comments:    {recent['total_comments']:,}")
+        if trend.articles:
+            print(f"Active articles:   {trend.articles}")
+            print(f"Total views:       {trend.total_views:,}")
+            print(f"Total reactions:   {trend.total_reactions:,}")
+            print(f"Total comments:    {trend.total_comments:,}")
             
-            if previous and previous['total_views'] and previous['total_views'] > 0:
-                views_change = ((recent['total_views'] - previous['total_views']) / previous['total_views']) * 100
+            if trend.previous_views and trend.previous_views > 0:
+                views_change = ((trend.total_views - trend.previous_views) / trend.previous_views) * 100
                 
                 arrow = "↗" if views_change > 0 else "↘"
                 print(f"\nChange vs previous 30 days: {arrow} {views_change:+.1f}%")
         
-        # Average per article (all time)
-        cursor.execute("""
-            SELECT 
-                AVG(max_views) as avg_views,
-                AVG(max_reactions) as avg_reactions,
-                AVG(max_comments) as avg_comments
-            FROM (
-                SELECT 
-                    article_id,
-                    MAX(views) as max_views,
-                    MAX(reactions) as max_reactions,
-                    MAX(comments) as max_comments
-                FROM article_metrics
-                GROUP BY article_id
-            )
-        """)
-        
-        avg = cursor.fetchone()
+        if trend.avg_views is None:
+            return
         print(f"\n📊 Average per article (all time):")
-        print(f"  Views:     {avg['avg_views']:.0f}")
-        print(f"  Reactions: {avg['avg_reactions']:.1f}")
-        print(f"  Comments:  {avg['avg_comments']:.1f}")
-        
-        conn.close()
+        print(f"  Views:     {trend.avg_views:.0f}")
+        print(f"  Reactions: {trend.avg_reactions:.1f}")
+        print(f"  Comments:  {trend.avg_comments:.1f}")
     
-    def show_significant_insights(self):
+    def show_global_trend(self):
+        self.render_global_trend(self.compute_global_trend())
+    
+    # --- INSIGHTS ---
+    
+    @cached_section("dashboard.insights",
+                    tables=("daily_rollup", "article_latest", "comments", "follower_events"),
+                    time_bucket="%Y-%m-%d")
+    def compute_significant_insights(self) -> List[str]:
         """Automatic significant insights"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
+        # Toutes les règles partagent un seul chargement de daily_rollup / article_latest
+        return InsightEngine(self.db).generate()
+    
+    def render_significant_insights(self, insights: List[str]):
         print(f"\n\n💡 SIGNIFICANT INSIGHTS")
         print("-" * 100)
         
-        insights = []
-        
-        # 1. Article restarting
-        cursor.execute("""
-            SELECT 
-                a1.article_id,
-                a1.title,
-                a1.views as recent_views,
-                a2.views as old_views
-            FROM article_metrics a1
-            JOIN article_metrics a2 ON a1.article_id = a2.article_id
-            WHERE a1.collected_at >= datetime('now', '-7 days')
-            AND a2.collected_at <= datetime('now', '-14 days')
-            AND a1.views > a2.views * 1.5
-            AND a2.views > 50
-            GROUP BY a1.article_id
-            ORDER BY (a1.views - a2.views) DESC
-            LIMIT 1
-        """)
-        
-        restarting = cursor.fetchone()
-        if restarting:
-            growth = restarting['recent_views'] - restarting['old_views']
-            insights.append(f"🚀 '{restarting['title'][:60]}...' is restarting: +{growth} views this week")
-        
-        # 2. Most engaged reader recently
-        cursor.execute("""
-            SELECT 
-                author_name,
-                COUNT(*) as comment_count,
-                AVG(body_length) as avg_length
-            FROM comments
-            WHERE collected_at >= datetime('now', '-30 days')
-            AND author_name IS NOT NULL
-            GROUP BY author_name
-            ORDER BY comment_count DESC
-            LIMIT 1
-        """)
-        
-        top_commenter = cursor.fetchone()
-        if top_commenter and top_commenter['author_name'] and top_commenter['comment_count'] > 2:
-            avg_len = top_commenter['avg_length'] if top_commenter['avg_length'] else 0
-            insights.append(f"👤 {top_commenter['author_name']} is very active: "
-                          f"{top_commenter['comment_count']} comments this month "
-                          f"({avg_len:.0f} chars avg)")
-        
-        # 3. Best engagement rate recently
-        cursor.execute("""
-            SELECT 
-                title,
-                MAX(views) as views,
-                MAX(comments) as comments
-            FROM article_metrics
-            WHERE published_at >= datetime('now', '-60 days')
-            AND views > 50
-            GROUP BY article_id
-            ORDER BY (CAST(comments AS FLOAT) / views) DESC
-            LIMIT 1
-        """)
-        
-        best_engagement = cursor.fetchone()
-        if best_engagement and best_engagement['views'] > 0:
-            rate = (best_engagement['comments'] / best_engagement['views']) * 100
-            insights.append(f"💬 Best engagement: '{best_engagement['title'][:60]}...' "
-                          f"({rate:.1f}% comment rate)")
-        
-        # 4. Follower growth
-        cursor.execute("""
-            SELECT 
-                follower_count,
-                new_followers_since_last,
-                collected_at
-            FROM follower_events
-            ORDER BY collected_at DESC
-            LIMIT 2
-        """)
-        
-        followers = cursor.fetchall()
-        if len(followers) == 2:
-            if followers[0]['new_followers_since_last'] > 5:
-                insights.append(f"👥 +{followers[0]['new_followers_since_last']} new followers recently "
-                              f"(total: {followers[0]['follower_count']})")
-        
         # Display
         if insights:
             for insight in insights:
                 print(f"  • {insight}")
         else:
             print("  • Not enough data to generate insights (collect for a few days)")
-        
-        conn.close()
     
-    def show_top_commenters(self):
+    def show_significant_insights(self):
+        self.render_significant_insights(self.compute_significant_insights())
+    
+    # --- TOP COMMENTERS ---
+    
+    @cached_section("dashboard.top_commenters", tables=("comments",))
+    def compute_top_commenters(self) -> TopCommenters:
         """Analyze commenters with quality and sentiment"""
         conn = self.db.get_connection()
         cursor = conn.cursor()
         
-        print(f"\n\n👥 TOP COMMENTERS (Quality & engagement analysis)")
-        print("-" * 100)
-        
         cursor.execute("""
             SELECT 
                 author_name,
@@ -433,12 +508,8 @@ class DevToDashboard:
             LIMIT 10
         """)
         
-        commenters = cursor.fetchall()
-        
-        print(f"{'Name':<25} {'Comments':>8} {'Articles':>8} {'Avg Length':>11} {'Quality':>8} {'Sentiment':>10}")
-        print("-" * 100)
-        
-        for commenter in commenters:
+        commenters = []
+        for commenter in cursor.fetchall():
             # Handle None avg_length
             avg_len = commenter['avg_length'] if commenter['avg_length'] else 0
             
@@ -455,10 +526,15 @@ class DevToDashboard:
             else:
                 sentiment = "✓ Basic"
             
-            name = commenter['author_name'][:22] + "..." if len(commenter['author_name']) > 25 else commenter['author_name']
-            
-            print(f"{name:<25} {commenter['comment_count']:>8} {commenter['articles_commented']:>8} "
-                  f"{avg_len:>9.0f}ch {quality_score:>7.1f}/10 {sentiment:>10}")
+            commenters.append(CommenterStats(
+                author_name=commenter['author_name'],
+                author_username=commenter['author_username'],
+                comment_count=commenter['comment_count'],
+                articles_commented=commenter['articles_commented'],
+                avg_length=avg_len,
+                quality_score=quality_score,
+                sentiment=sentiment,
+            ))
         
         # Most loyal commenters (return often)
         cursor.execute("""
@@ -472,22 +548,39 @@ class DevToDashboard:
             LIMIT 3
         """)
         
-        loyal = cursor.fetchall()
-        if loyal:
-            print(f"\n⭐ Most loyal readers (comment on multiple articles):")
-            for reader in loyal:
-                print(f"  • {reader['author_username']} commented on {reader['articles']} different articles")
-        
+        loyal = [LoyalReader(r['author_username'], r['articles']) for r in cursor.fetchall()]
         conn.close()
+        return TopCommenters(commenters, loyal)
     
-    def show_article_comparison(self):
-        """Performance comparison between articles"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+    def render_top_commenters(self, result: TopCommenters):
+        print(f"\n\n👥 TOP COMMENTERS (Quality & engagement analysis)")
+        print("-" * 100)
         
-        print(f"\n\n📊 PERFORMANCE COMPARISON")
+        print(f"{'Name':<25} {'Comments':>8} {'Articles':>8} {'Avg Length':>11} {'Quality':>8} {'Sentiment':>10}")
         print("-" * 100)
         
+        for commenter in result.commenters:
+            name = commenter.author_name[:22] + "..." if len(commenter.author_name) > 25 else commenter.author_name
+            
+            print(f"{name:<25} {commenter.comment_count:>8} {commenter.articles_commented:>8} "
+                  f"{commenter.avg_length:>9.0f}ch {commenter.quality_score:>7.1f}/10 {commenter.sentiment:>10}")
+        
+        if result.loyal:
+            print(f"\n⭐ Most loyal readers (comment on multiple articles):")
+            for reader in result.loyal:
+                print(f"  • {reader.author_username} commented on {reader.articles} different articles")
+    
+    def show_top_commenters(self):
+        self.render_top_commenters(self.compute_top_commenters())
+    
+    # --- ARTICLE COMPARISON ---
+    
+    @cached_section("dashboard.article_comparison", tables=("article_metrics", "comments"))
+    def compute_article_comparison(self) -> List[ArticlePerformance]:
+        """Performance comparison between articles (sorted by views)"""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        
         cursor.execute("""
             SELECT 
                 article_id,
@@ -524,40 +617,47 @@ class DevToDashboard:
             if avg_comment_length is None:
                 avg_comment_length = 0
             
-            article_data.append({
-                'title': article['title'],
-                'views': article['views'],
-                'reactions': article['reactions'],
-                'comments': article['comments'],
-                'engagement_rate': engagement_rate,
-                'reading_time': article['reading_time_minutes'],
-                'avg_comment_length': avg_comment_length
-            })
+            article_data.append(ArticlePerformance(
+                title=article['title'],
+                views=article['views'],
+                reactions=article['reactions'],
+                comments=article['comments'],
+                engagement_rate=engagement_rate,
+                reading_time=article['reading_time_minutes'],
+                avg_comment_length=avg_comment_length,
+            ))
+        
+        conn.close()
+        return article_data
+    
+    def render_article_comparison(self, article_data: List[ArticlePerformance]):
+        print(f"\n\n📊 PERFORMANCE COMPARISON")
+        print("-" * 100)
         
         # Top 5 by views
         print("\n🏆 Top 5 by views:")
         for i, article in enumerate(article_data[:5], 1):
-            title = article['title'][:60] + "..." if len(article['title']) > 60 else article['title']
+            title = article.title[:60] + "..." if len(article.title) > 60 else article.title
             print(f"  {i}. {title}")
-            print(f"     {article['views']} views | {article['reactions']} reactions | "
-                  f"{article['comments']} comments | {article['engagement_rate']:.1f}% engagement")
+            print(f"     {article.views} views | {article.reactions} reactions | "
+                  f"{article.comments} comments | {article.engagement_rate:.1f}% engagement")
         
         # Top 5 by engagement
-        sorted_by_engagement = sorted(article_data, key=lambda x: x['engagement_rate'], reverse=True)
+        sorted_by_engagement = sorted(article_data, key=lambda x: x.engagement_rate, reverse=True)
         print("\n💬 Top 5 by engagement rate:")
         for i, article in enumerate(sorted_by_engagement[:5], 1):
-            title = article['title'][:60] + "..." if len(article['title']) > 60 else article['title']
+            title = article.title[:60] + "..." if len(article.title) > 60 else article.title
             print(f"  {i}. {title}")
-            print(f"     {article['engagement_rate']:.2f}% engagement | {article['views']} views | "
-                  f"{article['avg_comment_length']:.0f} chars/comment")
+            print(f"     {article.engagement_rate:.2f}% engagement | {article.views} views | "
+                  f"{article.avg_comment_length:.0f} chars/comment")
         
         # Analysis by article length
-        if any(a['reading_time'] for a in article_data):
+        if any(a.reading_time for a in article_data):
             print("\n📖 Performance by article length:")
             
-            short = [a for a in article_data if a['reading_time'] and a['reading_time'] < 5]
-            medium = [a for a in article_data if a['reading_time'] and 5 <= a['reading_time'] < 10]
-            long = [a for a in article_data if a['reading_time'] and a['reading_time'] >= 10]
+            short = [a for a in article_data if a.reading_time and a.reading_time < 5]
+            medium = [a for a in article_data if a.reading_time and 5 <= a.reading_time < 10]
+            long = [a for a in article_data if a.reading_time and a.reading_time >= 10]
             
             for articles_list, label, description in [
                 (short, "short", "Short (<5 min)"),
@@ -565,21 +665,28 @@ class DevToDashboard:
                 (long, "long", "Long (>10 min)")
             ]:
                 if articles_list:
-                    avg_views = sum(a['views'] for a in articles_list) / len(articles_list)
-                    avg_engagement = sum(a['engagement_rate'] for a in articles_list) / len(articles_list)
+                    avg_views = sum(a.views for a in articles_list) / len(articles_list)
+                    avg_engagement = sum(a.engagement_rate for a in articles_list) / len(articles_list)
                     print(f"  • {description}: {len(articles_list)} articles | "
                           f"Avg {avg_views:.0f} views | {avg_engagement:.1f}% engagement")
-        
-        conn.close()
+    
+    def show_article_comparison(self):
+        self.render_article_comparison(self.compute_article_comparison())
 
 def main():
     parser = argparse.ArgumentParser(description="DEV.to Personal Dashboard")
     parser.add_argument('--db', default='devto_metrics.db', help='Path to database')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute every section (ignore report cache)')
+    parser.add_argument('--workers', type=int, help='Sections run concurrently (1 = sequential)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
     
     args = parser.parse_args()
     
-    dashboard = DevToDashboard(args.db)
-    dashboard.show_full_dashboard()
+    dashboard = DevToDashboard(args.db, use_cache=not args.no_cache)
+    if args.format == 'json':
+        print(dump_json(dashboard.compute_full_dashboard(workers=args.workers)))
+    else:
+        dashboard.show_full_dashboard(workers=args.workers)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
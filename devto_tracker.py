@@ -4,10 +4,17 @@ import requests
 import json
 import argparse
 import time
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from dotenv import load_dotenv
 from core.database import DatabaseManager
 from core.content_tracker import ContentTracker
+from core.milestones import MilestoneDetector
+from core.collection_runs import CollectionRuns
+from core.daily_rollup import DailyRollup
+from core.comment_store import insert_comment
+from core.spam import SpamEngine
+from core.questions import QuestionQueue
+from core.backfill import HistoricalBackfill, UPSERT_DAILY, historical_rows, CHUNK_DAYS
 
 load_dotenv()
 
@@ -18,6 +25,9 @@ class DevToTracker:
         self.base_url = "https://dev.to/api"
         self.db = DatabaseManager(db_path)
         self.content_tracker = ContentTracker(self.db)
+        self.rollup = DailyRollup(self.db)
+        self.milestones = MilestoneDetector(self.db)
+        self.runs = CollectionRuns(self.db)
 
     def fetch_api_articles(self):
         """Récupération brute depuis l'API Dev.to."""
@@ -28,32 +38,46 @@ class DevToTracker:
 
     def collect_snapshot(self):
         """Collection standard : Métriques de base."""
+        started = time.perf_counter()
         articles = self.fetch_api_articles()
         timestamp = datetime.now(timezone.utc).isoformat()
         
         print(f"📡 Start collection: {len(articles)} articles found.")
         
         conn = self.db.get_connection()
+        # article_latest à jour avant ce snapshot : état de référence des milestones
+        self.rollup.refresh(conn)
+        run_id = self.runs.start(conn, timestamp)
+
         for art in articles:
             # 1. Insertion du Snapshot (article_metrics)
             conn.execute("""
                 INSERT INTO article_metrics 
-                (collected_at, article_id, title, slug, published_at, views, reactions, comments, reading_time_minutes, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                (collected_at, article_id, title, slug, published_at, views, reactions, comments, reading_time_minutes, tags, run_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 timestamp, art['id'], art['title'], art['slug'], 
                 art['published_at'], art['page_views_count'], 
                 art['public_reactions_count'], art['comments_count'],
-                art['reading_time_minutes'], json.dumps(art['tag_list'])
+                art['reading_time_minutes'], json.dumps(art['tag_list']), run_id
             ))
 
-            # 2. Tracking automatique des modifications (Titre, etc.)
-            if art.get('published_at'):  # Seulement pour articles publiés
-                tags_str = ",".join(art.get('tag_list', []))
-                self.content_tracker.check_content_updates(
-                    art['id'], art['title'], tags_str, conn
-                )
+        # 2. Tracking automatique des modifications (titre, slug, tags, couverture, corps)
+        #    Seulement pour articles publiés, comparés en mémoire en une passe
+        published = [art for art in articles if art.get('published_at')]
+        self.content_tracker.check_batch(published, conn, timestamp)
+
+        # 3. Milestones (paliers, pics) : comparaison avec article_latest avant sa mise à jour
+        self.milestones.detect(conn, published, timestamp)
         
+        # 4. Agrégats journaliers : seuls les jours touchés par ce snapshot
+        self.rollup.refresh(conn)
+
+        # 5. Index des collectes (cadence, trous, articles sautés : cf. core/collection_runs.py)
+        skipped = self.runs.finish(conn, run_id, [art['id'] for art in articles], time.perf_counter() - started)
+        if skipped:
+            print(f"⚠️  {len(skipped)} known article(s) missing from this collection")
+
         conn.commit()
         conn.close()
         print(f"✅ Data stored and content checked.")
@@ -98,6 +122,14 @@ class DevToTracker:
         
         print(f"✅ Rich analytics collection complete.")
 
+    def backfill(self, since, workers=4, rate=2.0, chunk_days=CHUNK_DAYS):
+        """Backfill de daily_analytics depuis `since` (concurrent, reprenable, cf. core/backfill.py)."""
+        articles = self.fetch_api_articles()
+        print(f"⏪ Historical backfill since {since} for {len(articles)} articles...")
+        
+        backfill = HistoricalBackfill(self.db, self.headers, self.base_url, workers, rate, chunk_days)
+        backfill.render_summary(backfill.run(articles, since))
+
     def collect_all(self):
         """Run full collection (metrics+followers+comments) then rich analytics."""
         # collect_full inclut collect_snapshot
@@ -159,23 +191,18 @@ class DevToTracker:
             r = requests.get(f"{self.base_url}/comments", params={"a_id": art['id']})
             if r.status_code == 200:
                 for c in r.json():
-                    body_text = c.get('body_html', '')
                     user = c.get('user', {})
-                    cursor = conn.execute("""
-                        INSERT OR IGNORE INTO comments 
-                        (comment_id, article_id, article_title, author_username, author_name, 
-                         body_html, body_length, created_at, collected_at) 
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        c['id_code'], art['id'], art['title'],
-                        user.get('username'), user.get('name'),
-                        body_text, len(body_text), c['created_at'], timestamp
-                    ))
-                    if cursor.rowcount > 0:
+                    if insert_comment(
+                        conn, c['id_code'], art['id'], c.get('body_html', ''), c['created_at'], timestamp,
+                        article_title=art['title'], author_username=user.get('username'), author_name=user.get('name')
+                    ):
                         new_comments += 1
         
         conn.commit()
         conn.close()
+        if new_comments:
+            SpamEngine().refresh(self.db)
+            QuestionQueue(self.db).refresh()
         print(f"💬 New comments: {new_comments}")
 
     def _fetch_historical_analytics(self, article_id, timestamp):
@@ -187,30 +214,8 @@ class DevToTracker:
         )
         
         if r.status_code == 200:
-            data = r.json()
             conn = self.db.get_connection()
-            
-            for date_str, stats in data.items():
-                conn.execute("""
-                    INSERT OR REPLACE INTO daily_analytics 
-                    (article_id, date, page_views, average_read_time_seconds, total_read_time_seconds,
-                     reactions_total, reactions_like, reactions_readinglist, reactions_unicorn,
-                     comments_total, follows_total, collected_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    article_id, date_str,
-                    stats['page_views']['total'],
-                    stats['page_views'].get('average_read_time_in_seconds', 0),
-                    stats['page_views'].get('total_read_time_in_seconds', 0),
-                    stats['reactions']['total'],
-                    stats['reactions'].get('like', 0),
-                    stats['reactions'].get('readinglist', 0),
-                    stats['reactions'].get('unicorn', 0),
-                    stats['comments']['total'],
-                    stats['follows']['total'],
-                    timestamp
-                ))
-            
+            conn.executemany(UPSERT_DAILY, historical_rows(article_id, r.json(), timestamp))
             conn.commit()
             conn.close()
 
@@ -246,8 +251,21 @@ def main():
                        help='Rich analytics (historical data + referrers)')
     parser.add_argument('--all', action='store_true',
                         help='Run full collection then rich analytics (everything)')
+    parser.add_argument('--backfill', action='store_true',
+                        help='Historical analytics backfill (requires --since)')
+    parser.add_argument('--since', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                        help='Backfill start date')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Concurrent fetchers for --backfill (default: 4)')
+    parser.add_argument('--rate', type=float, default=2.0,
+                        help='Max API calls per second for --backfill (default: 2)')
+    parser.add_argument('--chunk-days', type=int, default=CHUNK_DAYS,
+                        help=f'Days per backfill request (default: {CHUNK_DAYS})')
     args = parser.parse_args()
 
+    if args.backfill and not args.since:
+        parser.error("--backfill requires --since YYYY-MM-DD")
+
     api_key = os.getenv('DEVTO_API_KEY')
     if not api_key:
         print("❌ Error: DEVTO_API_KEY environment variable not set.")
@@ -263,6 +281,8 @@ def main():
         tracker.collect_rich_analytics()
     elif args.all:
         tracker.collect_all()
+    elif args.backfill:
+        tracker.backfill(args.since, args.workers, args.rate, args.chunk_days)
     else:
         parser.print_help()
 
@@ -1,27 +1,70 @@
 import os
-import spacy
-from bs4 import BeautifulSoup
+import argparse
+from importlib import metadata
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from dotenv import load_dotenv
 from core.database import DatabaseManager
+from core.comment_store import html_to_text, backfill_body_text
+from core.spam import SpamEngine
+from core.questions import QuestionQueue
+from core.sentiment_trends import SentimentTrends, mood_for
+from core.results import dump_json
 
 # Charge les variables d'environnement (.env)
 load_dotenv()
 
+def _analyzer_version():
+    """Identifie l'analyseur qui a produit un score : à incrémenter si la préparation du texte change."""
+    try:
+        return f"vader-{metadata.version('vaderSentiment')}/1"
+    except metadata.PackageNotFoundError:
+        return "vader-unknown/1"
+
+ANALYZER_VERSION = _analyzer_version()
+
+@dataclass(slots=True)
+class OpenQuestion:
+    article_title: str
+    author_username: str
+    text: str
+    created_at: str
+
+@dataclass(slots=True)
+class ConceptCount:
+    concept: str
+    label: str
+    count: int
+
 class NLPAnalyzer:
+    # Modèle léger pour l'extraction de concepts ; seul le NER est utilisé
+    SPACY_MODEL = "en_core_web_sm"
+    SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+    CONCEPT_LABELS = {"ORG", "PRODUCT", "LANGUAGE", "WORK_OF_ART", "EVENT", "GPE", "PERSON"}
+
     def __init__(self, db_path="devto_metrics.db"):
         self.db = DatabaseManager(db_path)
         self.author_id = "pascal_cescato_692b7a8a20"
-        self.vader = SentimentIntensityAnalyzer()
+        self.questions = QuestionQueue(self.db, self.author_id)
+        self.trends = SentimentTrends(self.db)
+        self._nlp = None
         self._setup_db()
-        
-        try:
-            # Modèle léger pour l'extraction de concepts
-            self.nlp = spacy.load("en_core_web_sm") 
-        except:
-            print("❌ Erreur : Modèle spaCy 'en_core_web_sm' manquant.")
-            print("👉 Lance : python3 -m spacy download en_core_web_sm")
-            exit(1)
+
+    @property
+    def nlp(self):
+        """Pipeline spaCy, chargé au premier usage (VADER seul n'en a pas besoin)"""
+        if self._nlp is None:
+            try:
+                import spacy
+                self._nlp = spacy.load(self.SPACY_MODEL, exclude=self.SPACY_EXCLUDE)
+            except (ImportError, OSError):
+                print(f"❌ Erreur : Modèle spaCy '{self.SPACY_MODEL}' manquant.")
+                print(f"👉 Lance : python3 -m spacy download {self.SPACY_MODEL}")
+                exit(1)
+        return self._nlp
 
     def _setup_db(self):
         """Initialise la table des insights si elle n'existe pas"""
@@ -33,119 +76,304 @@ class NLPAnalyzer:
                 sentiment_score REAL,
                 mood TEXT,
                 analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                content_hash TEXT,
+                analyzer_version TEXT,
                 FOREIGN KEY (comment_id) REFERENCES comments (comment_id)
             )
         """)
         conn.commit()
         conn.close()
 
-    def clean_text(self, html):
-        """Nettoie le HTML et retire les blocs de code pour l'analyse"""
-        if not html: return ""
-        soup = BeautifulSoup(html, "html.parser")
-        for code in soup.find_all(['code', 'pre']):
-            code.decompose()
-        return soup.get_text(separator=' ').strip()
-
-    def is_spam(self, text):
-        """Filtre pragmatique contre les bots de casino et arnaques"""
-        spam_keywords = ['investigator', 'hack', 'whatsapp', 'kasino', 'slot', '777', 'putar', 'kaya']
-        t = text.lower()
-        suspicious_patterns = ["🎡", "🎰", "💰"]
-        
-        if any(p in t for p in suspicious_patterns): return True
-        if any(k in t for k in spam_keywords): return True
-        if "@" in t and ".com" in t and "gmail" in t: return True
-        return False
+        # Commentaires insérés avant l'ajout de body_text / body_hash : nettoyés une seule fois ici
+        backfill_body_text(self.db)
+        self._adopt_legacy_insights()
+        # Verdicts spam manquants (ou re-score complet si spam_rules.json a changé)
+        SpamEngine().refresh(self.db)
+        # Questions des commentaires pas encore intégrés à la file
+        self.questions.refresh()
+        # Agrégats journaliers pour les scores antérieurs à sentiment_daily
+        self.trends.ensure_built()
 
-    def find_unanswered_questions(self):
-        """Détecte les questions des lecteurs qui n'ont pas de réponse de ta part"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        query = """
-            SELECT q.article_title, q.author_username, q.body_html, q.created_at
-            FROM comments q
-            WHERE q.body_html LIKE '%?%' 
-            AND q.author_username != ?
-            AND NOT EXISTS (
-                SELECT 1 FROM comments a 
-                WHERE a.article_id = q.article_id 
-                AND a.author_username = ? 
-                AND a.created_at > q.created_at
-            )
-            ORDER BY q.created_at DESC
+    def _adopt_legacy_insights(self):
         """
-        cursor.execute(query, (self.author_id, self.author_id))
-        questions = cursor.fetchall()
+        Les scores antérieurs à content_hash sont rattachés au texte actuel et à la
+        version courante de l'analyseur, plutôt que de tout re-scorer.
+        """
+        conn = self.db.get_connection()
+        conn.execute("""
+            UPDATE comment_insights
+            SET content_hash = (SELECT c.body_hash FROM comments c WHERE c.comment_id = comment_insights.comment_id),
+                analyzer_version = ?
+            WHERE content_hash IS NULL
+        """, (ANALYZER_VERSION,))
+        conn.execute("""
+            INSERT OR IGNORE INTO sentiment_cache (content_hash, analyzer_version, score)
+            SELECT content_hash, analyzer_version, sentiment_score FROM comment_insights
+            WHERE content_hash IS NOT NULL AND sentiment_score IS NOT NULL
+        """)
+        conn.commit()
         conn.close()
 
+    @staticmethod
+    def clean_text(html):
+        """Nettoie le HTML et retire les blocs de code pour l'analyse"""
+        return html_to_text(html)
+
+    def compute_unanswered_questions(self) -> List[OpenQuestion]:
+        """Détecte les questions des lecteurs qui n'ont pas de réponse de ta part"""
+        # File maintenue à l'ingestion (open_questions) : simple lecture indexée
+        return [
+            OpenQuestion(q['article_title'], q['author_username'], q['body_text'] or "", q['created_at'])
+            for q in self.questions.pending()
+        ]
+
+    def render_unanswered_questions(self, questions: List[OpenQuestion]):
         if questions:
             print(f"\n❓ QUESTIONS EN ATTENTE ({len(questions)})")
             print("-" * 80)
             for q in questions:
-                text = self.clean_text(q['body_html'])[:120]
-                print(f"📘 {q['article_title'][:50]}...")
-                print(f"   👤 @{q['author_username']} : \"{text}...\"")
-                print(f"   📅 {q['created_at']}\n")
+                print(f"📘 {q.article_title[:50]}...")
+                print(f"   👤 @{q.author_username} : \"{q.text[:120]}...\"")
+                print(f"   📅 {q.created_at}\n")
         else:
             print("\n✅ Aucune question en attente. Tu es à jour !")
 
+    def find_unanswered_questions(self):
+        self.render_unanswered_questions(self.compute_unanswered_questions())
+
+    def compute_stats(self) -> Dict[str, int]:
+        """Nombre de commentaires par humeur (dérivée du score brut : les seuils se changent sans re-scorer)"""
+        conn = self.db.get_connection()
+        conn.create_function("mood_for", 1, mood_for, deterministic=True)
+        rows = conn.execute("""
+            SELECT mood_for(i.sentiment_score) as mood, COUNT(*) as c
+            FROM comment_insights i
+            JOIN comments c ON c.comment_id = i.comment_id
+            WHERE c.is_spam = 0
+            GROUP BY 1
+        """).fetchall()
+        conn.close()
+        return {r['mood']: r['c'] for r in rows}
+
+    def render_stats(self, stats: Dict[str, int]):
+        print("\n📊 ÉTAT GLOBAL DE L'AUDIENCE (Moteur VADER) :")
+        for mood, count in stats.items():
+            print(f"   {mood} : {count}")
+
     def show_stats(self):
         """Affiche le résumé global de l'ambiance"""
+        self.render_stats(self.compute_stats())
+
+    def extract_concepts(self, texts: Iterable[str], batch_size=256, n_process=1):
+        """
+        Entités nommées de chaque texte, via nlp.pipe par lots.
+        Génère une liste de (texte, label) par document, dans l'ordre d'entrée.
+        """
+        for doc in self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield [(ent.text.strip(), ent.label_) for ent in doc.ents if ent.label_ in self.CONCEPT_LABELS]
+
+    def compute_top_concepts(self, limit=20, n_process=None) -> List[ConceptCount]:
+        """Concepts les plus cités par les lecteurs"""
         conn = self.db.get_connection()
-        cursor = conn.cursor()
-        print("\n📊 ÉTAT GLOBAL DE L'AUDIENCE (Moteur VADER) :")
-        cursor.execute("SELECT mood, COUNT(*) as c FROM comment_insights GROUP BY mood")
-        for r in cursor.fetchall():
-            print(f"   {r['mood']} : {r['c']}")
+        rows = conn.execute(
+            "SELECT body_text FROM comments WHERE is_spam = 0 AND author_username != ?", (self.author_id,)
+        ).fetchall()
         conn.close()
 
-    def run(self):
-        """Exécute l'analyse incrémentale"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        # On ne traite que les nouveaux commentaires
-        query = """
-            SELECT c.comment_id, c.article_title, c.body_html 
+        texts = (r['body_text'] for r in rows if r['body_text'])
+        counts = Counter()
+        for concepts in self.extract_concepts(texts, n_process=n_process or os.cpu_count() or 1):
+            # Un concept compte une fois par commentaire
+            counts.update(set(concepts))
+
+        return [ConceptCount(text, label, count) for (text, label), count in counts.most_common(limit)]
+
+    def render_top_concepts(self, concepts: List[ConceptCount]):
+        print(f"\n🧠 CONCEPTS LES PLUS CITÉS ({len(concepts)})")
+        print("-" * 80)
+        for c in concepts:
+            print(f"   {c.concept:<40} {c.label:<12} {c.count:>5}")
+
+    def show_top_concepts(self, limit=20, n_process=None):
+        self.render_top_concepts(self.compute_top_concepts(limit, n_process))
+
+    def _comments_query(self, reanalyze=False):
+        """
+        Commentaires de lecteurs à scorer : sans score, dont le texte a changé ou
+        scorés par une autre version de l'analyseur (tous avec reanalyze).
+        """
+        stale = "" if reanalyze else """
+            AND (i.comment_id IS NULL
+                 OR i.content_hash IS NOT c.body_hash
+                 OR i.analyzer_version IS NOT ?)
+        """
+        return f"""
+            SELECT c.comment_id, c.body_text, c.body_hash, i.comment_id IS NOT NULL as rescored
             FROM comments c
             LEFT JOIN comment_insights i ON c.comment_id = i.comment_id
-            WHERE i.comment_id IS NULL AND c.author_username != ?
+            WHERE c.is_spam = 0 AND c.author_username != ?
+            {stale}
         """
-        cursor.execute(query, (self.author_id,))
-        rows = cursor.fetchall()
-
-        if rows:
-            print(f"🚀 Analyse VADER de {len(rows)} nouveaux commentaires...")
-            for row in rows:
-                text = self.clean_text(row['body_html'])
-                if text and not self.is_spam(text):
-                    vs = self.vader.polarity_scores(text)
-                    score = vs['compound']
-
-                    # Application des seuils calibrés
-                    if score >= 0.3:
-                        mood = "🌟 Positif"
-                    elif score <= -0.2:
-                        mood = "😟 Négatif"
-                    else:
-                        mood = "😐 Neutre"
-        
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO comment_insights (comment_id, sentiment_score, mood)
-                        VALUES (?, ?, ?)
-                    """, (row['comment_id'], score, mood))
-            conn.commit()
+
+    def _comments_params(self, reanalyze=False):
+        return (self.author_id,) if reanalyze else (self.author_id, ANALYZER_VERSION)
+
+    def count_pending(self, reanalyze=False):
+        conn = self.db.get_connection()
+        count = conn.execute(
+            f"SELECT COUNT(*) FROM ({self._comments_query(reanalyze)})", self._comments_params(reanalyze)
+        ).fetchone()[0]
+        conn.close()
+        return count
+
+    def _chunks(self, conn, reanalyze, chunk_size):
+        cursor = conn.execute(self._comments_query(reanalyze), self._comments_params(reanalyze))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+
+    @staticmethod
+    def _cached_scores(conn, hashes):
+        """Scores déjà calculés par cette version de l'analyseur : content_hash -> score"""
+        hashes = list(hashes)
+        if not hashes:
+            return {}
+        rows = conn.execute(f"""
+            SELECT content_hash, score FROM sentiment_cache
+            WHERE analyzer_version = ? AND content_hash IN ({','.join('?' * len(hashes))})
+        """, (ANALYZER_VERSION, *hashes)).fetchall()
+        return {r['content_hash']: r['score'] for r in rows}
+
+    def score_comments(self, reanalyze=False, workers=None, chunk_size=500):
+        """
+        Score VADER des commentaires, lus par lots depuis un curseur.
+        Un texte déjà scoré par la même version de l'analyseur (sentiment_cache)
+        n'est pas re-scoré ; les autres lots sont scorés dans un pool de processus
+        et écrits par executemany, un commit par lot, avec la mise à jour de
+        sentiment_daily. Retourne le nombre de commentaires enregistrés.
+        """
+        workers = workers or os.cpu_count() or 1
+        read_conn = self.db.get_connection()
+        write_conn = self.db.get_connection()
+        written = 0
+        rebuild_trends = reanalyze
+
+        def prepare(rows):
+            texts = {r['body_hash']: r['body_text'] for r in rows if r['body_text']}
+            cached = {} if reanalyze else self._cached_scores(read_conn, texts)
+            return rows, cached, [(h, t) for h, t in texts.items() if h not in cached]
+
+        def save(rows, cached, scored):
+            nonlocal rebuild_trends
+            write_conn.executemany("""
+                INSERT OR REPLACE INTO sentiment_cache (content_hash, analyzer_version, score)
+                VALUES (?, ?, ?)
+            """, [(h, ANALYZER_VERSION, score) for h, score in scored])
+
+            scores = {**cached, **dict(scored)}
+            results = [
+                (r['comment_id'], scores[r['body_hash']], r['body_hash'], ANALYZER_VERSION)
+                for r in rows if r['body_hash'] in scores
+            ]
+            write_conn.executemany("""
+                INSERT OR REPLACE INTO comment_insights (comment_id, sentiment_score, content_hash, analyzer_version)
+                VALUES (?, ?, ?, ?)
+            """, results)
+
+            # Un commentaire re-scoré remplace son ancienne contribution : agrégats recalculés à la fin
+            if any(r['rescored'] for r in rows):
+                rebuild_trends = True
+            if not rebuild_trends:
+                self.trends.add(write_conn, [(comment_id, score) for comment_id, score, _, _ in results])
+            write_conn.commit()
+            return len(results)
+
+        chunks = (prepare(rows) for rows in self._chunks(read_conn, reanalyze, chunk_size))
+        try:
+            if workers <= 1:
+                for rows, cached, todo in chunks:
+                    written += save(rows, cached, score_chunk(todo))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    # Au plus 2 lots en vol par processus : la mémoire reste bornée
+                    pending = deque()
+                    for rows, cached, todo in chunks:
+                        pending.append((rows, cached, pool.submit(score_chunk, todo)))
+                        if len(pending) >= workers * 2:
+                            rows, cached, future = pending.popleft()
+                            written += save(rows, cached, future.result())
+                    while pending:
+                        rows, cached, future = pending.popleft()
+                        written += save(rows, cached, future.result())
+
+            if rebuild_trends:
+                # Les anciens scores ont été remplacés : agrégats recalculés en une requête
+                self.trends.rebuild(write_conn)
+                write_conn.commit()
+        finally:
+            read_conn.close()
+            write_conn.close()
+        return written
+
+    def run(self, reanalyze=False, workers=None):
+        """Exécute l'analyse incrémentale (ou complète avec reanalyze)"""
+        pending = self.count_pending(reanalyze)
+
+        if pending:
+            label = "commentaires (ré-analyse complète)" if reanalyze else "nouveaux commentaires"
+            print(f"🚀 Analyse VADER de {pending} {label}...")
+            self.score_comments(reanalyze=reanalyze, workers=workers)
             print("✅ Mise à jour terminée.")
         else:
             print("☕ Aucun nouveau commentaire à analyser.")
-
-        conn.close()
         
         # Affichage des résultats
         self.show_stats()
         self.find_unanswered_questions()
 
+# --- SCORING (exécuté dans les processus du pool) ---
+
+_vader = None
+
+def score_chunk(rows):
+    """[(content_hash, body_text)] -> [(content_hash, score)], textes vides exclus (spam filtré en amont)"""
+    global _vader
+    if _vader is None:
+        # Un analyseur par processus : le lexique n'est chargé qu'une fois
+        _vader = SentimentIntensityAnalyzer()
+
+    results = []
+    for content_hash, text in rows:
+        if text:
+            results.append((content_hash, _vader.polarity_scores(text)['compound']))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse NLP des commentaires")
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Format de sortie')
+    parser.add_argument('--concepts', action='store_true', help='Extraction des concepts (spaCy)')
+    parser.add_argument('--processes', type=int, help='Processus spaCy pour --concepts (défaut : tous les cœurs)')
+    parser.add_argument('--reanalyze', action='store_true', help='Recalcule le sentiment de tous les commentaires')
+    parser.add_argument('--workers', type=int, help='Processus de scoring VADER (défaut : tous les cœurs)')
+    args = parser.parse_args()
+
+    analyzer = NLPAnalyzer(args.db)
+    if args.format == 'json':
+        analyzer.score_comments(reanalyze=args.reanalyze, workers=args.workers)
+        results = {
+            'moods': analyzer.compute_stats(),
+            'unanswered_questions': analyzer.compute_unanswered_questions(),
+        }
+        if args.concepts:
+            results['concepts'] = analyzer.compute_top_concepts(n_process=args.processes)
+        print(dump_json(results))
+    else:
+        analyzer.run(reanalyze=args.reanalyze, workers=args.workers)
+        if args.concepts:
+            analyzer.show_top_concepts(n_process=args.processes)
+
 if __name__ == "__main__":
-    analyzer = NLPAnalyzer()
-    analyzer.run()
\ No newline at end of file
+    main()
\ No newline at end of file
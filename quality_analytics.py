@@ -10,22 +10,103 @@ Based on data from /api/analytics/historical endpoint
 - For articles older than 90 days, breakdown will be incomplete
 """
 
-import sqlite3
 import argparse
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import List, Optional
+from core.database import connect
+from core.report_cache import ReportCache, cached_section
+from core.report_runner import ReportRunner
+from core.results import dump_json
+
+# --- RESULTS ---
+
+@dataclass(slots=True)
+class ReadTimeStats:
+    article_id: int
+    title: str
+    reading_time_minutes: Optional[int]
+    avg_read_seconds: float
+    completion: float
+    total_hours: float
+
+@dataclass(slots=True)
+class ReactionStats:
+    article_id: int
+    title: str
+    age_days: int
+    lifetime: int
+    likes: int
+    unicorns: int
+    bookmarks: int
+    breakdown_sum: int
+    gap: int
+
+@dataclass(slots=True)
+class ReactionPattern:
+    pattern: str
+    articles: int
+
+@dataclass(slots=True)
+class ReactionBreakdown:
+    articles: List[ReactionStats]
+    patterns: List[ReactionPattern]
+
+@dataclass(slots=True)
+class LongTailStats:
+    article_id: int
+    title: str
+    age_days: int
+    recent_views: int
+    older_views: int
+    trend_pct: Optional[float]
+
+@dataclass(slots=True)
+class QualityScore:
+    article_id: int
+    title: str
+    age_days: int
+    quality_score: float
+    completion: float
+    engagement: float
+
+@dataclass(slots=True)
+class DailyStats:
+    date: str
+    page_views: int
+    average_read_time_seconds: Optional[int]
+    reactions_like: Optional[int]
+    reactions_unicorn: Optional[int]
+    reactions_readinglist: Optional[int]
+    comments_total: Optional[int]
+
+@dataclass(slots=True)
+class ArticleDaily:
+    article_id: int
+    title: str
+    published_at: Optional[str]
+    reading_time_minutes: Optional[int]
+    days: List[DailyStats]
 
 class QualityAnalytics:
-    def __init__(self, db_path: str = "devto_metrics.db"):
+    def __init__(self, db_path: str = "devto_metrics.db", use_cache: bool = True):
         self.db_path = db_path
-        self.conn = None
+        self._local = threading.local()
+        self.report_cache = ReportCache(db_path) if use_cache else None
+    
+    @property
+    def conn(self):
+        """Database connection of the current thread (sections may run concurrently)"""
+        if getattr(self._local, 'conn', None) is None:
+            self._local.conn = connect(self.db_path)
+        return self._local.conn
     
     def connect(self):
         """Connect to database"""
-        if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
+        return self.conn
     
-    def show_quality_dashboard(self):
+    def show_quality_dashboard(self, workers=None):
         """Show complete quality metrics dashboard"""
         self.connect()
         
@@ -33,14 +114,30 @@ class QualityAnalytics:
         print("📊 QUALITY ANALYTICS DASHBOARD")
         print("="*100)
         
-        self.show_read_time_analysis()
-        self.show_reaction_breakdown()
-        self.show_long_tail_champions()
-        self.show_quality_scores()
+        ReportRunner(workers).run([
+            self.show_read_time_analysis,
+            self.show_reaction_breakdown,
+            self.show_long_tail_champions,
+            self.show_quality_scores,
+        ])
         
         print("\n" + "="*100)
     
-    def show_read_time_analysis(self):
+    def compute_quality_dashboard(self, workers=None):
+        """All dashboard sections as result objects (section name -> result)"""
+        sections = {
+            'read_time': self.compute_read_time_analysis,
+            'reactions': self.compute_reaction_breakdown,
+            'long_tail': self.compute_long_tail_champions,
+            'quality': self.compute_quality_scores,
+        }
+        results = ReportRunner(workers).run(list(sections.values()))
+        return dict(zip(sections, results))
+    
+    # --- READ TIME ---
+    
+    @cached_section("quality.read_time", tables=("daily_analytics", "article_metrics"), time_bucket="%Y-%m-%d")
+    def compute_read_time_analysis(self) -> List[ReadTimeStats]:
         """Analyze average read times per article"""
         cursor = self.conn.cursor()
         
@@ -64,15 +161,8 @@ class QualityAnalytics:
             LIMIT 10
         """)
         
-        articles = cursor.fetchall()
-        
-        print(f"\n\n📖 READ TIME ANALYSIS (Top 10)")
-        print("-" * 100)
-        print(f"{'Title':<50} {'Length':>8} {'Avg Read':>10} {'Completion':>12} {'Total Hours':>12}")
-        print("-" * 100)
-        
-        for article in articles:
-            title = article['title'][:47] + "..." if len(article['title']) > 50 else article['title']
+        results = []
+        for article in cursor.fetchall():
             length_seconds = (article['reading_time_minutes'] or 0) * 60
             avg_read = article['avg_read_seconds'] or 0
             
@@ -82,14 +172,37 @@ class QualityAnalytics:
                 completion = (avg_read / length_seconds) * 100
                 completion = min(100, completion)  # Cap at 100%
             
-            total_hours = (article['total_read_seconds'] or 0) / 3600
+            results.append(ReadTimeStats(
+                article_id=article['article_id'],
+                title=article['title'],
+                reading_time_minutes=article['reading_time_minutes'],
+                avg_read_seconds=avg_read,
+                completion=completion,
+                total_hours=(article['total_read_seconds'] or 0) / 3600,
+            ))
+        return results
+    
+    def render_read_time_analysis(self, articles: List[ReadTimeStats]):
+        print(f"\n\n📖 READ TIME ANALYSIS (Top 10)")
+        print("-" * 100)
+        print(f"{'Title':<50} {'Length':>8} {'Avg Read':>10} {'Completion':>12} {'Total Hours':>12}")
+        print("-" * 100)
+        
+        for article in articles:
+            title = article.title[:47] + "..." if len(article.title) > 50 else article.title
             
-            print(f"{title:<50} {article['reading_time_minutes']:>7}m "
-                  f"{int(avg_read):>8}s {completion:>10.1f}% {total_hours:>11.1f}h")
+            print(f"{title:<50} {article.reading_time_minutes:>7}m "
+                  f"{int(article.avg_read_seconds):>8}s {article.completion:>10.1f}% {article.total_hours:>11.1f}h")
         
         print("\n💡 Note: Read time data covers last 90 days only")
     
-    def show_reaction_breakdown(self):
+    def show_read_time_analysis(self):
+        self.render_read_time_analysis(self.compute_read_time_analysis())
+    
+    # --- REACTIONS ---
+    
+    @cached_section("quality.reactions", tables=("daily_analytics", "article_metrics"), time_bucket="%Y-%m-%d")
+    def compute_reaction_breakdown(self) -> ReactionBreakdown:
         """Analyze types of reactions"""
         cursor = self.conn.cursor()
         
@@ -135,56 +248,31 @@ class QualityAnalytics:
             LIMIT 10
         """)
         
-        articles = cursor.fetchall()
-        
-        print(f"\n\n❤️ REACTION BREAKDOWN (Top 10 by lifetime reactions)")
-        print("-" * 120)
-        print(f"{'Title':<45} {'Age':>6} {'Lifetime':>10} │ {'Likes':>7} {'🦄':>5} {'📖':>5} {'Sum':>8} {'Gap':>5}")
-        print("-" * 120)
-        
-        for article in articles:
-            title = article['title'][:42] + "..." if len(article['title']) > 45 else article['title']
-            age_days = int(article['age_days']) if article['age_days'] else 0
-            
-            age_indicator = f"{age_days}d"
-            
+        articles = []
+        for article in cursor.fetchall():
             # Use breakdown sum (more reliable than reactions_total)
-            likes = article['reactions_like_since_pub'] or 0
-            unicorns = article['reactions_unicorn_since_pub'] or 0
-            bookmarks = article['reactions_bookmark_since_pub'] or 0
             breakdown_sum = article['reactions_breakdown_sum'] or 0
             
-            # Gap = difference between lifetime and breakdown sum
-            gap = article['total_reactions_lifetime'] - breakdown_sum
-            gap_str = f"{gap:+d}" if gap != 0 else "="
-            
-            print(f"{title:<45} {age_indicator:>6} {article['total_reactions_lifetime']:>10} │ "
-                  f"{likes:>7} "
-                  f"{unicorns:>5} "
-                  f"{bookmarks:>5} "
-                  f"{breakdown_sum:>8} {gap_str:>5}")
-        
-        print("-" * 120)
-        print("💡 Lifetime = total reactions from public API (current state)")
-        print("   Sum = SUM(likes + unicorns + bookmarks) since publication")
-        print("   Gap = Lifetime - Sum")
-        print("   ")
-        print("   ⚠️ If Sum > Lifetime (Gap negative):")
-        print("      → Some people unliked/removed their reactions")
-        print("      → History keeps original actions, lifetime shows current count")
-        print("   ")
-        print("   ⚠️ If Lifetime > Sum (Gap positive):")
-        print("      → Recent reactions not yet in daily_analytics (sync delay)")
-        print("      → Or reactions of types not in breakdown (rare)")
-        
-        # Show reaction patterns (only for articles with complete data)
-        print("\n💡 Reaction Patterns (articles ≤90 days old only):")
+            articles.append(ReactionStats(
+                article_id=article['article_id'],
+                title=article['title'],
+                age_days=int(article['age_days']) if article['age_days'] else 0,
+                lifetime=article['total_reactions_lifetime'],
+                likes=article['reactions_like_since_pub'] or 0,
+                unicorns=article['reactions_unicorn_since_pub'] or 0,
+                bookmarks=article['reactions_bookmark_since_pub'] or 0,
+                breakdown_sum=breakdown_sum,
+                # Gap = difference between lifetime and breakdown sum
+                gap=article['total_reactions_lifetime'] - breakdown_sum,
+            ))
+        
+        # Reaction patterns (only for articles with complete data)
         cursor.execute("""
             SELECT 
-                CASE 
-                    WHEN reactions_unicorn * 1.0 / NULLIF(reactions_total, 0) > 0.3 
+                CASE
+                    WHEN reactions_unicorn * 1.0 / NULLIF(reactions_total, 0) > 0.3
                         THEN 'High Unicorn (Excitement)'
-                    WHEN reactions_readinglist * 1.0 / NULLIF(reactions_total, 0) > 0.4 
+                    WHEN reactions_readinglist * 1.0 / NULLIF(reactions_total, 0) > 0.4
                         THEN 'High Bookmark (Value)'
                     ELSE 'Standard (Likes)'
                 END as pattern,
@@ -206,10 +294,50 @@ class QualityAnalytics:
             GROUP BY pattern
         """)
         
-        for row in cursor.fetchall():
-            print(f"  • {row['pattern']}: {row['articles']} articles")
+        patterns = [ReactionPattern(row['pattern'], row['articles']) for row in cursor.fetchall()]
+        return ReactionBreakdown(articles, patterns)
     
-    def show_long_tail_champions(self):
+    def render_reaction_breakdown(self, result: ReactionBreakdown):
+        print(f"\n\n❤️ REACTION BREAKDOWN (Top 10 by lifetime reactions)")
+        print("-" * 120)
+        print(f"{'Title':<45} {'Age':>6} {'Lifetime':>10} │ {'Likes':>7} {'🦄':>5} {'📖':>5} {'Sum':>8} {'Gap':>5}")
+        print("-" * 120)
+        
+        for article in result.articles:
+            title = article.title[:42] + "..." if len(article.title) > 45 else article.title
+            age_indicator = f"{article.age_days}d"
+            gap_str = f"{article.gap:+d}" if article.gap != 0 else "="
+            
+            print(f"{title:<45} {age_indicator:>6} {article.lifetime:>10} │ "
+                  f"{article.likes:>7} "
+                  f"{article.unicorns:>5} "
+                  f"{article.bookmarks:>5} "
+                  f"{article.breakdown_sum:>8} {gap_str:>5}")
+        
+        print("-" * 120)
+        print("💡 Lifetime = total reactions from public API (current state)")
+        print("   Sum = SUM(likes + unicorns + bookmarks) since publication")
+        print("   Gap = Lifetime - Sum")
+        print("   ")
+        print("   ⚠️ If Sum > Lifetime (Gap negative):")
+        print("      → Some people unliked/removed their reactions")
+        print("      → History keeps original actions, lifetime shows current count")
+        print("   ")
+        print("   ⚠️ If Lifetime > Sum (Gap positive):")
+        print("      → Recent reactions not yet in daily_analytics (sync delay)")
+        print("      → Or reactions of types not in breakdown (rare)")
+        
+        print("\n💡 Reaction Patterns (articles ≤90 days old only):")
+        for row in result.patterns:
+            print(f"  • {row.pattern}: {row.articles} articles")
+    
+    def show_reaction_breakdown(self):
+        self.render_reaction_breakdown(self.compute_reaction_breakdown())
+    
+    # --- LONG TAIL ---
+    
+    @cached_section("quality.long_tail", tables=("daily_analytics", "article_metrics"), time_bucket="%Y-%m-%d")
+    def compute_long_tail_champions(self) -> List[LongTailStats]:
         """Identify articles with strong long-tail performance"""
         cursor = self.conn.cursor()
         
@@ -235,30 +363,44 @@ class QualityAnalytics:
             LIMIT 10
         """)
         
-        articles = cursor.fetchall()
-        
+        results = []
+        for article in cursor.fetchall():
+            recent = article['recent_views']
+            older = article['older_views'] or 0
+            
+            # Calculate trend (None = no older views to compare with)
+            trend_pct = ((recent - older) / older) * 100 if older > 0 else None
+            
+            results.append(LongTailStats(
+                article_id=article['article_id'],
+                title=article['title'],
+                age_days=int(article['days_since_publication']),
+                recent_views=recent,
+                older_views=older,
+                trend_pct=trend_pct,
+            ))
+        return results
+    
+    def render_long_tail_champions(self, articles: List[LongTailStats]):
         print(f"\n\n🌟 LONG-TAIL CHAMPIONS (Recent views on old articles)")
         print("-" * 100)
         print(f"{'Title':<50} {'Age':>8} {'Last 30d':>10} {'30-90d':>10} {'Trend':>8}")
         print("-" * 100)
         
         for article in articles:
-            title = article['title'][:47] + "..." if len(article['title']) > 50 else article['title']
-            age_days = int(article['days_since_publication'])
-            recent = article['recent_views']
-            older = article['older_views'] or 0
-            
-            # Calculate trend
-            if older > 0:
-                trend_pct = ((recent - older) / older) * 100
-                trend = f"{trend_pct:+.0f}%"
-            else:
-                trend = "NEW"
+            title = article.title[:47] + "..." if len(article.title) > 50 else article.title
+            trend = f"{article.trend_pct:+.0f}%" if article.trend_pct is not None else "NEW"
             
-            print(f"{title:<50} {age_days:>7}d {recent:>10} {older:>10} {trend:>8}")
+            print(f"{title:<50} {article.age_days:>7}d {article.recent_views:>10} {article.older_views:>10} {trend:>8}")
     
-    def show_quality_scores(self):
-        """Calculate and display quality scores"""
+    def show_long_tail_champions(self):
+        self.render_long_tail_champions(self.compute_long_tail_champions())
+    
+    # --- QUALITY SCORES ---
+    
+    @cached_section("quality.scores", tables=("daily_analytics", "article_metrics"), time_bucket="%Y-%m-%d")
+    def compute_quality_scores(self) -> List[QualityScore]:
+        """Calculate quality scores (top 10, best first)"""
         cursor = self.conn.cursor()
         
         # FIXED: Use consistent data periods and document clearly
@@ -301,34 +443,43 @@ class QualityAnalytics:
             # Completion matters more for quality (70%), engagement adds value (30%)
             quality_score = (completion * 0.7) + (min(engagement, 20) * 1.5)
             
-            scored_articles.append({
-                'title': article['title'],
-                'age_days': int(article['age_days']) if article['age_days'] else 0,
-                'quality_score': quality_score,
-                'completion': completion,
-                'engagement': engagement
-            })
+            scored_articles.append(QualityScore(
+                article_id=article['article_id'],
+                title=article['title'],
+                age_days=int(article['age_days']) if article['age_days'] else 0,
+                quality_score=quality_score,
+                completion=completion,
+                engagement=engagement,
+            ))
         
         # Sort by quality score
-        scored_articles.sort(key=lambda x: x['quality_score'], reverse=True)
-        
+        scored_articles.sort(key=lambda x: x.quality_score, reverse=True)
+        return scored_articles[:10]
+    
+    def render_quality_scores(self, scored_articles: List[QualityScore]):
         print(f"\n\n⭐ QUALITY SCORES (Completion + Engagement)")
         print("-" * 100)
         print(f"{'Title':<50} {'Quality':>9} {'Read %':>8} {'Engage %':>10}")
         print("-" * 100)
         
-        for article in scored_articles[:10]:
-            title = article['title'][:47] + "..." if len(article['title']) > 50 else article['title']
+        for article in scored_articles:
+            title = article.title[:47] + "..." if len(article.title) > 50 else article.title
             
-            print(f"{title:<50} {article['quality_score']:>8.1f} "
-                  f"{article['completion']:>7.1f}% {article['engagement']:>9.1f}%")
+            print(f"{title:<50} {article.quality_score:>8.1f} "
+                  f"{article.completion:>7.1f}% {article.engagement:>9.1f}%")
         
         print("\n💡 Quality Score = (Read Completion × 70%) + (Engagement Rate × 30%)")
         print("   High quality = People read it fully AND engage with it")
         print("   ⚠️ Scores based on last 90 days of data (consistent period for all metrics)")
     
-    def analyze_article_daily(self, article_id: int):
-        """Show daily breakdown for a specific article"""
+    def show_quality_scores(self):
+        self.render_quality_scores(self.compute_quality_scores())
+    
+    # --- ARTICLE DAILY ---
+    
+    @cached_section("quality.article_daily", tables=("daily_analytics", "article_metrics"))
+    def compute_article_daily(self, article_id: int) -> Optional[ArticleDaily]:
+        """Daily breakdown for a specific article (None if unknown)"""
         cursor = self.conn.cursor()
         
         # Get article info
@@ -340,14 +491,7 @@ class QualityAnalytics:
         
         article_info = cursor.fetchone()
         if not article_info:
-            print(f"❌ Article {article_id} not found")
-            return
-        
-        print(f"\n📊 DAILY BREAKDOWN: {article_info['title']}")
-        print("-" * 100)
-        print(f"Published: {article_info['published_at'][:10] if article_info['published_at'] else 'N/A'}")
-        print(f"Length: {article_info['reading_time_minutes']} minutes")
-        print()
+            return None
         
         # Get daily data
         cursor.execute("""
@@ -367,18 +511,45 @@ class QualityAnalytics:
             LIMIT 30
         """, (article_id,))
         
-        days = cursor.fetchall()
+        days = [
+            DailyStats(d['date'], d['page_views'], d['average_read_time_seconds'], d['reactions_like'],
+                       d['reactions_unicorn'], d['reactions_readinglist'], d['comments_total'])
+            for d in cursor.fetchall()
+        ]
+        
+        return ArticleDaily(
+            article_id=article_id,
+            title=article_info['title'],
+            published_at=article_info['published_at'],
+            reading_time_minutes=article_info['reading_time_minutes'],
+            days=days,
+        )
+    
+    def render_article_daily(self, article_id: int, article: Optional[ArticleDaily]):
+        if article is None:
+            print(f"❌ Article {article_id} not found")
+            return
+        
+        print(f"\n📊 DAILY BREAKDOWN: {article.title}")
+        print("-" * 100)
+        print(f"Published: {article.published_at[:10] if article.published_at else 'N/A'}")
+        print(f"Length: {article.reading_time_minutes} minutes")
+        print()
         
         print(f"{'Date':<12} {'Views':>7} {'Read(s)':>9} {'Likes':>7} {'🦄':>5} {'📖':>5} {'💬':>5}")
         print("-" * 100)
         
-        for day in days:
-            print(f"{day['date']:<12} {day['page_views']:>7} "
-                  f"{day['average_read_time_seconds']:>9} "
-                  f"{day['reactions_like']:>7} "
-                  f"{day['reactions_unicorn']:>5} "
-                  f"{day['reactions_readinglist']:>5} "
-                  f"{day['comments_total']:>5}")
+        for day in article.days:
+            print(f"{day.date:<12} {day.page_views:>7} "
+                  f"{day.average_read_time_seconds:>9} "
+                  f"{day.reactions_like:>7} "
+                  f"{day.reactions_unicorn:>5} "
+                  f"{day.reactions_readinglist:>5} "
+                  f"{day.comments_total:>5}")
+    
+    def analyze_article_daily(self, article_id: int):
+        """Show daily breakdown for a specific article"""
+        self.render_article_daily(article_id, self.compute_article_daily(article_id))
 
 def main():
     parser = argparse.ArgumentParser(description="Quality Analytics Dashboard")
@@ -389,17 +560,38 @@ def main():
     parser.add_argument('--long-tail', action='store_true', help='Show long-tail champions')
     parser.add_argument('--quality', action='store_true', help='Show quality scores')
     parser.add_argument('--article', type=int, metavar='ID', help='Daily breakdown for article')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute every section (ignore report cache)')
+    parser.add_argument('--workers', type=int, help='Sections run concurrently (1 = sequential)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
     
     args = parser.parse_args()
     
-    analytics = QualityAnalytics(args.db)
+    analytics = QualityAnalytics(args.db, use_cache=not args.no_cache)
     
     # If no specific analysis requested, show full dashboard
     if not any([args.read_time, args.reactions, args.long_tail, args.quality, args.article]):
         args.full = True
     
+    if args.format == 'json':
+        if args.full:
+            results = analytics.compute_quality_dashboard(workers=args.workers)
+        else:
+            results = {}
+            if args.read_time:
+                results['read_time'] = analytics.compute_read_time_analysis()
+            if args.reactions:
+                results['reactions'] = analytics.compute_reaction_breakdown()
+            if args.long_tail:
+                results['long_tail'] = analytics.compute_long_tail_champions()
+            if args.quality:
+                results['quality'] = analytics.compute_quality_scores()
+        if args.article:
+            results['article'] = analytics.compute_article_daily(args.article)
+        print(dump_json(results))
+        return
+    
     if args.full:
-        analytics.show_quality_dashboard()
+        analytics.show_quality_dashboard(workers=args.workers)
     else:
         analytics.connect()
         if args.read_time:
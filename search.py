@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Full-text search - Recherche dans les commentaires, articles et blocs de code
+Index FTS5 maintenus par triggers (cf. DatabaseManager._create_fts_indexes)
+
+Usage:
+    python3 search.py docker                       # mots (ET implicite)
+    python3 search.py '"connection pool"'          # phrase exacte
+    python3 search.py 'kube*' --scope code         # préfixe
+    python3 search.py 'sqlite NOT postgres' --scope articles --limit 5
+"""
+
+import argparse
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+from core.database import DatabaseManager
+from core.results import dump_json
+
+# --- RESULTS ---
+
+@dataclass(slots=True)
+class SearchHit:
+    scope: str
+    ref_id: str
+    article_id: Optional[int]
+    title: Optional[str]
+    detail: Optional[str]
+    rank: float
+    snippet: str
+
+# scope -> (table fts, requête ; colonnes : ref_id, article_id, title, detail, rank, snippet)
+_QUERIES = {
+    'comments': ("comments_fts", """
+        SELECT c.comment_id as ref_id, c.article_id, c.article_title as title,
+               c.author_username as detail, bm25(comments_fts) as rank,
+               snippet(comments_fts, 0, '**', '**', '…', 16) as snippet
+        FROM comments_fts
+        JOIN comments c ON c.rowid = comments_fts.rowid
+        WHERE comments_fts MATCH ? AND c.is_spam = 0
+        ORDER BY rank LIMIT ?
+    """),
+    'articles': ("articles_fts", """
+        SELECT ac.article_id as ref_id, ac.article_id,
+               (SELECT m.title FROM article_metrics m WHERE m.article_id = ac.article_id
+                ORDER BY m.collected_at DESC LIMIT 1) as title,
+               ac.word_count || ' words' as detail, bm25(articles_fts) as rank,
+               snippet(articles_fts, 0, '**', '**', '…', 16) as snippet
+        FROM articles_fts
+        JOIN article_content ac ON ac.article_id = articles_fts.rowid
+        WHERE articles_fts MATCH ?
+        ORDER BY rank LIMIT ?
+    """),
+    'code': ("code_fts", """
+        SELECT b.id as ref_id, b.article_id,
+               (SELECT m.title FROM article_metrics m WHERE m.article_id = b.article_id
+                ORDER BY m.collected_at DESC LIMIT 1) as title,
+               b.language as detail, bm25(code_fts) as rank,
+               snippet(code_fts, 0, '**', '**', '…', 16) as snippet
+        FROM code_fts
+        JOIN article_code_blocks b ON b.id = code_fts.rowid
+        WHERE code_fts MATCH ?
+        ORDER BY rank LIMIT ?
+    """),
+}
+
+def quote_terms(query):
+    """Requête littérale : chaque mot entre guillemets (ponctuation, opérateurs neutralisés)."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+class FullTextSearch:
+    def __init__(self, db_path: str):
+        self.db = DatabaseManager(db_path)
+
+    def compute_search(self, query: str, scopes=None, limit: int = 10) -> List[SearchHit]:
+        """
+        Recherche classée (bm25) : syntaxe FTS5 ("phrase", prefix*, AND/OR/NOT).
+        Une requête invalide pour FTS5 est relancée mot à mot, en littéral.
+        """
+        conn = self.db.get_connection()
+        hits = []
+        for scope in scopes or _QUERIES:
+            fts, sql = _QUERIES[scope]
+            if not DatabaseManager._table_exists(conn, fts):
+                continue
+            try:
+                rows = conn.execute(sql, (query, limit)).fetchall()
+            except sqlite3.OperationalError:
+                rows = conn.execute(sql, (quote_terms(query), limit)).fetchall()
+            hits.extend(
+                SearchHit(scope, str(r['ref_id']), r['article_id'], r['title'], r['detail'], r['rank'], r['snippet'])
+                for r in rows
+            )
+        conn.close()
+
+        # bm25 : plus petit = plus pertinent (entre index, comparaison seulement indicative)
+        return sorted(hits, key=lambda h: h.rank)[:limit]
+
+    def render_search(self, query: str, hits: List[SearchHit], elapsed_ms: float):
+        if not hits:
+            print(f"🔍 Aucun résultat pour {query!r} ({elapsed_ms:.1f} ms)")
+            return
+
+        icons = {'comments': '💬', 'articles': '📄', 'code': '💻'}
+        print(f"\n🔍 {len(hits)} résultat(s) pour {query!r} ({elapsed_ms:.1f} ms)")
+        print("-" * 80)
+        for h in hits:
+            title = (h.title or f"Article {h.article_id}")[:50]
+            print(f"{icons[h.scope]} {title}  [{h.detail}]  bm25={h.rank:.2f}")
+            print(f"   {' '.join(h.snippet.split())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recherche plein texte (FTS5)')
+    parser.add_argument('query', help='Requête FTS5 : mots, "phrase", prefix*, AND/OR/NOT')
+    parser.add_argument('--db', default='devto_metrics.db', help='Chemin de la base')
+    parser.add_argument('--scope', choices=['comments', 'articles', 'code', 'all'], default='all',
+                        help='Index interrogé (défaut : tous)')
+    parser.add_argument('--limit', type=int, default=10, help='Nombre de résultats')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Format de sortie')
+    args = parser.parse_args()
+
+    search = FullTextSearch(args.db)
+    scopes = None if args.scope == 'all' else [args.scope]
+
+    start = time.perf_counter()
+    hits = search.compute_search(args.query, scopes, args.limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.format == 'json':
+        print(dump_json(hits))
+    else:
+        search.render_search(args.query, hits, elapsed_ms)
+
+
+if __name__ == "__main__":
+    main()
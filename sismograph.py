@@ -9,10 +9,12 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 from core.database import DatabaseManager
+from core.daily_rollup import DailyRollup
 
 class AdvancedAnalytics:
     def __init__(self, db_path: str):
         self.db = DatabaseManager(db_path)
+        DailyRollup(self.db).refresh()
     
     def article_follower_correlation(self):
         """
@@ -199,12 +201,11 @@ class AdvancedAnalytics:
                 article_id,
                 title,
                 published_at,
-                MAX(views) as total_views,
-                MAX(reactions) as total_reactions,
-                MAX(comments) as total_comments
-            FROM article_metrics
+                views as total_views,
+                reactions as total_reactions,
+                comments as total_comments
+            FROM article_latest
             WHERE published_at IS NOT NULL
-            GROUP BY article_id
         """)
         
         articles = cursor.fetchall()
@@ -1,8 +1,9 @@
 import os
-import sqlite3
 import requests
 import time
 from dotenv import load_dotenv
+from core.database import DatabaseManager
+from core.comment_store import insert_comment
 
 # Charge les variables du fichier .env
 load_dotenv()
@@ -17,7 +18,8 @@ if not API_KEY:
 DB_PATH = "devto_metrics.db"
 
 def sync_incremental():
-    conn = sqlite3.connect(DB_PATH)
+    # DatabaseManager applique les migrations (colonne body_text)
+    conn = DatabaseManager(DB_PATH).get_connection()
     cursor = conn.cursor()
 
     # 1. On récupère la liste de tes articles actifs
@@ -35,20 +37,11 @@ def sync_incremental():
             for c in comments:
                 c_id = c.get('id_code')
                 
-                # On utilise INSERT OR IGNORE pour ne pas créer de doublons
-                # Si le comment_id existe déjà, SQLite passera à la suite
-                cursor.execute("""
-                    INSERT OR IGNORE INTO comments 
-                    (collected_at, comment_id, article_id, article_title, author_username, body_html, created_at)
-                    VALUES (CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?)
-                """, (
-                    c_id, art_id, title, 
-                    c.get('user', {}).get('username'),
-                    c.get('body_html'),
-                    c.get('created_at')
-                ))
-                
-                if cursor.rowcount > 0:
+                # INSERT OR IGNORE : si le comment_id existe déjà, SQLite passera à la suite
+                if insert_comment(
+                    conn, c_id, art_id, c.get('body_html'), c.get('created_at'),
+                    article_title=title, author_username=c.get('user', {}).get('username')
+                ):
                     new_comments_count += 1
             
             conn.commit()